@@ -0,0 +1,178 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, ClassVar, Dict, Optional
+
+from dbt_common.dataclass_schema import dbtClassMixin
+from dbt.adapters.events.logging import AdapterLogger
+
+logger = AdapterLogger("Hive")
+
+DEFAULT_CAPABILITIES_CACHE_TTL = 24 * 60 * 60
+
+# Cloudera builds carry the CDP release after the Hive version,
+# e.g. "3.1.3000.7.1.9.0-387", and ship the Iceberg storage handler
+CDP_VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d{4}\.7\.")
+
+
+@dataclass
+class HiveCapabilities(dbtClassMixin):
+    """Features of a HiveServer2 host, probed once per host"""
+
+    version: str = "NA"
+    major_version: Optional[int] = None
+    supports_acid: bool = False
+    supports_merge: bool = False
+    supports_iceberg: bool = False
+    # Hive 4 lists name and type of every relation with SHOW EXTENDED TABLES
+    supports_show_extended_tables: bool = False
+    probed_at: float = 0.0
+
+    @property
+    def is_hive4(self) -> bool:
+        return (self.major_version or 0) >= 4
+
+    @classmethod
+    def from_server(cls, version: str, txn_manager: Optional[str]) -> "HiveCapabilities":
+        """Derive the capabilities from `select version()` and the configured
+        transaction manager"""
+        try:
+            major_version: Optional[int] = int(version.split(".")[0].strip())
+        except ValueError:
+            major_version = None
+
+        supports_acid = bool(txn_manager) and "DbTxnManager" in txn_manager
+        is_hive4 = (major_version or 0) >= 4
+        return cls(
+            version=version,
+            major_version=major_version,
+            supports_acid=supports_acid,
+            # merge is only supported on Hive 3 onwards
+            supports_merge=(major_version or 0) >= 3,
+            supports_iceberg=is_hive4 or bool(CDP_VERSION_PATTERN.match(version)),
+            supports_show_extended_tables=is_hive4,
+            probed_at=time.time(),
+        )
+
+
+def _fetch_single_value(cursor, sql: str) -> Optional[str]:
+    cursor.execute(sql)
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    return str(rows[0][0]).strip()
+
+
+def probe_capabilities(cursor) -> HiveCapabilities:
+    """Query the server behind `cursor` for its version and ACID setup"""
+    try:
+        version = _fetch_single_value(cursor, "select version()") or "NA"
+    except Exception as ex:
+        # we couldn't get the hive warehouse version
+        logger.debug(f"Cannot get hive version. Error: {ex}")
+        version = "NA"
+
+    txn_manager = None
+    try:
+        # returns a single `hive.txn.manager=<class name>` row
+        setting = _fetch_single_value(cursor, "set hive.txn.manager")
+        if setting and "=" in setting:
+            txn_manager = setting.split("=", 1)[1]
+    except Exception as ex:
+        logger.debug(f"Cannot get hive transaction manager. Error: {ex}")
+
+    return HiveCapabilities.from_server(version, txn_manager)
+
+
+class HiveCapabilitiesCache:
+    """Process wide cache of server capabilities keyed by host, optionally
+    persisted to a JSON file so later invocations skip the probe"""
+
+    _capabilities: ClassVar[Dict[str, HiveCapabilities]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @staticmethod
+    def key(credentials) -> str:
+        return f"{credentials.host}:{credentials.port}"
+
+    @classmethod
+    def lookup(cls, credentials) -> Optional[HiveCapabilities]:
+        with cls._lock:
+            return cls._capabilities.get(cls.key(credentials))
+
+    @classmethod
+    def get(cls, credentials, probe: Callable[[], HiveCapabilities]) -> HiveCapabilities:
+        key = cls.key(credentials)
+        path = credentials.capabilities_cache_file
+        ttl = credentials.capabilities_cache_ttl
+        # hold the lock while probing so concurrent threads probe only once
+        with cls._lock:
+            capabilities = cls._capabilities.get(key)
+            if capabilities is None and path:
+                capabilities = cls._load(path, key, ttl)
+            if capabilities is None:
+                capabilities = probe()
+                if path and capabilities.major_version is not None:
+                    cls._store(path, key, capabilities)
+            cls._capabilities[key] = capabilities
+            return capabilities
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._capabilities.clear()
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict]:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as fp:
+            return json.load(fp)
+
+    @classmethod
+    def _load(cls, path: str, key: str, ttl: Optional[int]) -> Optional[HiveCapabilities]:
+        try:
+            entry = cls._read(path).get(key)
+            if entry is None:
+                return None
+            capabilities = HiveCapabilities.from_dict(entry)
+        except Exception as ex:
+            logger.debug(f"Ignoring unreadable capabilities cache {path}: {ex}")
+            return None
+
+        if ttl and time.time() - capabilities.probed_at > ttl:
+            logger.debug(f"Cached capabilities for {key} expired")
+            return None
+        return capabilities
+
+    @classmethod
+    def _store(cls, path: str, key: str, capabilities: HiveCapabilities):
+        try:
+            entries = cls._read(path)
+        except Exception:
+            entries = {}
+        entries[key] = capabilities.to_dict()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as fp:
+                json.dump(entries, fp, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            logger.debug(f"Unable to write capabilities cache {path}: {ex}")
@@ -16,6 +16,15 @@ from typing import TypeVar, Optional, Dict, Any
 
 from dbt.adapters.base.column import Column
 from dbt_common.dataclass_schema import dbtClassMixin
+from dbt_common.exceptions import DbtRuntimeError
+
+from dbt.adapters.hive.hive_types import (
+    MAX_VARCHAR_LENGTH,
+    STRING_LENGTH,
+    HiveType,
+    parse_hive_type,
+)
+from dbt.adapters.hive.table_stats import TableStats
 
 Self = TypeVar("Self", bound="HiveColumn")
 
@@ -48,40 +57,56 @@ class HiveColumn(dbtClassMixin, Column):
     def data_type(self) -> str:
         return self.dtype
 
+    @property
+    def hive_type(self) -> HiveType:
+        return parse_hive_type(self.dtype)
+
+    @property
+    def expanded_data_type(self) -> str:
+        """The type in a canonical spelling, for schema comparisons"""
+        return self.hive_type.text
+
     def is_string(self) -> bool:
-        dt = self.dtype.lower()
-        return dt.startswith("varchar") or dt.startswith("char") or dt == "string"
+        return self.hive_type.is_string
 
     def is_integer(self) -> bool:
-        return self.dtype.lower() in ["tinyint", "smallint", "integer", "int", "bigint"]
+        return self.hive_type.is_integer
+
+    def is_float(self) -> bool:
+        return self.hive_type.is_float
+
+    def is_numeric(self) -> bool:
+        return self.hive_type.is_numeric
+
+    def string_size(self) -> int:
+        if not self.is_string():
+            raise DbtRuntimeError("Called string_size() on non-string field!")
+        return self.hive_type.length or STRING_LENGTH
+
+    @classmethod
+    def string_type(cls, size: int) -> str:
+        return "string" if size > MAX_VARCHAR_LENGTH else f"varchar({size})"
 
-    def is_numeric(self):
-        dt = self.data_type.lower()
-        return dt in ["double", "float", "number"] or dt.startswith("decimal")
+    def can_expand_to(self, other_column: Column) -> bool:
+        """Whether this column can be altered to the type of the other column
+        without losing values: longer strings, wider integers and floats,
+        decimals with more integer and fractional digits"""
+        return self.hive_type.can_widen_to(parse_hive_type(other_column.dtype))
 
     def __repr__(self) -> str:
         return f"<HiveColumn {self.name} ({self.data_type})>"
 
-    #     @staticmethod
-    #     def convert_table_stats(raw_stats: Optional[str]) -> Dict[str, Any]:
-    #         table_stats = {}
-    #         if raw_stats:
-    #             # format: 1109049927 bytes, 14093476 rows
-    #             stats = {
-    #                 stats.split(" ")[1]: int(stats.split(" ")[0])
-    #                 for stats in raw_stats.split(', ')
-    #             }
-    #             for key, val in stats.items():
-    #                 table_stats[f'stats:{key}:label'] = key
-    #                 table_stats[f'stats:{key}:value'] = val
-    #                 table_stats[f'stats:{key}:description'] = ''
-    #                 table_stats[f'stats:{key}:include'] = True
-    #         return table_stats
+    @staticmethod
+    def convert_table_stats(table_stats: Optional[TableStats]) -> Dict[str, Any]:
+        """Flatten table statistics into the `stats:` columns of the catalog"""
+        if table_stats is None:
+            return {}
+        return table_stats.to_catalog_stats()
 
     def to_column_dict(self, omit_none: bool = True, validate: bool = False):
         original_dict = self.to_dict(omit_none=omit_none)
         # If there are stats, merge them into the root of the dict
-        # original_stats = original_dict.pop('table_stats', None)
-        # if original_stats:
-        #    original_dict.update(original_stats)
+        original_stats = original_dict.pop("table_stats", None)
+        if original_stats:
+            original_dict.update(original_stats)
         return original_dict
@@ -11,14 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import re
+import threading
 import time
 import json
+import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional, Tuple
+from itertools import chain
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
 from multiprocessing.context import SpawnContext
 
+import agate
+
 import dbt.exceptions
 from dbt_common.exceptions import DbtDatabaseError
 import impala.dbapi
@@ -31,9 +37,12 @@ from dbt.adapters.contracts.connection import (
     ConnectionState,
 )
 from dbt.adapters.events.logging import AdapterLogger
+from dbt_common.events.contextvars import get_node_info
 from dbt_common.events.functions import fire_event
+from dbt_common.invocation import get_invocation_id
 from dbt.adapters.events.types import ConnectionUsed, SQLQuery, SQLQueryStatus
 from dbt.utils import DECIMALS
+from dbt_common.clients.agate_helper import table_from_data_flat
 
 import json
 import time
@@ -41,6 +50,35 @@ import time
 import impala.dbapi
 from impala.error import HttpError
 from impala.error import HiveServer2Error
+from impala.error import OperationalError
+
+from dbt.adapters.hive.capabilities import (
+    DEFAULT_CAPABILITIES_CACHE_TTL,
+    HiveCapabilities,
+    HiveCapabilitiesCache,
+    probe_capabilities,
+)
+from dbt.adapters.hive.http_cookies import SharedHttpCookies
+from dbt.adapters.hive.retry import (
+    DEFAULT_QUERY_RETRIES,
+    DEFAULT_QUERY_RETRY_BACKOFF,
+    DEFAULT_QUERY_RETRY_MAX_BACKOFF,
+    backoff_delay,
+    is_transient_error,
+)
+from dbt.adapters.hive.metadata_cache import MetadataCache
+from dbt.adapters.hive.notification_log import (
+    DEFAULT_NOTIFICATION_LOG_POLL_INTERVAL,
+    NotificationLogFollower,
+)
+from dbt.adapters.hive.persistent_cache import PersistentRelationCache, relation_cache_key
+from dbt.adapters.hive.metrics import OperationLogFacts, QueryMetrics, QueryMetricsSink
+from dbt.adapters.hive.sql_splitter import SqlStatement, split_bindings, split_sql_statements
+from dbt.adapters.hive.session_pool import (
+    DEFAULT_POOL_MAX_IDLE_SECONDS,
+    DEFAULT_POOL_MAX_USES,
+    HiveSessionPool,
+)
 
 logger = AdapterLogger("Hive")
 
@@ -48,6 +86,21 @@ NUMBERS = DECIMALS + (int, float)
 
 DEFAULT_HIVE_PORT = 10000
 
+DEFAULT_ASYNC_POLL_INTERVAL = 1.0
+
+# rows requested per FetchResults call, same as impyla's default buffer size
+DEFAULT_FETCH_SIZE = 10240
+
+# Tez vertex progress as printed in the HS2 operation log, e.g. "Map 1: 3(+2)/10"
+TEZ_PROGRESS_PATTERN = re.compile(r"^\s*(Map|Reducer) \d+: ")
+
+# HS2 operation states of a statement which has not started running yet
+QUEUED_OPERATION_STATES = ("INITIALIZED_STATE", "PENDING_STATE")
+EXECUTING_OPERATION_STATES = QUEUED_OPERATION_STATES + ("RUNNING_STATE",)
+
+# `set key=value` changes the session, a bare `set key` only reads it
+SET_STATEMENT_PATTERN = re.compile(r"^\s*set\s+[^=]+=", re.IGNORECASE)
+
 
 @dataclass
 class HiveCredentials(Credentials):
@@ -64,6 +117,24 @@ class HiveCredentials(Credentials):
     use_http_transport: Optional[bool] = True
     http_path: Optional[str] = None
     kerberos_service_name: Optional[str] = None
+    share_http_auth_cookie: Optional[bool] = False
+    use_session_pool: Optional[bool] = False
+    session_pool_max_idle_seconds: Optional[int] = DEFAULT_POOL_MAX_IDLE_SECONDS
+    session_pool_max_uses: Optional[int] = DEFAULT_POOL_MAX_USES
+    use_async_execution: Optional[bool] = False
+    async_poll_interval: Optional[float] = DEFAULT_ASYNC_POLL_INTERVAL
+    fetch_size: Optional[int] = DEFAULT_FETCH_SIZE
+    capabilities_cache_file: Optional[str] = None
+    capabilities_cache_ttl: Optional[int] = DEFAULT_CAPABILITIES_CACHE_TTL
+    query_metrics_file: Optional[str] = None
+    query_metrics_prometheus_file: Optional[str] = None
+    query_retries: Optional[int] = DEFAULT_QUERY_RETRIES
+    query_retry_backoff: Optional[float] = DEFAULT_QUERY_RETRY_BACKOFF
+    query_retry_max_backoff: Optional[float] = DEFAULT_QUERY_RETRY_MAX_BACKOFF
+    use_sys_catalog: Optional[bool] = True
+    relation_cache_file: Optional[str] = None
+    follow_notification_log: Optional[bool] = False
+    notification_log_poll_interval: Optional[float] = DEFAULT_NOTIFICATION_LOG_POLL_INTERVAL
 
     _ALIASES = {"pass": "password", "user": "username"}
 
@@ -97,30 +168,109 @@ class HiveCredentials(Credentials):
         return "host", "schema", "user"
 
 
+@dataclass
+class HiveAdapterResponse(AdapterResponse):
+    # statements re-run after a transient failure
+    retries: int = 0
+    # set on the main statement of a table rebuild, see HiveAdapter.record_rebuild
+    rebuild_strategy: Optional[str] = None
+    rebuild_seconds: Optional[float] = None
+    # set on the main statement of an incremental insert overwrite
+    partitions_overwritten: Optional[int] = None
+
+
 class HiveConnectionWrapper:
     """Wrap a Hive connection in a way that no-ops transactions"""
 
     # https://forums.databricks.com/questions/2157/in-apache-hive-sql-can-we-roll-back-the-transacti.html  # noqa
 
-    def __init__(self, handle):
+    def __init__(
+        self,
+        handle,
+        pool=None,
+        async_execution=False,
+        poll_interval=DEFAULT_ASYNC_POLL_INTERVAL,
+        fetch_size=DEFAULT_FETCH_SIZE,
+        collect_metrics=False,
+    ):
         self.handle = handle
         self._cursor = None
+        self.pool = pool
+        self._reusable = True
+        self.async_execution = async_execution
+        self.poll_interval = poll_interval
+        self.fetch_size = fetch_size or DEFAULT_FETCH_SIZE
+        self._polling = False
+        self._cancel_requested = threading.Event()
+        self.collect_metrics = collect_metrics
+        # facts about the last statement, see `add_query`
+        self.last_queue_time: Optional[float] = None
+        self._log_facts = OperationLogFacts()
+        self.retries = 0
+        # `set key=value` statements run on the session, replayed on reconnect
+        self.session_settings: List[str] = []
 
     def cursor(self):
         if not self._cursor:
             self._cursor = self.handle.cursor()
+            self._cursor.arraysize = self.fetch_size
         return self
 
     def cancel(self):
+        # a cancelled session is never handed out again by the session pool
+        self._reusable = False
+        if self._polling:
+            # the polling thread owns the transport, it cancels the operation
+            # as soon as it wakes up
+            self._cancel_requested.set()
+            return
+        self._cancel_operation()
+
+    def _cancel_operation(self):
         if self._cursor:
             # Handle bad response in the pyhive lib when
             # the connection is cancelled
             try:
-                self._cursor.cancel()
+                self._cursor.cancel_operation()
             except OSError as exc:
                 logger.debug(f"Exception while cancelling query: {exc}")
 
+    def ping(self) -> bool:
+        """Cheap liveness check of the HS2 session, used by the session pool"""
+        if not self._cursor:
+            return False
+        return self._cursor.ping()
+
+    def is_reusable(self) -> bool:
+        return self._reusable
+
+    def dispose(self):
+        """Close the cursor (HS2 session) and the underlying transport"""
+        self._close_cursor()
+        try:
+            self.handle.close()
+        except Exception as exc:
+            logger.debug(f"Exception while closing connection: {exc}")
+
+    def discard(self):
+        """Give up on a broken session, it is never handed out again"""
+        self._reusable = False
+        try:
+            if self.pool is not None:
+                self.pool.release(self, discard=True)
+            else:
+                self.dispose()
+        except Exception as exc:
+            logger.debug(f"Exception while discarding connection: {exc}")
+
     def close(self):
+        if self.pool is not None:
+            # keep the session open, the pool decides whether to reuse it
+            self.pool.release(self)
+            return
+        self._close_cursor()
+
+    def _close_cursor(self):
         if self._cursor:
             # Handle bad response in the pyhive lib when
             # the connection is cancelled
@@ -129,6 +279,15 @@ class HiveConnectionWrapper:
             except OSError as exc:
                 logger.debug(f"Exception while closing cursor: {exc}")
 
+    def close_operation(self):
+        """Release the result set of the last statement on the server, the
+        session stays open"""
+        if self._cursor:
+            try:
+                self._cursor.close_operation()
+            except OSError as exc:
+                logger.debug(f"Exception while closing operation: {exc}")
+
     def rollback(self, *args, **kwargs):
         logger.debug("NotImplemented: rollback")
 
@@ -138,6 +297,22 @@ class HiveConnectionWrapper:
     def fetchone(self):
         return self._cursor.fetchone()
 
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self.fetch_size)
+
+    def iter_fetchmany(self, size=None, limit=None) -> Iterator[List[tuple]]:
+        """Yield the pending result set in batches of at most `size` rows,
+        stopping after `limit` rows, so callers never hold the whole result"""
+        size = size or self.fetch_size
+        remaining = limit
+        while remaining is None or remaining > 0:
+            rows = self._cursor.fetchmany(size if remaining is None else min(size, remaining))
+            if not rows:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            yield rows
+
     def execute(self, sql, bindings=None, configuration={}):
         if sql.strip().endswith(";"):
             sql = sql.strip()[:-1]
@@ -145,9 +320,81 @@ class HiveConnectionWrapper:
         if bindings is not None:
             bindings = [self._fix_binding(binding) for binding in bindings]
 
+        if SET_STATEMENT_PATTERN.match(sql):
+            # session level settings must not leak into pooled sessions
+            self._reusable = False
+            self.session_settings.append(sql)
+
+        self.last_queue_time = None
+        self._log_facts = OperationLogFacts()
+
+        if self.async_execution:
+            return self._execute_async(sql, bindings, configuration)
+
         result = self._cursor.execute(sql, bindings, configuration)
+        if self.collect_metrics:
+            # finished DDL/DML keep their log, result sets cost one GetLog call
+            try:
+                self._log_facts.scan(self._cursor.get_log())
+            except Exception as exc:
+                logger.debug(f"Unable to fetch operation log: {exc}")
         return result
 
+    def _execute_async(self, sql, bindings=None, configuration={}):
+        """Submit the statement and poll its state until it finishes.
+
+        Operation logs (including Tez progress) are streamed to the debug log
+        while polling, and the server side operation is cancelled as soon as
+        the query is interrupted or `cancel` is called from another thread.
+        """
+        cursor = self._cursor
+        self._cancel_requested.clear()
+        submitted_at = time.time()
+        cursor.execute_async(sql, bindings, configuration)
+        self._polling = True
+        try:
+            while True:
+                state = cursor.status()
+                if self.last_queue_time is None and state not in QUEUED_OPERATION_STATES:
+                    self.last_queue_time = time.time() - submitted_at
+                if state not in EXECUTING_OPERATION_STATES:
+                    break
+                self._log_operation_progress()
+                if self._cancel_requested.wait(self.poll_interval):
+                    self._cancel_operation()
+                    raise OperationalError("Query was cancelled")
+            self._log_operation_progress()
+        except KeyboardInterrupt:
+            logger.debug("Query interrupted, cancelling the running operation")
+            self._reusable = False
+            self._cancel_operation()
+            raise
+        finally:
+            self._polling = False
+
+        # mirror impyla's synchronous execute (impyla==0.22): raise the server
+        # side error, if any, and close finished DDL/DML operations
+        cursor._wait_to_finish()
+        if not cursor.has_result_set and cursor.close_finished_queries:
+            cursor._close_finished_operation()
+
+    def _log_operation_progress(self):
+        try:
+            operation_log = self._cursor.get_log()
+        except Exception as exc:
+            logger.debug(f"Unable to fetch operation log: {exc}")
+            return
+
+        if self.collect_metrics:
+            self._log_facts.scan(operation_log)
+        for line in (operation_log or "").splitlines():
+            if not line.strip():
+                continue
+            if TEZ_PROGRESS_PATTERN.match(line):
+                logger.debug(f"Tez progress: {line.strip()}")
+            else:
+                logger.debug(f"HS2 operation log: {line}")
+
     @classmethod
     def _fix_binding(cls, value):
         """Convert complex datatypes to primitives that can be loaded by
@@ -165,6 +412,29 @@ class HiveConnectionWrapper:
     def description(self):
         return self._cursor.description
 
+    @property
+    def operation_id(self) -> Optional[str]:
+        """Identifier of the HS2 operation handle of the last statement"""
+        # impyla==0.22 keeps the handle of the last operation, even once closed
+        operation = getattr(self._cursor, "_last_operation", None)
+        try:
+            return str(uuid.UUID(bytes=operation.handle.operationId.guid))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    @property
+    def rows_affected(self) -> Optional[int]:
+        rowcount = getattr(self._cursor, "rowcount", -1)
+        if rowcount is not None and rowcount >= 0:
+            return rowcount
+        # HS2 does not report modified rows, fall back on the Tez counters
+        return self._log_facts.records_out
+
+    @property
+    def application_id(self) -> Optional[str]:
+        """YARN application of the last statement, only tracked with metrics"""
+        return self._log_facts.application_id
+
 
 class HiveConnectionManager(SQLConnectionManager):
     TYPE = "hive"
@@ -173,6 +443,21 @@ class HiveConnectionManager(SQLConnectionManager):
 
     def __init__(self, profile: AdapterRequiredConfig, mp_context: SpawnContext):
         super().__init__(profile, mp_context)
+        # lives as long as the adapter, i.e. one run
+        self.metadata_cache = MetadataCache()
+        credentials = profile.credentials
+        self.relation_cache: Optional[PersistentRelationCache] = None
+        if credentials.relation_cache_file:
+            self.relation_cache = PersistentRelationCache(
+                credentials.relation_cache_file, relation_cache_key(credentials)
+            )
+        self.notification_log: Optional[NotificationLogFollower] = None
+        if credentials.follow_notification_log:
+            self.notification_log = NotificationLogFollower(
+                self.metadata_cache, credentials.notification_log_poll_interval
+            )
+        # configuration overlay of the next query of each thread
+        self._next_query_configuration: Dict[Hashable, Dict[str, str]] = {}
 
     @classmethod
     def open(cls, connection):
@@ -183,49 +468,22 @@ class HiveConnectionManager(SQLConnectionManager):
         credentials = connection.credentials
         connection_ex = None
 
-        hive_conn = None
         try:
             connection_start_time = time.time()
-            # add configuration to yaml
-            if not credentials.auth_type:
-                hive_conn = impala.dbapi.connect(
-                    host=credentials.host, port=credentials.port, auth_mechanism="PLAIN"
-                )
-            elif credentials.auth_type.upper() == "LDAP":
-                hive_conn = impala.dbapi.connect(
-                    host=credentials.host,
-                    port=credentials.port,
-                    auth_mechanism="LDAP",
-                    use_http_transport=credentials.use_http_transport,
-                    user=credentials.username,
-                    password=credentials.password,
-                    use_ssl=credentials.use_ssl,
-                    http_path=credentials.http_path,
-                )
-            elif (
-                credentials.auth_type.upper() == "GSSAPI"
-                or credentials.auth_type.upper() == "KERBEROS"
-            ):  # kerberos based connection
-                hive_conn = impala.dbapi.connect(
-                    host=credentials.host,
-                    port=credentials.port,
-                    auth_mechanism="GSSAPI",
-                    kerberos_service_name=credentials.kerberos_service_name,
-                    use_http_transport=credentials.use_http_transport,
-                    use_ssl=credentials.use_ssl,
-                    ca_cert=credentials.ca_cert,
+            if credentials.use_session_pool:
+                pool = HiveSessionPool.for_credentials(
+                    credentials, lambda: cls._connect(credentials)
                 )
+                handle = pool.acquire()
+                handle.pool = pool
             else:
-                raise dbt.exceptions.DbtProfileError(
-                    f"Invalid auth_type {credentials.auth_type} provided"
-                )
+                handle = cls._connect(credentials)
             connection_end_time = time.time()
 
             connection.state = ConnectionState.OPEN
-            connection.handle = HiveConnectionWrapper(hive_conn)
-            connection.handle.cursor()
+            connection.handle = handle
 
-            HiveConnectionManager.fetch_hive_version(connection.handle)
+            cls.fetch_hive_capabilities(connection.credentials, connection.handle)
         except Exception as exc:
             logger.error(f"Connection error: {exc}")
             connection_ex = exc
@@ -242,6 +500,57 @@ class HiveConnectionManager(SQLConnectionManager):
 
         return connection
 
+    @classmethod
+    def _connect(cls, credentials) -> HiveConnectionWrapper:
+        """Open a new HS2 connection and session for the given credentials"""
+        # add configuration to yaml
+        if not credentials.auth_type:
+            hive_conn = impala.dbapi.connect(
+                host=credentials.host, port=credentials.port, auth_mechanism="PLAIN"
+            )
+        elif credentials.auth_type.upper() == "LDAP":
+            hive_conn = impala.dbapi.connect(
+                host=credentials.host,
+                port=credentials.port,
+                auth_mechanism="LDAP",
+                use_http_transport=credentials.use_http_transport,
+                user=credentials.username,
+                password=credentials.password,
+                use_ssl=credentials.use_ssl,
+                http_path=credentials.http_path,
+            )
+        elif (
+            credentials.auth_type.upper() == "GSSAPI"
+            or credentials.auth_type.upper() == "KERBEROS"
+        ):  # kerberos based connection
+            hive_conn = impala.dbapi.connect(
+                host=credentials.host,
+                port=credentials.port,
+                auth_mechanism="GSSAPI",
+                kerberos_service_name=credentials.kerberos_service_name,
+                use_http_transport=credentials.use_http_transport,
+                use_ssl=credentials.use_ssl,
+                ca_cert=credentials.ca_cert,
+            )
+        else:
+            raise dbt.exceptions.DbtProfileError(
+                f"Invalid auth_type {credentials.auth_type} provided"
+            )
+
+        if credentials.share_http_auth_cookie and credentials.use_http_transport:
+            # before the session is opened, OpenSession is the first request
+            SharedHttpCookies.for_credentials(credentials).attach(hive_conn)
+
+        handle = HiveConnectionWrapper(
+            hive_conn,
+            async_execution=credentials.use_async_execution,
+            poll_interval=credentials.async_poll_interval,
+            fetch_size=credentials.fetch_size,
+            collect_metrics=QueryMetricsSink.enabled(credentials),
+        )
+        handle.cursor()
+        return handle
+
     @contextmanager
     def exception_handler(self, sql: str):
         try:
@@ -267,25 +576,24 @@ class HiveConnectionManager(SQLConnectionManager):
         connection.handle.cancel()
 
     @classmethod
-    def fetch_hive_version(cls, connection):
-        if HiveConnectionManager.hive_version:
-            return HiveConnectionManager.hive_version
-
-        try:
-            sql = "select version()"
-            cursor = connection.cursor()
-            cursor.execute(sql)
-
-            res = cursor.fetchall()
-
-            HiveConnectionManager.hive_version = res[0][0].split(".")[0].strip()
-
-        except Exception as ex:
-            # we couldn't get the hive warehouse version
-            logger.debug(f"Cannot get hive version. Error: {ex}")
+    def fetch_hive_capabilities(cls, credentials, handle) -> HiveCapabilities:
+        """Probe the server once per host, the result is shared by every
+        connection (and invocation, when the on-disk cache is enabled)"""
+        capabilities = HiveCapabilitiesCache.get(credentials, lambda: probe_capabilities(handle))
+        if capabilities.major_version is not None:
+            HiveConnectionManager.hive_version = str(capabilities.major_version)
+        else:
             HiveConnectionManager.hive_version = "NA"
-
         logger.debug(f"HIVE VERSION {HiveConnectionManager.hive_version}")
+        return capabilities
+
+    def hive_capabilities(self) -> HiveCapabilities:
+        capabilities = HiveCapabilitiesCache.lookup(self.profile.credentials)
+        if capabilities is None:
+            # resolving the handle opens the connection, which probes the server
+            connection = self.get_thread_connection()
+            capabilities = self.fetch_hive_capabilities(connection.credentials, connection.handle)
+        return capabilities
 
     @classmethod
     def close(cls, connection):
@@ -304,10 +612,67 @@ class HiveConnectionManager(SQLConnectionManager):
         except Exception as err:
             logger.debug(f"Error closing connection {err}")
 
+    def cleanup_all(self) -> None:
+        super().cleanup_all()
+        for pool in HiveSessionPool.all_pools():
+            logger.debug(f"Session pool {pool.key}: {pool.stats}, idle sessions={len(pool)}")
+        logger.debug(f"Metadata cache: {self.metadata_cache.stats}")
+        if self.notification_log is not None:
+            follower = self.notification_log
+            logger.debug(
+                f"Metastore events applied: {follower.events_applied}, "
+                f"last={follower.last_event_id}"
+            )
+        if self.relation_cache is not None:
+            self.relation_cache.save()
+        for jar in SharedHttpCookies.all_jars():
+            logger.debug(f"HTTP auth cookies {jar.key}: {jar.stats}")
+
     @classmethod
     def get_response(cls, cursor):
         message = "OK"
-        return AdapterResponse(_message=message)
+        return HiveAdapterResponse(
+            _message=message,
+            rows_affected=cursor.rows_affected,
+            query_id=cursor.operation_id,
+            retries=cursor.retries,
+        )
+
+    @classmethod
+    def get_result_from_cursor(cls, cursor: Any, limit: Optional[int]) -> agate.Table:
+        """Build the result table from batches of `fetch_size` rows instead of
+        a single fetchall, so the raw result is never held next to the table"""
+        data: Iterator[Any] = iter([])
+        column_names: List[str] = []
+
+        if cursor.description is not None:
+            column_names = [col[0] for col in cursor.description]
+            if limit is not None and limit <= 0:
+                limit = None
+            rows = chain.from_iterable(cursor.iter_fetchmany(limit=limit))
+            data = cls.process_results(column_names, rows)
+
+        return table_from_data_flat(data, column_names)
+
+    def stream_query(self, sql: str, name: Optional[str] = None) -> Iterator[tuple]:
+        """Run `sql` and yield its rows as they are fetched, `fetch_size` at a
+        time, for callers which read them once and build no result table. The
+        operation is closed even when the caller stops reading early."""
+        if name is not None:
+            logger.debug(f"Streaming the rows of statement {name}")
+        _, cursor = self.add_query(sql)
+        try:
+            with self.exception_handler(sql):
+                for rows in cursor.iter_fetchmany():
+                    yield from rows
+        finally:
+            cursor.close_operation()
+
+    def set_next_query_configuration(self, configuration: Dict[str, str]):
+        """Hive configuration overrides for the statements of the next query
+        of this thread only, unlike a `set` which stays on the session"""
+        if configuration:
+            self._next_query_configuration[self.get_thread_identifier()] = dict(configuration)
 
     def add_query(
         self,
@@ -317,6 +682,7 @@ class HiveConnectionManager(SQLConnectionManager):
         abridge_sql_log: bool = False,
     ) -> Tuple[Connection, Any]:
         connection = self.get_thread_connection()
+        query_configuration = self._next_query_configuration.pop(self.get_thread_identifier(), {})
         if auto_begin and connection.transaction_open is False:
             self.begin()
         fire_event(ConnectionUsed(conn_type=self.TYPE, conn_name=connection.name))
@@ -327,15 +693,6 @@ class HiveConnectionManager(SQLConnectionManager):
             except Exception as ex:  # silently ignore error for parsing
                 logger.debug(f"Unable to get query header {ex}")
 
-        strip_sql = sql.split("*/")
-        if len(strip_sql) > 1:
-            strip_sql = strip_sql[1]
-        else:
-            strip_sql = strip_sql[0]
-
-        if strip_sql.strip().lower().startswith("set"):
-            sql = strip_sql
-
         with self.exception_handler(sql):
             if abridge_sql_log:
                 log_sql = f"{sql[:512]}..."
@@ -358,17 +715,35 @@ class HiveConnectionManager(SQLConnectionManager):
                 )
 
             query_exception = None
+            metrics_sink = QueryMetricsSink.for_credentials(connection.credentials)
+            retries = 0
             try:
-                configuration = {"paramstyle": "format"}
-                statements = [stmt.strip() for stmt in sql.split(";") if stmt.strip()]
-                if len(statements) > 1:
+                configuration = {**query_configuration, "paramstyle": "format"}
+                statements = split_sql_statements(sql)
+                if not statements:
+                    # nothing but comments, let the server decide
+                    statements = (SqlStatement(sql=sql),)
+                elif len(statements) > 1:
                     logger.debug(
                         f"Detected multiple SQL statements ({len(statements)}), executing sequentially."
                     )
-                    for stmt in statements:
-                        cursor.execute(stmt, bindings, configuration)
-                else:
-                    cursor.execute(sql, bindings, configuration)
+                for statement, statement_bindings in zip(
+                    statements, split_bindings(statements, bindings)
+                ):
+                    try:
+                        cursor, statement_retries = self._execute_statement(
+                            connection,
+                            cursor,
+                            statement,
+                            statement_bindings,
+                            configuration,
+                            metrics_sink,
+                        )
+                    finally:
+                        # failed DDL may have been partially applied
+                        self.metadata_cache.invalidate_for_statement(statement)
+                    retries += statement_retries
+                cursor.retries = retries
                 str(self.get_response(cursor))
             except Exception as ex:
                 str(ex)
@@ -389,6 +764,95 @@ class HiveConnectionManager(SQLConnectionManager):
 
             return connection, cursor
 
+    def _execute_statement(
+        self,
+        connection: Connection,
+        cursor: HiveConnectionWrapper,
+        statement: SqlStatement,
+        bindings: Optional[Any],
+        configuration: dict,
+        metrics_sink: Optional[QueryMetricsSink],
+    ) -> Tuple[HiveConnectionWrapper, int]:
+        """Execute one statement, retrying idempotent statements on a fresh
+        session after transient failures. Returns the cursor in use afterwards
+        and the number of retries."""
+        credentials = connection.credentials
+        max_retries = (credentials.query_retries or 0) if statement.is_idempotent else 0
+        attempt = 0
+        reconnect = False
+        while True:
+            started_at = time.time()
+            try:
+                if reconnect:
+                    cursor = self._reopen_connection(connection, cursor.session_settings)
+                    reconnect = False
+                cursor.execute(statement.executable, bindings, configuration)
+            except Exception as ex:
+                if attempt >= max_retries or not is_transient_error(ex):
+                    if metrics_sink:
+                        self._record_query_metrics(
+                            metrics_sink, connection, cursor, statement, started_at, False, attempt
+                        )
+                    raise
+                attempt += 1
+                delay = backoff_delay(
+                    attempt, credentials.query_retry_backoff, credentials.query_retry_max_backoff
+                )
+                logger.warning(
+                    f"Transient error running {statement.kind} statement: {ex}. "
+                    f"Retrying in {delay:.1f}s on a new session ({attempt}/{max_retries})"
+                )
+                time.sleep(delay)
+                reconnect = True
+                continue
+
+            if metrics_sink:
+                self._record_query_metrics(
+                    metrics_sink, connection, cursor, statement, started_at, True, attempt
+                )
+            return cursor, attempt
+
+    def _reopen_connection(
+        self, connection: Connection, session_settings: List[str]
+    ) -> HiveConnectionWrapper:
+        """Replace the (broken) session of `connection` by a new one with the
+        same session settings"""
+        if connection.handle is not None and connection.state == ConnectionState.OPEN:
+            connection.handle.discard()
+        connection.state = ConnectionState.CLOSED
+        self.open(connection)
+        cursor = connection.handle.cursor()
+        for setting in session_settings:
+            cursor.execute(setting)
+        return cursor
+
+    @staticmethod
+    def _record_query_metrics(
+        sink: QueryMetricsSink,
+        connection: Connection,
+        handle: HiveConnectionWrapper,
+        statement: SqlStatement,
+        started_at: float,
+        success: bool,
+        retries: int,
+    ):
+        sink.record(
+            QueryMetrics(
+                statement_kind=statement.kind,
+                started_at=started_at,
+                elapsed=time.time() - started_at,
+                success=success,
+                node_id=get_node_info().get("unique_id"),
+                connection_name=connection.name,
+                invocation_id=get_invocation_id(),
+                queue_time=handle.last_queue_time,
+                rows_affected=handle.rows_affected,
+                operation_id=handle.operation_id,
+                application_id=handle.application_id,
+                retries=retries,
+            )
+        )
+
     # No transactions on Hive....
     def add_begin_query(self, *args, **kwargs):
         logger.debug("NotImplemented: add_begin_query")
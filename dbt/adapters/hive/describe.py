@@ -0,0 +1,174 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Single pass parser of `describe formatted <relation>`.
+
+HiveServer2 returns the output as (col_name, data_type, comment) rows:
+
+    # col_name                      data_type       comment
+    id                              int             the id
+    <blank>
+    # Partition Information
+    # col_name                      data_type       comment
+    dt                              string
+    <blank>
+    # Detailed Table Information
+    Owner:                          hive
+    Table Type:                     MANAGED_TABLE
+    Table Parameters:
+                                    numRows         42
+    <blank>
+    # Storage Information
+    SerDe Library:                  org.apache...
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from dbt.adapters.hive.table_stats import TableStats
+
+SECTION_PARTITION = "# Partition Information"
+SECTION_PARTITION_TRANSFORM = "# Partition Transform Information"  # iceberg
+SECTION_TABLE_INFORMATION = "# Detailed Table Information"
+
+KEY_OWNER = "Owner"
+KEY_TABLE_TYPE = "Table Type"
+KEY_LOCATION = "Location"
+KEY_INPUT_FORMAT = "InputFormat"
+KEY_OUTPUT_FORMAT = "OutputFormat"
+KEY_SERDE = "SerDe Library"
+KEY_TABLE_PARAMETERS = "Table Parameters"
+KEY_STORAGE_PARAMETERS = "Storage Desc Params"
+
+# sections of the output, in order
+_COLUMNS, _PARTITIONS, _TRANSFORMS, _DETAILS = range(4)
+
+
+@dataclass
+class DescribedColumn:
+    name: str
+    data_type: str
+    comment: Optional[str] = None
+
+
+@dataclass
+class DescribeResult:
+    """Everything `describe formatted` says about a relation"""
+
+    columns: List[DescribedColumn] = field(default_factory=list)
+    partition_columns: List[DescribedColumn] = field(default_factory=list)
+    # iceberg partition transforms, the transform (e.g. DAY) as data_type
+    partition_transforms: List[DescribedColumn] = field(default_factory=list)
+    # `Key: value` rows of the detailed table and storage information
+    details: Dict[str, str] = field(default_factory=dict)
+    # None when the output has no Table Parameters section
+    table_parameters: Optional[Dict[str, str]] = None
+    storage_parameters: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def all_columns(self) -> List[DescribedColumn]:
+        """Data columns then partition columns, each name once"""
+        names = {column.name for column in self.columns}
+        return self.columns + [c for c in self.partition_columns if c.name not in names]
+
+    @property
+    def is_iceberg(self) -> bool:
+        return (self.table_parameters or {}).get("table_type", "").upper() == "ICEBERG"
+
+    @property
+    def owner(self) -> Optional[str]:
+        return self.details.get(KEY_OWNER)
+
+    @property
+    def table_type(self) -> Optional[str]:
+        return self.details.get(KEY_TABLE_TYPE)
+
+    @property
+    def location(self) -> Optional[str]:
+        return self.details.get(KEY_LOCATION)
+
+    @property
+    def input_format(self) -> Optional[str]:
+        return self.details.get(KEY_INPUT_FORMAT)
+
+    @property
+    def output_format(self) -> Optional[str]:
+        return self.details.get(KEY_OUTPUT_FORMAT)
+
+    @property
+    def serde(self) -> Optional[str]:
+        return self.details.get(KEY_SERDE)
+
+    @property
+    def statistics(self) -> TableStats:
+        return TableStats.from_parameters(self.table_parameters)
+
+
+def _text(value) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def parse_describe_formatted(rows: Iterable[Sequence]) -> DescribeResult:
+    """Parse the (col_name, data_type, comment) rows in a single pass"""
+    result = DescribeResult()
+    section = _COLUMNS
+    # plain `describe` repeats the partition columns with the data columns
+    seen: Dict[int, set] = {_COLUMNS: set(), _PARTITIONS: set()}
+    # the parameters block being read, rows with an empty col_name
+    parameters: Optional[Dict[str, str]] = None
+
+    for row in rows:
+        col_name = _text(row[0])
+        data_type = _text(row[1])
+
+        if col_name.startswith("#"):
+            if col_name.startswith(SECTION_PARTITION_TRANSFORM):
+                section = _TRANSFORMS
+            elif col_name.startswith(SECTION_PARTITION):
+                section = _PARTITIONS
+            elif col_name == SECTION_TABLE_INFORMATION:
+                section = _DETAILS
+            # other lines are headers of the current section
+            parameters = None
+            continue
+
+        if section == _DETAILS:
+            if col_name:
+                key = col_name.split(":")[0].strip()
+                parameters = None
+                if key == KEY_TABLE_PARAMETERS:
+                    result.table_parameters = parameters = {}
+                elif key == KEY_STORAGE_PARAMETERS:
+                    parameters = result.storage_parameters
+                elif data_type and data_type != "NULL":
+                    result.details[key] = data_type
+            elif data_type and data_type != "NULL" and parameters is not None:
+                parameters[data_type] = _text(row[2]) if len(row) > 2 else ""
+            else:
+                parameters = None
+            continue
+
+        if section == _TRANSFORMS:
+            if col_name:
+                result.partition_transforms.append(DescribedColumn(col_name, data_type))
+            continue
+        if not col_name or col_name in seen[section]:
+            continue
+        seen[section].add(col_name)
+        comment = _text(row[2]) if len(row) > 2 else ""
+        column = DescribedColumn(name=col_name, data_type=data_type, comment=comment or None)
+        if section == _PARTITIONS:
+            result.partition_columns.append(column)
+        else:
+            result.columns.append(column)
+
+    return result
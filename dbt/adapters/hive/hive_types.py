@@ -0,0 +1,251 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parsed Hive data types.
+
+`parse_hive_type("decimal(18, 2)")` returns a `HiveType` tree. Parsing is
+memoized per type string and the trees are interned: every spelling of a
+type yields the same object, so a catalog of millions of columns holds a
+handful of types and comparing two types is an identity check.
+"""
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Hive rejects varchar lengths above this, `string` has no length
+MAX_VARCHAR_LENGTH = 65535
+STRING_LENGTH = MAX_VARCHAR_LENGTH + 1
+
+DEFAULT_DECIMAL_PRECISION = 10
+DEFAULT_DECIMAL_SCALE = 0
+
+_ALIASES = {
+    "integer": "int",
+    "double precision": "double",
+    "real": "float",
+    "dec": "decimal",
+    "numeric": "decimal",
+    "number": "decimal",
+}
+
+# integer types, narrowest first
+_INTEGER_RANKS = {"tinyint": 0, "smallint": 1, "int": 2, "bigint": 3}
+_STRING_TYPES = frozenset(("string", "varchar", "char"))
+_FLOAT_RANKS = {"float": 0, "double": 1}
+_COMPLEX_TYPES = frozenset(("array", "map", "struct", "uniontype"))
+
+_TOKEN = re.compile(r"\s*(?:(`[^`]*`)|([A-Za-z_][A-Za-z0-9_]*)|(\d+)|(\S))")
+
+
+class HiveType:
+    """A data type: its name, numeric parameters (length, or precision and
+    scale) and, for complex types, the types it is made of"""
+
+    __slots__ = ("name", "params", "children", "field_names", "text")
+
+    def __init__(
+        self,
+        name: str,
+        params: Tuple[int, ...] = (),
+        children: Tuple["HiveType", ...] = (),
+        field_names: Tuple[str, ...] = (),
+        text: Optional[str] = None,
+    ):
+        self.name = name
+        self.params = params
+        self.children = children
+        self.field_names = field_names
+        self.text = text or _render(name, params, children, field_names)
+
+    def __eq__(self, other) -> bool:
+        return self is other or (isinstance(other, HiveType) and self.text == other.text)
+
+    def __hash__(self) -> int:
+        return hash(self.text)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"<HiveType {self.text}>"
+
+    @property
+    def is_string(self) -> bool:
+        return self.name in _STRING_TYPES
+
+    @property
+    def is_integer(self) -> bool:
+        return self.name in _INTEGER_RANKS
+
+    @property
+    def is_float(self) -> bool:
+        return self.name in _FLOAT_RANKS
+
+    @property
+    def is_decimal(self) -> bool:
+        return self.name == "decimal"
+
+    @property
+    def is_numeric(self) -> bool:
+        """Floating point and decimal types"""
+        return self.is_float or self.is_decimal
+
+    @property
+    def is_complex(self) -> bool:
+        return self.name in _COMPLEX_TYPES
+
+    @property
+    def length(self) -> Optional[int]:
+        """Length of a char or varchar, STRING_LENGTH for a string"""
+        if self.name == "string":
+            return STRING_LENGTH
+        if self.name in ("varchar", "char") and self.params:
+            return self.params[0]
+        return None
+
+    @property
+    def precision(self) -> Optional[int]:
+        if not self.is_decimal:
+            return None
+        return self.params[0] if self.params else DEFAULT_DECIMAL_PRECISION
+
+    @property
+    def scale(self) -> Optional[int]:
+        if not self.is_decimal:
+            return None
+        return self.params[1] if len(self.params) > 1 else DEFAULT_DECIMAL_SCALE
+
+    def can_widen_to(self, other: "HiveType") -> bool:
+        """Whether a column of this type can be altered to `other` without
+        losing values. Complex types are never widened."""
+        if self is other or self == other:
+            return False
+        if self.is_string and other.is_string:
+            if self.name == "string":
+                return False
+            # only a char widens to a longer char
+            if other.name == "char" and self.name != "char":
+                return False
+            return (other.length or 0) > (self.length or 0)
+        if self.is_integer and other.is_integer:
+            return _INTEGER_RANKS[other.name] > _INTEGER_RANKS[self.name]
+        if self.is_float and other.is_float:
+            return _FLOAT_RANKS[other.name] > _FLOAT_RANKS[self.name]
+        if self.is_decimal and other.is_decimal:
+            integer_digits = self.precision - self.scale
+            return other.scale >= self.scale and other.precision - other.scale >= integer_digits
+        return False
+
+
+def _render(
+    name: str,
+    params: Tuple[int, ...],
+    children: Tuple[HiveType, ...],
+    field_names: Tuple[str, ...],
+) -> str:
+    if field_names:
+        fields = ",".join(f"{n}:{c.text}" for n, c in zip(field_names, children))
+        return f"{name}<{fields}>"
+    if children:
+        return f"{name}<{','.join(c.text for c in children)}>"
+    if params:
+        return f"{name}({','.join(str(p) for p in params)})"
+    return name
+
+
+_interned: Dict[str, HiveType] = {}
+_interned_lock = threading.Lock()
+
+
+def _intern(hive_type: HiveType) -> HiveType:
+    with _interned_lock:
+        return _interned.setdefault(hive_type.text, hive_type)
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens: List[str] = []
+        for match in _TOKEN.finditer(text):
+            quoted, word, number, symbol = match.groups()
+            self.tokens.append(quoted or word or number or symbol)
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"expected {expected or 'a token'}, got {token}")
+        self.pos += 1
+        return token
+
+    def parse(self) -> HiveType:
+        hive_type = self.parse_type()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()}")
+        return hive_type
+
+    def parse_type(self) -> HiveType:
+        words = [self.take().lower()]
+        # `double precision`, `timestamp with local time zone`
+        while self.peek() is not None and self.peek()[0].isalpha():
+            words.append(self.take().lower())
+        name = " ".join(words)
+        name = _ALIASES.get(name, name)
+
+        params: Tuple[int, ...] = ()
+        if self.peek() == "(":
+            self.take("(")
+            values = [int(self.take())]
+            while self.peek() == ",":
+                self.take(",")
+                values.append(int(self.take()))
+            self.take(")")
+            params = tuple(values)
+
+        children: Tuple[HiveType, ...] = ()
+        field_names: Tuple[str, ...] = ()
+        if self.peek() == "<":
+            self.take("<")
+            if name == "struct":
+                field_names, children = self.parse_fields()
+            else:
+                types = [self.parse_type()]
+                while self.peek() == ",":
+                    self.take(",")
+                    types.append(self.parse_type())
+                children = tuple(types)
+            self.take(">")
+        return _intern(HiveType(name, params, children, field_names))
+
+    def parse_fields(self) -> Tuple[Tuple[str, ...], Tuple[HiveType, ...]]:
+        names, types = [], []
+        while True:
+            names.append(self.take().strip("`").lower())
+            self.take(":")
+            types.append(self.parse_type())
+            if self.peek() != ",":
+                return tuple(names), tuple(types)
+            self.take(",")
+
+
+@lru_cache(maxsize=65536)
+def parse_hive_type(text: str) -> HiveType:
+    """The type tree of a type string. Strings which do not parse become an
+    opaque type named after the whole string."""
+    try:
+        return _Parser(text).parse()
+    except (ValueError, IndexError):
+        return _intern(HiveType(text.strip().lower()))
@@ -0,0 +1,186 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import datetime
+import threading
+from dataclasses import dataclass
+from typing import ClassVar, Dict, Optional, Tuple
+
+from impala._thrift_api import ImpalaHttpClient
+from impala.util import get_all_cookies, get_cookie_expiry
+
+from dbt.adapters.events.logging import AdapterLogger
+
+logger = AdapterLogger("Hive")
+
+# impyla treats cookies named *.auth (e.g. hive.server2.auth) as auth cookies
+AUTH_COOKIE_SUFFIX = ".auth"
+
+
+@dataclass
+class HttpCookieStats:
+    """Counters describing how shared auth cookies have been used"""
+
+    # auth cookies set by the server, i.e. full LDAP/SPNEGO authentications
+    issued: int = 0
+    # connections which authenticated with a cookie of another connection
+    reused: int = 0
+    # shared cookies refused by the server (expired), followed by a new login
+    rejected: int = 0
+
+    def __str__(self):
+        return f"issued={self.issued}, reused={self.reused}, rejected={self.rejected}"
+
+
+@dataclass
+class _SharedCookie:
+    header: str
+    expiry: Optional[datetime.datetime]
+
+
+def _find_http_client(hive_conn) -> Optional[ImpalaHttpClient]:
+    """The HTTP transport under an impyla connection, None for binary transports"""
+    # impyla==0.22: HiveServer2Connection -> HS2Service -> TBufferedTransport
+    try:
+        transport = hive_conn.service.client._iprot.trans
+    except AttributeError:
+        return None
+    transport = getattr(transport, "_TBufferedTransport__trans", transport)
+    if isinstance(transport, ImpalaHttpClient):
+        return transport
+    return None
+
+
+class SharedHttpCookies:
+    """HiveServer2 HTTP auth cookies shared by every connection of a set of
+    credentials, so that LDAP/Kerberos authentication happens once and not
+    once per connection (hive.server2.thrift.http.cookie.auth.enabled).
+
+    Each connection keeps impyla's own cookie handling. The shared cookies
+    are only sent by connections which do not hold an auth cookie yet, and
+    are dropped as soon as the server refuses them with a 401.
+    """
+
+    _jars: ClassVar[Dict[str, "SharedHttpCookies"]] = {}
+    _jars_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, key: str):
+        self.key = key
+        self.stats = HttpCookieStats()
+        self._lock = threading.Lock()
+        self._cookies: Dict[str, _SharedCookie] = {}
+
+    @staticmethod
+    def credentials_key(credentials) -> str:
+        return (
+            f"{credentials.host}:{credentials.port}/{credentials.http_path or ''}"
+            f"@{credentials.username or ''}"
+        )
+
+    @classmethod
+    def for_credentials(cls, credentials) -> "SharedHttpCookies":
+        key = cls.credentials_key(credentials)
+        with cls._jars_lock:
+            jar = cls._jars.get(key)
+            if jar is None:
+                jar = cls(key)
+                cls._jars[key] = jar
+            return jar
+
+    @classmethod
+    def all_jars(cls):
+        with cls._jars_lock:
+            return list(cls._jars.values())
+
+    def cookie_header(self) -> Optional[str]:
+        """`Cookie` header value with the live shared auth cookies"""
+        now = datetime.datetime.now()
+        with self._lock:
+            for name, cookie in list(self._cookies.items()):
+                if cookie.expiry is not None and cookie.expiry <= now:
+                    del self._cookies[name]
+            if not self._cookies:
+                return None
+            return "; ".join(cookie.header for cookie in self._cookies.values())
+
+    def store(self, morsel):
+        with self._lock:
+            self._cookies[morsel.key] = _SharedCookie(
+                header=morsel.output(attrs=["value"], header="").strip(),
+                expiry=get_cookie_expiry(morsel),
+            )
+            self.stats.issued += 1
+        logger.debug(f"Stored HTTP auth cookie {morsel.key} for {self.key}")
+
+    def reject(self, header: str):
+        """Forget the cookies sent in `header`, the server refused them"""
+        with self._lock:
+            rejected = [name for name, c in self._cookies.items() if c.header in header]
+            for name in rejected:
+                del self._cookies[name]
+            if rejected:
+                self.stats.rejected += 1
+        if rejected:
+            logger.debug(f"HTTP auth cookie {', '.join(rejected)} expired for {self.key}")
+
+    def attach(self, hive_conn) -> bool:
+        """Share auth cookies with the HTTP transport of `hive_conn`. Must be
+        called before the session is opened. Returns False for binary
+        transports."""
+        client = _find_http_client(hive_conn)
+        if client is None:
+            return False
+
+        own_cookie_header = client.getHttpCookieHeaderForRequest
+        own_extract_cookies = client.extractHttpCookiesFromResponse
+        own_cookies_saved = client.areHttpCookiesSaved
+        own_clean_cookies = client.cleanHttpCookies
+        # shared cookie header sent with the current request, if any
+        sent = {"header": None, "reused": False}
+
+        def cookie_header_for_request() -> Tuple[Optional[str], bool]:
+            header, has_auth_cookie = own_cookie_header()
+            sent["header"] = None
+            if has_auth_cookie:
+                return header, has_auth_cookie
+            shared = self.cookie_header()
+            if shared is None:
+                return header, has_auth_cookie
+            sent["header"] = shared
+            if not sent["reused"]:
+                sent["reused"] = True
+                with self._lock:
+                    self.stats.reused += 1
+            return "; ".join(filter(None, (header, shared))), True
+
+        def extract_cookies_from_response():
+            own_extract_cookies()
+            for morsel in get_all_cookies(client.path, client.headers) or []:
+                if morsel.key.endswith(AUTH_COOKIE_SUFFIX) and morsel.value:
+                    self.store(morsel)
+
+        def cookies_saved() -> bool:
+            # makes impyla retry once without cookies when a shared one expired
+            return own_cookies_saved() or sent["header"] is not None
+
+        def clean_cookies():
+            own_clean_cookies()
+            if sent["header"] is not None:
+                self.reject(sent["header"])
+                sent["header"] = None
+
+        client.getHttpCookieHeaderForRequest = cookie_header_for_request
+        client.extractHttpCookiesFromResponse = extract_cookies_from_response
+        client.areHttpCookiesSaved = cookies_saved
+        client.cleanHttpCookies = clean_cookies
+        return True
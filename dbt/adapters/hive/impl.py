@@ -11,24 +11,88 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import math
+import time
 from collections import OrderedDict
-from concurrent.futures import Future
+from concurrent.futures import Future, as_completed
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any, Union, Iterable, FrozenSet, Tuple
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, FrozenSet, Tuple
 import agate
 
 import dbt
 import dbt.exceptions
 
-from dbt.adapters.base import AdapterConfig
-from dbt.adapters.base.impl import catch_as_completed
+from dbt.adapters.base import AdapterConfig, available
+from dbt.adapters.cache import _make_ref_key_dict
+from dbt.adapters.events.types import CatalogGenerationError, ColTypeChange
 from dbt.adapters.sql import SQLAdapter
 from dbt.adapters.contracts.relation import RelationConfig
 
 from dbt.adapters.hive import HiveConnectionManager
 from dbt.adapters.hive import HiveRelation
 from dbt.adapters.hive import HiveColumn
+from dbt.adapters.hive.capabilities import HiveCapabilities
+from dbt.adapters.hive.describe import DescribeResult, parse_describe_formatted
+from dbt.adapters.hive.literals import render_values_batches
+from dbt.adapters.hive.metadata_cache import (
+    COLUMNS,
+    PROPERTIES,
+    RELATIONS,
+    SCHEMA_EXISTS,
+    SCHEMAS,
+    MetadataCache,
+    relation_key,
+)
+from dbt.adapters.hive.notification_log import SysNotificationLogSource
+from dbt.adapters.hive.partition_overwrite import (
+    DEFAULT_MAX_STATIC_PARTITIONS,
+    PARTITION_VALUES_MACRO_NAME,
+    dynamic_partition_configuration,
+    insert_overwrite_sql,
+)
+from dbt.adapters.hive.partition_predicates import (
+    COLUMN_RANGES_MACRO_NAME,
+    pruning_columns,
+    range_predicates,
+    value_predicates,
+)
+from dbt.adapters.hive.persistent_cache import (
+    SCHEMA_MARKERS_MACRO_NAME,
+    PersistentRelationCache,
+    parse_schema_markers,
+)
+from dbt.adapters.hive.relation_listing import (
+    merge_tables_and_views,
+    relation_type,
+    typed_relations,
+)
+from dbt.adapters.hive.sys_catalog import (
+    SYS_CATALOG_COLUMNS_MACRO_NAME,
+    SYS_CATALOG_TABLE_PARAMS,
+    SYS_CATALOG_TABLE_PARAMS_MACRO_NAME,
+    parse_sys_columns,
+    parse_sys_table_params,
+    sys_table_comment,
+)
+from dbt.adapters.hive.table_diff import (
+    DIFF_MODE_EXCEPT,
+    DIFF_MODE_HASH,
+    hash_diff_sql,
+    partitions_diff_sql,
+    validate_diff_mode,
+)
+from dbt.adapters.hive.table_rebuild import (
+    REBUILD_STRATEGY_INSERT_OVERWRITE,
+    REBUILD_STRATEGY_SWAP,
+    ResultColumn,
+    iceberg_rebuild_plan,
+    rebuild_mismatch,
+    result_columns,
+    validate_rebuild_strategy,
+)
+from dbt.adapters.hive.table_stats import TableStats
 from dbt.adapters.base import BaseRelation
+from dbt_common.events.functions import fire_event, warn_or_error
 from dbt_common.utils import executor
 
 from dbt_common.clients import agate_helper
@@ -37,17 +101,22 @@ from dbt.adapters.events.logging import AdapterLogger
 
 logger = AdapterLogger("Hive")
 
-GET_COLUMNS_IN_RELATION_MACRO_NAME = "get_columns_in_relation"
 LIST_SCHEMAS_MACRO_NAME = "list_schemas"
+LIST_SCHEMAS_LIKE_MACRO_NAME = "hive__list_schemas_like"
 
 LIST_RELATIONS_MACRO_NAME = "list_relations_without_caching"
+LIST_EXTENDED_TABLES_MACRO_NAME = "hive__list_extended_tables_without_caching"
 
 DROP_RELATION_MACRO_NAME = "drop_relation"
-FETCH_TBL_PROPERTIES_MACRO_NAME = "fetch_tbl_properties"
 GET_CATALOG_MACRO_NAME = "get_catalog"
 
-KEY_TABLE_INFORMATION = "# Detailed Table Information"
-KEY_TABLE_OWNER = "Owner:"
+# render the metadata queries whose rows are parsed as they are fetched
+GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME = "hive__get_columns_in_relation_sql"
+FETCH_TBL_PROPERTIES_SQL_MACRO_NAME = "fetch_tbl_properties_sql"
+
+# relations of a schema are catalogued in up to this many chunks per thread
+CATALOG_CHUNKS_PER_THREAD = 4
+
 KEY_TABLE_TYPE = "Table Type:"
 
 
@@ -72,6 +141,20 @@ class HiveAdapter(SQLAdapter):
     ConnectionManager = HiveConnectionManager
     AdapterSpecificConfigs = HiveConfig
 
+    # set once SHOW EXTENDED TABLES failed, relations are then listed with
+    # show tables and show views for the rest of the run
+    _show_extended_tables_failed = False
+    # set once the sys database could not be queried, the catalog is then
+    # built from describe formatted for the rest of the run
+    _sys_catalog_failed = False
+
+    def __init__(self, config, mp_context) -> None:
+        super().__init__(config, mp_context)
+        # partitions written by the pending insert overwrite of each relation
+        self._partitions_overwritten: Dict[str, int] = {}
+        # configuration overrides the pending insert overwrite of each relation needs
+        self._partition_overwrite_configuration: Dict[str, Dict[str, str]] = {}
+
     # @classmethod
     def date_function(cls) -> str:
         return "current_timestamp()"
@@ -97,6 +180,22 @@ class HiveAdapter(SQLAdapter):
     def convert_datetime_type(cls, agate_table, col_idx):
         return "timestamp"
 
+    @available
+    def hive_capabilities(self) -> HiveCapabilities:
+        """Version, ACID, MERGE and Iceberg support of the connected server"""
+        return self.connections.hive_capabilities()
+
+    @available
+    def render_seed_values(
+        self, agate_table: agate.Table, column_types: List[str], batch_size: int
+    ) -> Iterator[str]:
+        """Rows of a seed as `values` tuples of literals, one string per batch"""
+        return render_values_batches(agate_table, column_types, batch_size)
+
+    @property
+    def metadata_cache(self) -> MetadataCache:
+        return self.connections.metadata_cache
+
     def quote(self, identifier):
         return f"`{identifier}`"
 
@@ -128,67 +227,117 @@ class HiveAdapter(SQLAdapter):
         """Get a list of Relation(table or view) by SQL directly
         Use different SQL statement for view/table
         """
+        self._follow_metastore_events()
+        schema = schema_relation.schema
+        return list(
+            self.metadata_cache.get_or_load(
+                RELATIONS,
+                schema.lower() if schema else None,
+                lambda: self._list_relations_persisted(schema_relation),
+            )
+        )
+
+    def _list_relations_persisted(self, schema_relation: HiveRelation) -> List[HiveRelation]:
+        """The listing from the relation cache file when the schema did not
+        change since it was taken, `_list_relations` otherwise"""
+        cache = self._relation_cache_for(schema_relation.schema)
+        if cache is None or self.metadata_cache.was_invalidated(
+            RELATIONS, schema_relation.schema.lower()
+        ):
+            return self._list_relations(schema_relation)
+        cached = cache.relations(schema_relation.schema)
+        if cached is not None:
+            return self._create_relations(schema_relation, cached)
+        relations = self._list_relations(schema_relation)
+        cache.record_relations(schema_relation.schema, ((r.name, r.type) for r in relations))
+        return relations
+
+    def _follow_metastore_events(self):
+        """Apply the metastore events since the last poll to the metadata cache"""
+        follower = self.connections.notification_log
+        if follower is None:
+            return
+        if follower.source is None:
+            follower.source = SysNotificationLogSource(self.execute_macro)
+        if follower.relation_factory is None:
+            follower.relation_factory = lambda schema, identifier, table_type: (
+                self.Relation.create(
+                    schema=schema, identifier=identifier, type=relation_type(table_type)
+                )
+            )
+        follower.poll()
+
+    def _relation_cache_for(self, schema: Optional[str]) -> Optional[PersistentRelationCache]:
+        """The relation cache file, once the markers of `schema` are known"""
+        cache = self.connections.relation_cache
+        if cache is None or not schema or not cache.enabled:
+            return None
+        with cache.lock:
+            if cache.markers(schema) is None:
+                schemas = sorted(cache.unchecked_schemas(schema))
+                try:
+                    rows = self.execute_macro(
+                        SCHEMA_MARKERS_MACRO_NAME, kwargs={"schemas": schemas}
+                    )
+                except dbt.exceptions.DbtRuntimeError as e:
+                    cache.disable(e)
+                    return None
+                cache.set_markers(parse_schema_markers(schemas, rows))
+        return cache if cache.enabled else None
+
+    def _list_relations(self, schema_relation: HiveRelation) -> List[HiveRelation]:
         kwargs = {"schema": schema_relation}
         try:
+            if self._use_show_extended_tables():
+                try:
+                    rows = self.execute_macro(LIST_EXTENDED_TABLES_MACRO_NAME, kwargs=kwargs)
+                    relations = typed_relations((row[0], row[1]) for row in rows)
+                    return self._create_relations(schema_relation, relations)
+                except dbt.exceptions.DbtRuntimeError as e:
+                    if self._is_schema_not_found(e, schema_relation):
+                        raise
+                    logger.debug(f"show extended tables failed, listing tables and views: {e}")
+                    self._show_extended_tables_failed = True
+
             result_tables = self.execute_macro("hive__list_tables_without_caching", kwargs=kwargs)
             result_views = self.execute_macro("hive__list_views_without_caching", kwargs=kwargs)
         except dbt.exceptions.DbtRuntimeError as e:
-            errmsg = getattr(e, "msg", "")
-            if f"Database '{schema_relation}' not found" in errmsg:
+            if self._is_schema_not_found(e, schema_relation):
                 return []
             else:
                 description = "Error while retrieving information about"
                 logger.debug(f"{description} {schema_relation}: {e.msg}")
                 return []
 
-        # hive2
-        # Collect table/view separately
-        # Unfortunatly, Hive2 does not distincguish table/view
-        # Currently views are also listed in `show tables`
-        # https://issues.apache.org/jira/browse/HIVE-14558
-        # all_rows = result_tables
-        # relations = []
-        # for row in all_rows:
-        #    relation_type = self.get_relation_type(f"{schema_relation}.{row['tab_name']}")
-        #    relations.append(
-        #         self.Relation.create(
-        #            schema=schema_relation.schema,
-        #            identifier=row['tab_name'],
-        #            type=relation_type
-        #        )
-        #    )
-
         # in Hive 2, result_tables has table + view, result_views only has views
-        # so we build a result_tables_without_view that doesnot have views
+        relations = merge_tables_and_views(
+            (row["tab_name"] for row in result_tables),
+            (row["tab_name"] for row in result_views),
+        )
+        return self._create_relations(schema_relation, relations)
 
-        result_tables_without_view = []
-        for row in result_tables:
-            # check if this table is view
-            is_view = (
-                len(list(filter(lambda x: x["tab_name"] == row["tab_name"], result_views))) == 1
-            )
-            if not is_view:
-                result_tables_without_view.append(row)
+    def _use_show_extended_tables(self) -> bool:
+        """Whether relations are listed with a single SHOW EXTENDED TABLES"""
+        if self._show_extended_tables_failed:
+            return False
+        return self.hive_capabilities().supports_show_extended_tables
 
-        relations = []
-        for row in result_tables_without_view:
-            relations.append(
-                self.Relation.create(
-                    schema=schema_relation.schema,
-                    identifier=row["tab_name"],
-                    type="table",
-                )
-            )
-        for row in result_views:
-            relations.append(
-                self.Relation.create(
-                    schema=schema_relation.schema,
-                    identifier=row["tab_name"],
-                    type="view",
-                )
-            )
+    @staticmethod
+    def _is_schema_not_found(error: dbt.exceptions.DbtRuntimeError, schema_relation) -> bool:
+        errmsg = getattr(error, "msg", "")
+        return f"Database '{schema_relation}' not found" in errmsg
 
-        return relations
+    def _create_relations(
+        self, schema_relation: HiveRelation, relations: Iterable[Tuple[str, str]]
+    ) -> List[HiveRelation]:
+        return [
+            self.Relation.create(
+                schema=schema_relation.schema,
+                identifier=identifier,
+                type=type_,
+            )
+            for identifier, type_ in relations
+        ]
 
     def get_relation(self, database: str, schema: str, identifier: str) -> Optional[BaseRelation]:
         """Get a Relation for own list"""
@@ -197,144 +346,177 @@ class HiveAdapter(SQLAdapter):
 
         return super().get_relation(database, schema, identifier)
 
-    @staticmethod
-    def find_table_information_separator(rows: List[dict]) -> int:
-        """Returns the row number of the table information sections"""
-        pos = 0
-        for row in rows:
-            if row["col_name"] and row["col_name"].strip() == KEY_TABLE_INFORMATION:
-                break
-            pos += 1
-        return pos
-
-    @staticmethod
-    def parse_columns_info(raw_rows, start, end):
-        # remove comments columns
-        valid_rows = [
-            (row)
-            for row in raw_rows[start:end]
-            if not row["col_name"].startswith("#") and not row["col_name"] == ""
-        ]
-
-        # avoid overridding duplicate columns by partition columns
-        unique_rows = []
-        for row in valid_rows:
-            curr_unique_keys = list({row["col_name"]: row for row in unique_rows})
-            if row["col_name"] not in curr_unique_keys:
-                unique_rows.append(row)
-        return unique_rows
-
-    def _hive_describe_row_comment(self, column_row) -> Optional[str]:
-        """
-        Helper function to safely read and extract the column comment string
-        from a Hive 'DESCRIBE FORMATTED' row object. (Read-only)
-        """
-        if column_row is None:
-            return None
-        keys = getattr(column_row, "_keys", None)
-        values = getattr(column_row, "_values", None)
-        row = (
-            dict(zip(keys, values))
-            if keys is not None and values is not None
-            else dict(column_row)
-        )
-        raw = row.get("comment")
-        if raw is None:
-            raw = row.get("Comment")
-        if raw is None:
-            return None
-        text = str(raw).strip()
-        return text if text else None
-
     def parse_describe_formatted(
         self, relation: Relation, raw_rows: List[agate.Row]
     ) -> List[HiveColumn]:
-        # Convert the Row to a dict
-        dict_rows = [dict(zip(row._keys, row._values)) for row in raw_rows]
-        # Find the separator between columns and partitions information
-        # by the DESCRIBE EXTENDED {{relation}} statement
-        partition_separator_pos = self.find_partition_information_separator(dict_rows)
-
-        # Find the separator between the rows and the metadata provided
-        # by the DESCRIBE EXTENDED {{relation}} statement
-        table_separator_pos = self.find_table_information_separator(dict_rows)
-
-        column_separator_pos = (
-            partition_separator_pos if partition_separator_pos > 0 else table_separator_pos
-        )
-        logger.debug(
-            f"relation={relation}, "
-            f"partition_separator_pos = {partition_separator_pos}, "
-            f"table_separator_pos = {table_separator_pos}, "
-            f"column_separator_pos = {column_separator_pos}"
-        )
-
-        # fetch columns info
-        rows = self.parse_columns_info(raw_rows, 0, table_separator_pos)
-
-        metadata = {
-            col["col_name"].split(":")[0].strip(): col["data_type"].strip()
-            for col in raw_rows[table_separator_pos + 1 :]
-            if col["col_name"] and not col["col_name"].startswith("#") and col["data_type"]
-        }
-
-        # raw_table_stats = metadata.get(KEY_TABLE_STATISTICS)
-        # table_stats = HiveColumn.convert_table_stats(raw_table_stats)
-
-        # strip white spaces
-        new_metadata = {}
-        for k in metadata:
-            new_metadata[k.strip()] = metadata[k].strip() if metadata[k] else ""
-        metadata = new_metadata
+        describe = parse_describe_formatted(raw_rows)
+        return self._columns_from_describe(relation, describe, describe.statistics)
 
+    @staticmethod
+    def _columns_from_describe(
+        relation: Relation, describe: DescribeResult, table_stats: TableStats
+    ) -> List[HiveColumn]:
+        owner = str(describe.owner)
+        stats = HiveColumn.convert_table_stats(table_stats)
         return [
             HiveColumn(
                 table_database=None,
                 table_schema=relation.schema,
                 table_name=relation.name,
                 table_type=relation.type,
-                table_owner=str(metadata.get(KEY_TABLE_OWNER)),
-                table_stats=None,
-                column=column["col_name"],
+                table_owner=owner,
+                table_stats=stats,
+                column=column.name,
                 column_index=idx,
-                dtype=column["data_type"],
-                comment=self._hive_describe_row_comment(column),
+                dtype=column.data_type,
+                comment=column.comment,
             )
-            for idx, column in enumerate(rows)
-        ]
-
-    @staticmethod
-    def find_partition_information_separator(rows: List[dict]) -> int:
-        pos = 0
-        ps_keys = [
-            "# Partition Information",  # non-iceberg
-            "# Partition Transform Information",  # iceberg
+            for idx, column in enumerate(describe.all_columns)
         ]
-        for row in rows:
-            if row["col_name"] and row["col_name"].startswith(tuple(ps_keys)):
-                break
-            pos += 1
-        result = 0 if (pos == len(rows)) else pos
-        return result
-
-    @staticmethod
-    def find_table_information_separator(rows: List[dict]) -> int:
-        """Find the position of table defailt information"""
-        pos = 0
-        for row in rows:
-            if row["col_name"] == "# Detailed Table Information":
-                break
-            pos += 1
-        return pos
 
     def get_columns_in_relation(self, relation: Relation) -> List[HiveColumn]:
         """Get columns from a Relation
         parent method is used to call DESCRIBE <tablename> statement
         dtype is used for correct quote
         """
+        describe = self.describe_relation(relation)
+        if describe is None:
+            return []
+        return self._columns_from_describe(relation, describe, self.get_table_stats(relation))
+
+    def expand_column_types(self, goal: BaseRelation, current: BaseRelation) -> None:
+        """Widen the columns of `current` whose type in `goal` holds more:
+        longer strings, wider integers, floats and decimals"""
+        reference_columns = {c.name: c for c in self.get_columns_in_relation(goal)}
+        target_columns = {c.name: c for c in self.get_columns_in_relation(current)}
+
+        for column_name, reference_column in reference_columns.items():
+            target_column = target_columns.get(column_name)
+            if target_column is not None and target_column.can_expand_to(reference_column):
+                new_type = reference_column.expanded_data_type
+                fire_event(
+                    ColTypeChange(
+                        orig_type=target_column.data_type,
+                        new_type=new_type,
+                        table=_make_ref_key_dict(current),
+                    )
+                )
+                self.alter_column_type(current, self.quote(column_name), new_type)
+
+    @available
+    def get_table_stats(self, relation: Relation) -> TableStats:
+        """numRows, rawDataSize, totalSize and numFiles of a relation from the
+        metastore statistics, without running a query on the data"""
+        return TableStats.from_parameters(self.get_properties(relation))
+
+    def describe_relation(self, relation: Relation) -> Optional[DescribeResult]:
+        """`describe formatted` of a relation, None when it does not exist"""
+        self._follow_metastore_events()
+        return self.metadata_cache.get_or_load(
+            COLUMNS,
+            relation_key(relation.schema, relation.identifier),
+            lambda: self._describe_relation_persisted(relation),
+        )
+
+    @available
+    def rebuild_strategy_for(
+        self,
+        relation: Optional[Relation],
+        sql: str,
+        rebuild_strategy: str,
+        file_format: Optional[str] = None,
+        external: bool = False,
+        location: Optional[str] = None,
+    ) -> str:
+        """The rebuild strategy the table materialization uses for `relation`:
+        insert_overwrite only when asked for and when the columns of `sql`
+        match the existing table, swap otherwise"""
+        if validate_rebuild_strategy(rebuild_strategy) != REBUILD_STRATEGY_INSERT_OVERWRITE:
+            return rebuild_strategy
+        if relation is None:
+            return REBUILD_STRATEGY_SWAP
+        mismatch = rebuild_mismatch(
+            self._query_result_columns(sql),
+            self.describe_relation(relation),
+            file_format=file_format,
+            external=external,
+            location=location,
+        )
+        if mismatch is not None:
+            logger.debug(f"Rebuilding {relation} by swap: {mismatch}")
+            return REBUILD_STRATEGY_SWAP
+        return rebuild_strategy
+
+    @available
+    def iceberg_rebuild_plan(
+        self,
+        relation: Optional[Relation],
+        sql: str,
+        rebuild_strategy: str,
+        partitioned: bool = False,
+    ) -> Dict[str, Any]:
+        """How the table materialization rebuilds the Iceberg table `relation`:
+        with insert_overwrite, the schema changes to apply before writing the
+        result of `sql` as a new snapshot, in place of dropping the table"""
+        plan = {"rebuild_strategy": validate_rebuild_strategy(rebuild_strategy)}
+        if rebuild_strategy != REBUILD_STRATEGY_INSERT_OVERWRITE:
+            return plan
+        if relation is None:
+            return {"rebuild_strategy": REBUILD_STRATEGY_SWAP}
+        changes = iceberg_rebuild_plan(
+            self._query_result_columns(sql), self.describe_relation(relation), partitioned
+        )
+        if changes.mismatch is not None:
+            logger.debug(f"Rebuilding {relation} by swap: {changes.mismatch}")
+            return {"rebuild_strategy": REBUILD_STRATEGY_SWAP}
+        for key in ("replace_columns", "add_columns", "change_columns"):
+            plan[key] = [HiveColumn(name, data_type) for name, data_type in getattr(changes, key)]
+        plan["column_names"] = [self.quote(name) for name in changes.column_names]
+        return plan
+
+    def _query_result_columns(self, sql: str) -> List[ResultColumn]:
+        _, cursor = self.connections.add_select_query(
+            self.execute_macro("get_empty_subquery_sql", kwargs={"select_sql": sql})
+        )
+        return result_columns(cursor.description)
+
+    @available
+    def rebuild_started(self) -> float:
+        return time.time()
+
+    @available
+    def record_rebuild(
+        self, relation: Relation, rebuild_strategy: str, started_at: float, response=None
+    ) -> str:
+        """Log how long rebuilding `relation` took and add it to the adapter
+        response of the main statement, which ends up in run_results.json"""
+        elapsed = time.time() - started_at
+        logger.debug(f"Rebuilt {relation} by {rebuild_strategy} in {elapsed:.2f}s")
+        if response is not None:
+            response.rebuild_strategy = rebuild_strategy
+            response.rebuild_seconds = round(elapsed, 3)
+        return ""
+
+    def _describe_relation_persisted(self, relation: Relation) -> Optional[DescribeResult]:
+        key = relation_key(relation.schema, relation.identifier)
+        cache = self._relation_cache_for(relation.schema) if key else None
+        if cache is None or self.metadata_cache.was_invalidated(COLUMNS, key):
+            return self._describe_relation(relation)
+        describe = cache.describe(relation.schema, relation.identifier)
+        if describe is None:
+            describe = self._describe_relation(relation)
+            if describe is not None:
+                cache.record_describe(relation.schema, relation.identifier, describe)
+        return describe
+
+    def _describe_relation(self, relation: Relation) -> Optional[DescribeResult]:
         try:
-            rows: List[agate.Row] = super().get_columns_in_relation(relation)
-            columns = self.parse_describe_formatted(relation, rows)
+            # parsed as the rows are fetched, the raw result is never held
+            describe = parse_describe_formatted(
+                self._stream_macro_query(
+                    "get_columns_in_relation", GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME, relation
+                )
+            )
         except dbt.exceptions.DbtRuntimeError as e:
             # impala would throw error when table doesn't exist
             errmsg = getattr(e, "msg", "")
@@ -344,25 +526,66 @@ class HiveAdapter(SQLAdapter):
                 or "Could not resolve path" in errmsg
                 or "Table not found" in errmsg
             ):
-                return []
+                return None
             else:
                 raise e
 
-        return columns
+        logger.debug(
+            f"relation={relation}, columns={len(describe.columns)}, "
+            f"partition_columns={len(describe.partition_columns)}"
+        )
+        return describe
+
+    def _stream_macro_query(
+        self, name: str, macro_name: str, relation: Relation
+    ) -> Iterator[tuple]:
+        """The rows of the query `macro_name` renders for `relation`, as they
+        are fetched"""
+        sql = self.execute_macro(macro_name, kwargs={"relation": relation})
+        return self.connections.stream_query(str(sql).strip(), name=name)
 
     def _get_columns_for_catalog(self, relation: HiveRelation) -> Iterable[Dict[str, Any]]:
         columns = self.get_columns_in_relation(relation)
         table_comment = self._table_comment_from_properties(relation)
 
         for column in columns:
-            as_dict = column.to_column_dict()
-            as_dict["column_name"] = as_dict.pop("column", None)
-            as_dict["column_type"] = as_dict.pop("dtype")
-            as_dict["table_database"] = None
-            as_dict["column_comment"] = column.comment
-            as_dict["table_comment"] = table_comment
+            yield self._catalog_column_dict(column, table_comment)
 
-            yield as_dict
+    @staticmethod
+    def _catalog_column_dict(column: HiveColumn, table_comment: Optional[str]) -> Dict[str, Any]:
+        as_dict = column.to_column_dict()
+        as_dict["column_name"] = as_dict.pop("column", None)
+        as_dict["column_type"] = as_dict.pop("dtype")
+        as_dict["table_database"] = None
+        as_dict["column_comment"] = column.comment
+        as_dict["table_comment"] = table_comment
+        return as_dict
+
+    def _get_sys_catalog_columns(self, schema: str) -> Optional[List[Dict[str, Any]]]:
+        """Catalog columns of every relation in `schema` from the `sys`
+        database, in two queries. None when `sys` cannot be used."""
+        if not self.config.credentials.use_sys_catalog or self._sys_catalog_failed:
+            return None
+        kwargs = {"schema": schema}
+        try:
+            column_rows = self.execute_macro(SYS_CATALOG_COLUMNS_MACRO_NAME, kwargs=kwargs)
+            param_rows = self.execute_macro(
+                SYS_CATALOG_TABLE_PARAMS_MACRO_NAME,
+                kwargs={"schema": schema, "param_keys": SYS_CATALOG_TABLE_PARAMS},
+            )
+        except dbt.exceptions.DbtRuntimeError as e:
+            logger.debug(f"sys database unavailable, describing each relation: {e}")
+            self._sys_catalog_failed = True
+            return None
+
+        table_params = parse_sys_table_params(param_rows)
+        columns: List[Dict[str, Any]] = []
+        for table_name, table_columns in parse_sys_columns(
+            schema, column_rows, table_params
+        ).items():
+            table_comment = sys_table_comment(table_params.get(table_name))
+            columns.extend(self._catalog_column_dict(c, table_comment) for c in table_columns)
+        return columns
 
     def _table_comment_from_properties(self, relation: HiveRelation) -> Optional[str]:
         """
@@ -379,74 +602,128 @@ class HiveAdapter(SQLAdapter):
         return text if text else None
 
     def get_properties(self, relation: Relation) -> Dict[str, str]:
-        """ """
-        properties = self.execute_macro(
-            FETCH_TBL_PROPERTIES_MACRO_NAME, kwargs={"relation": relation}
+        """Table parameters, read from `describe formatted` which the columns
+        and the catalog share, with `show tblproperties` as a fallback"""
+        describe = self.describe_relation(relation)
+        if describe is None:
+            return {}
+        if describe.table_parameters is not None:
+            return dict(describe.table_parameters)
+        return dict(
+            self.metadata_cache.get_or_load(
+                PROPERTIES,
+                relation_key(relation.schema, relation.identifier),
+                lambda: dict(
+                    self._stream_macro_query(
+                        "list_properties", FETCH_TBL_PROPERTIES_SQL_MACRO_NAME, relation
+                    )
+                ),
+            )
+        )
+
+    def list_schemas(self, database: str) -> List[str]:
+        self._follow_metastore_events()
+        return list(
+            self.metadata_cache.get_or_load(
+                SCHEMAS, "", lambda: super(HiveAdapter, self).list_schemas(database)
+            )
         )
-        return dict(properties)
 
     def get_catalog(
         self, relation_configs: Iterable[RelationConfig], used_schemas: FrozenSet[Tuple[str, str]]
     ):
-        """Return a catalogs that contains information of all schemas"""
+        """Return a catalogs that contains information of all schemas
+
+        Schemas are catalogued in parallel. The relations of a schema which
+        is described relation by relation are split into chunks, catalogued
+        in parallel as well, each worker on its own connection. Results are
+        merged in schema and relation order, whatever the completion order.
+        """
         schema_map = self._get_catalog_schemas(relation_configs)
         if len(schema_map) > 1:
             dbt.exceptions.CompilationError(
                 f"Expected only one database in get_catalog, found " f"{list(schema_map)}"
             )
+        targets = [
+            (info, schema) for info, schemas in schema_map.items() for schema in sorted(schemas)
+        ]
 
+        catalogs: List[agate.Table] = []
+        exceptions: List[Exception] = []
         # run heavy job in other threads
         with executor(self.config) as tpe:
-            futures: List[Future[agate.Table]] = []
-            for info, schemas in schema_map.items():
-                for schema in schemas:
-                    futures.append(
-                        tpe.submit_connected(self, schema, self._get_one_catalog, info, [schema])
-                    )
-            # at this point all catalogs in futures list will be merged into one
-            # insides`catch_on_completed` method of the parent class
-            catalogs, exceptions = catch_as_completed(futures)
-
-        #         catalogs = agate.Table([])
-        #         exceptions = None
-        #         for info, schemas in schema_map.items():
-        #             for schema in schemas:
-        #                 catalog = self._get_one_catalog(info,[schema],manifest)
-        #                 # print('len of catalogs: {}'.format(len(catalogs)))
-        #                 print(catalogs)
-        #                 print("-------")
-        #                 print(catalog)
-        #                 # print('len of the new catalog: {}'.format(len(catalog)))
-        #                 catalogs = agate.Table.merge([catalogs,catalog])
-
-        return catalogs, exceptions
-
-    def _get_one_catalog(self, information_schema, schemas) -> agate.Table:
-        """Get ONE catalog. Used by get_catalog
-
-        manifest is used to run the method in other context's
-        threadself.get_columns_in_relation
-        """
-        if len(schemas) != 1:
-            dbt.exceptions.CompilationError(
-                f"Expected only one schema in Hive _get_one_catalog, found " f"{schemas}"
-            )
-
-        database = information_schema.database
-        schema = list(schemas)[0]
-
-        schema_relation = self.Relation.create(
-            database=database,
-            schema=schema,
-            identifier="",
-            quote_policy=self.config.quoting,
-        ).without_identifier()
+            # first the sys catalog, or the relations to describe, of each schema
+            plans = {
+                tpe.submit_connected(self, schema, self._plan_one_catalog, info, schema): position
+                for position, (info, schema) in enumerate(targets)
+            }
+            sys_columns: List[Optional[List[Dict[str, Any]]]] = [None] * len(targets)
+            schema_chunks: List[List[Future]] = [[] for _ in targets]
+            # a schema's chunks are submitted as soon as its plan is ready
+            for plan in as_completed(plans):
+                position = plans[plan]
+                try:
+                    columns, relations = plan.result()
+                except Exception as exc:
+                    self._catalog_generation_error(exc, exceptions)
+                    continue
+                if columns is not None:
+                    sys_columns[position] = columns
+                    continue
+                schema = targets[position][1]
+                schema_chunks[position] = [
+                    tpe.submit_connected(self, schema, self._get_catalog_columns, chunk)
+                    for chunk in self._split_catalog_relations(relations)
+                ]
+
+            for position in range(len(targets)):
+                columns = list(sys_columns[position] or [])
+                failed = False
+                for chunk in schema_chunks[position]:
+                    try:
+                        columns.extend(chunk.result())
+                    except Exception as exc:
+                        self._catalog_generation_error(exc, exceptions)
+                        failed = True
+                # empty catalogs would be typed differently, skip them
+                if columns and not failed:
+                    catalogs.append(self._catalog_table(columns))
+
+        return agate_helper.merge_tables(catalogs), exceptions
 
+    @staticmethod
+    def _catalog_generation_error(exc: Exception, exceptions: List[Exception]):
+        warn_or_error(CatalogGenerationError(exc=str(exc)))
+        exceptions.append(exc)
+
+    def _split_catalog_relations(self, relations: List[BaseRelation]) -> List[List[BaseRelation]]:
+        """Chunks of relations for the thread pool, several per thread so
+        that slow relations do not leave threads idle"""
+        threads = max(1, self.config.threads or 1)
+        size = max(1, math.ceil(len(relations) / (threads * CATALOG_CHUNKS_PER_THREAD)))
+        return [relations[i : i + size] for i in range(0, len(relations), size)]
+
+    def _plan_one_catalog(
+        self, information_schema, schema: str
+    ) -> Tuple[Optional[List[Dict[str, Any]]], List[BaseRelation]]:
+        """The catalog columns of `schema` when the sys database can be used,
+        otherwise the relations which have to be described"""
+        columns = self._get_sys_catalog_columns(schema)
+        if columns is not None:
+            return columns, []
+        return None, self.list_relations(information_schema.database, schema)
+
+    def _get_catalog_columns(self, relations: Iterable[BaseRelation]) -> List[Dict[str, Any]]:
         columns: List[Dict[str, Any]] = []
-        for relation in self.list_relations(database, schema):
+        for relation in relations:
             logger.debug(f"Getting table schema for relation {relation}")
+            started_at = time.time()
             columns.extend(self._get_columns_for_catalog(relation))
+            logger.debug(f"Catalog of {relation} built in {time.time() - started_at:.3f}s")
+        return columns
 
+    @staticmethod
+    def _catalog_table(columns: List[Dict[str, Any]]) -> agate.Table:
         if len(columns) > 0:
             text_types = agate_helper.build_type_tester(["table_owner", "table_database"])
         else:
@@ -457,11 +734,46 @@ class HiveAdapter(SQLAdapter):
             column_types=text_types,
         )
 
+    def _get_one_catalog(self, information_schema, schemas) -> agate.Table:
+        """Get ONE catalog, on the current thread"""
+        if len(schemas) != 1:
+            dbt.exceptions.CompilationError(
+                f"Expected only one schema in Hive _get_one_catalog, found " f"{schemas}"
+            )
+
+        schema = list(schemas)[0]
+        columns, relations = self._plan_one_catalog(information_schema, schema)
+        if columns is None:
+            columns = self._get_catalog_columns(relations)
+        return self._catalog_table(columns)
+
     def check_schema_exists(self, database, schema):
-        results = self.execute_macro(LIST_SCHEMAS_MACRO_NAME, kwargs={"database": database})
+        """Answered once per schema and run: from the cached list of schemas
+        when there is one, otherwise with `show databases like '<schema>'`.
+        hive__create_schema and hive__drop_schema keep the answer current."""
+        if not schema:
+            return False
+        self._follow_metastore_events()
+        name = schema.lower()
+        schemas = self.metadata_cache.lookup(SCHEMAS, "")
+        if schemas is not None:
+            return name in {s.lower() for s in schemas}
+        return self.metadata_cache.get_or_load(
+            SCHEMA_EXISTS, name, lambda: self._check_schema_exists(schema)
+        )
 
-        exists = True if schema in [row[0] for row in results] else False
-        return exists
+    def _check_schema_exists(self, schema: str) -> bool:
+        results = self.execute_macro(LIST_SCHEMAS_LIKE_MACRO_NAME, kwargs={"schema": schema})
+        # like patterns use wildcards, compare the names themselves
+        return schema.lower() in {row[0].lower() for row in results}
+
+    @available
+    def set_schema_exists(self, schema: str, exists: bool) -> str:
+        """Record that a schema was just created or dropped"""
+        if schema:
+            self.metadata_cache.put(SCHEMA_EXISTS, schema.lower(), exists)
+        # so jinja doesn't render things
+        return ""
 
     ###
     # Overrides SQLAdapter.debug_query to also log the current user's grants
@@ -520,25 +832,27 @@ class HiveAdapter(SQLAdapter):
                 grants_dict.update({privilege: [grantee]})
         return grants_dict
 
+    @available
     def get_rows_different_sql(
         self,
         relation_a: BaseRelation,
         relation_b: BaseRelation,
         column_names: Optional[List[str]] = None,
         except_operator: str = "EXCEPT",
+        diff_mode: str = DIFF_MODE_EXCEPT,
     ) -> str:
         """Generate SQL for a query that returns a single row with a two
         columns: the number of rows that are different between the two
         relations and the number of mismatched rows.
+
+        diff_mode="hash" reads each relation once and compares row hashes,
+        instead of two EXCEPTs and two counts.
         """
 
         # This method only really exists for test reasons.
-        names: List[str]
-        if column_names is None:
-            columns = self.get_columns_in_relation(relation_a)
-            names = sorted(self.quote(c.name) for c in columns)
-        else:
-            names = sorted(self.quote(n) for n in column_names)
+        names = self._diff_column_names(relation_a, column_names)
+        if validate_diff_mode(diff_mode) == DIFF_MODE_HASH:
+            return hash_diff_sql(names, str(relation_a), str(relation_b))
         columns_csv = ", ".join(names)
 
         sql = COLUMNS_EQUAL_SQL.format(
@@ -550,6 +864,116 @@ class HiveAdapter(SQLAdapter):
 
         return sql
 
+    @available
+    def partition_overwrite_sql(
+        self,
+        source_relation: BaseRelation,
+        target_relation: BaseRelation,
+        max_static_partitions: int = DEFAULT_MAX_STATIC_PARTITIONS,
+    ) -> Optional[str]:
+        """insert overwrite of the partitions of `target_relation` which hold
+        rows of `source_relation`, with static partition specs where the
+        partition values allow it. None when the target is not partitioned."""
+        describe = self.describe_relation(target_relation)
+        if describe is None or not describe.partition_columns:
+            return None
+        partition_names = [c.name for c in describe.partition_columns]
+        lower_partition_names = {name.lower() for name in partition_names}
+        data_names = [
+            c.name for c in describe.columns if c.name.lower() not in lower_partition_names
+        ]
+        partition_columns = [self.quote(name) for name in partition_names]
+        table = self.execute_macro(
+            PARTITION_VALUES_MACRO_NAME,
+            kwargs={"relation": source_relation, "partition_columns": partition_columns},
+        )
+        partitions = [tuple(None if v is None else str(v) for v in row) for row in table]
+        logger.debug(f"Overwriting {len(partitions)} partitions of {target_relation}")
+        self._partitions_overwritten[str(target_relation)] = len(partitions)
+        configuration = dynamic_partition_configuration(len(partitions))
+        self._partition_overwrite_configuration[str(target_relation)] = configuration
+        return insert_overwrite_sql(
+            str(target_relation),
+            str(source_relation),
+            [self.quote(name) for name in data_names],
+            partition_columns,
+            partitions,
+            max_static_partitions,
+        )
+
+    @available
+    def merge_partition_predicates(
+        self, source_relation: BaseRelation, target_relation: BaseRelation
+    ) -> List[str]:
+        """Predicates on DBT_INTERNAL_DEST restricting a merge into
+        `target_relation` to the partitions holding rows of `source_relation`"""
+        describe = self.describe_relation(target_relation)
+        if describe is None:
+            return []
+        by_value, by_range = pruning_columns(describe)
+        by_value = [(self.quote(name), data_type) for name, data_type in by_value]
+        by_range = [(self.quote(name), data_type) for name, data_type in by_range]
+        predicates = []
+        if by_value:
+            table = self.execute_macro(
+                PARTITION_VALUES_MACRO_NAME,
+                kwargs={
+                    "relation": source_relation,
+                    "partition_columns": [name for name, _ in by_value],
+                },
+            )
+            predicates.extend(value_predicates(by_value, table.rows))
+        if by_range:
+            table = self.execute_macro(
+                COLUMN_RANGES_MACRO_NAME,
+                kwargs={"relation": source_relation, "columns": [name for name, _ in by_range]},
+            )
+            predicates.extend(range_predicates(by_range, table.rows[0]))
+        logger.debug(f"Merge into {target_relation} restricted by: {predicates}")
+        return predicates
+
+    @available
+    def configure_partition_overwrite(self, relation: BaseRelation) -> str:
+        """Raise the dynamic partition limits for the next statement only, when
+        the pending insert overwrite of `relation` needs it"""
+        configuration = self._partition_overwrite_configuration.pop(str(relation), None)
+        if configuration:
+            logger.debug(f"Insert overwrite of {relation} runs with {configuration}")
+            self.connections.set_next_query_configuration(configuration)
+        return ""
+
+    @available
+    def record_partition_overwrite(self, relation: BaseRelation, response=None) -> str:
+        """Add the number of partitions the insert overwrite of `relation`
+        wrote to the adapter response of the main statement"""
+        num_partitions = self._partitions_overwritten.pop(str(relation), None)
+        if num_partitions is not None and response is not None:
+            response.partitions_overwritten = num_partitions
+        return ""
+
+    @available
+    def get_partitions_different_sql(
+        self,
+        relation_a: BaseRelation,
+        relation_b: BaseRelation,
+        partition_by: List[str],
+        column_names: Optional[List[str]] = None,
+    ) -> str:
+        """SQL returning the partitions whose rows differ between the two
+        relations: the partition_by values, num_rows_a and num_rows_b.
+        Each relation is read once."""
+        names = self._diff_column_names(relation_a, column_names)
+        partition_names = [self.quote(name) for name in partition_by]
+        return partitions_diff_sql(names, partition_names, str(relation_a), str(relation_b))
+
+    def _diff_column_names(
+        self, relation: BaseRelation, column_names: Optional[List[str]]
+    ) -> List[str]:
+        if column_names is None:
+            columns = self.get_columns_in_relation(relation)
+            return sorted(self.quote(c.name) for c in columns)
+        return sorted(self.quote(n) for n in column_names)
+
     def valid_incremental_strategies(self):
         """The set of standard builtin strategies which this adapter supports out-of-the-box.
         Not used to validate custom strategies defined by end users.
@@ -0,0 +1,115 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Render values as HiveQL literals on the client.
+
+The literals are the ones the bound parameter path produces (`add_query`
+binding cleanup, `HiveConnectionWrapper._fix_binding`, then impyla's
+parameter substitution): a NULL or empty value renders as the empty string,
+numbers and booleans as floats, timestamps with milliseconds.
+"""
+import datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterator, List, Sequence
+
+import agate
+
+from dbt_common.clients.agate_helper import Integer
+
+Formatter = Callable[[Any], str]
+
+EMPTY_LITERAL = "''"
+
+# same escapes as impyla's parameter substitution (impala.util._escape)
+_ESCAPES = str.maketrans(
+    {
+        "\\": "\\\\",
+        "\n": "\\n",
+        "\r": "\\r",
+        "'": "\\'",
+        '"': '\\"',
+    }
+)
+
+
+def format_string(value: Any) -> str:
+    if value is None:
+        return EMPTY_LITERAL
+    return "'" + str(value).translate(_ESCAPES) + "'"
+
+
+def format_number(value: Any) -> str:
+    if value is None:
+        return EMPTY_LITERAL
+    return str(float(value))
+
+
+def format_date(value: Any) -> str:
+    if value is None:
+        return EMPTY_LITERAL
+    if isinstance(value, datetime.datetime):
+        return format_datetime(value)
+    return "'" + str(value) + "'"
+
+
+def format_datetime(value: Any) -> str:
+    if value is None:
+        return EMPTY_LITERAL
+    return "'" + value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "'"
+
+
+def format_literal(value: Any) -> str:
+    """Render any value, checking its type, for columns of unknown type"""
+    if value is None or (not value and len(str(value)) == 0):
+        return EMPTY_LITERAL
+    if isinstance(value, (Decimal, int, float)):
+        return format_number(value)
+    if isinstance(value, datetime.datetime):
+        return format_datetime(value)
+    if isinstance(value, datetime.date):
+        return "'" + str(value) + "'"
+    if isinstance(value, str):
+        return format_string(value)
+    return str(value)
+
+
+def formatter_for(data_type: agate.data_types.DataType) -> Formatter:
+    """Pick the formatter of a column once, from its agate type"""
+    if isinstance(data_type, (agate.Number, agate.Boolean, Integer)):
+        return format_number
+    if isinstance(data_type, agate.DateTime):
+        return format_datetime
+    if isinstance(data_type, agate.Date):
+        return format_date
+    if isinstance(data_type, agate.Text):
+        return format_string
+    return format_literal
+
+
+def render_values_batches(
+    agate_table: agate.Table, column_types: Sequence[str], batch_size: int
+) -> Iterator[str]:
+    """Yield the rows of `agate_table` as the tuples of a `values` clause,
+    `batch_size` rows at a time, each value cast to its column type.
+
+    Values are rendered column by column, with one formatter per column.
+    """
+    formatters = [formatter_for(data_type) for data_type in agate_table.column_types]
+    rows = agate_table.rows
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        columns: List[List[str]] = []
+        for index, (formatter, column_type) in enumerate(zip(formatters, column_types)):
+            suffix = f" as {column_type})"
+            columns.append(["cast(" + formatter(row[index]) + suffix for row in batch])
+        yield ",\n".join("(" + ",".join(values) + ")" for values in zip(*columns))
@@ -0,0 +1,287 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+
+from dbt.adapters.hive.sql_splitter import SqlStatement
+
+logger = AdapterLogger("Hive")
+
+# kinds of cached metadata
+COLUMNS = "columns"  # describe formatted <relation>
+PROPERTIES = "properties"  # show tblproperties <relation>
+RELATIONS = "relations"  # show tables / show views in <schema>
+SCHEMAS = "schemas"  # show databases
+SCHEMA_EXISTS = "schema_exists"  # show databases like '<schema>'
+
+_RELATION_KINDS = (COLUMNS, PROPERTIES)
+
+# statements which never modify cached metadata (`analyze` updates statistics)
+_READ_ONLY_KEYWORDS = ("show", "describe", "desc", "explain", "use", "set", "grant", "revoke")
+
+# a possibly qualified, possibly quoted name
+_NAME = r"(`[^`]+`|[\w$]+)(?:\s*\.\s*(`[^`]+`|[\w$]+))?"
+
+_RELATION_DDL_PATTERN = re.compile(
+    r"(create|drop|alter)\s+(?:or\s+replace\s+)?"
+    r"(?:(?:temporary|external|transactional|managed)\s+)*"
+    r"(?:materialized\s+view|table|view)\s+(?:if\s+(?:not\s+)?exists\s+)?" + _NAME,
+    re.IGNORECASE,
+)
+_RENAME_PATTERN = re.compile(r"\brename\s+to\s+" + _NAME, re.IGNORECASE)
+_DML_PATTERN = re.compile(
+    r"(?:insert\s+(?:overwrite|into)(?:\s+table)?|merge\s+into|update|delete\s+from"
+    r"|truncate(?:\s+table)?|analyze\s+table"
+    r"|load\s+data\s+(?:local\s+)?inpath\s+'[^']*'\s+(?:overwrite\s+)?into\s+table)\s+" + _NAME,
+    re.IGNORECASE,
+)
+_SCHEMA_DDL_PATTERN = re.compile(
+    r"(?:create|drop|alter)\s+(?:database|schema)\s+(?:if\s+(?:not\s+)?exists\s+)?" + _NAME,
+    re.IGNORECASE,
+)
+
+
+def _unquote(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    return name.strip("`").lower()
+
+
+def relation_key(schema: Optional[str], identifier: Optional[str]) -> Optional[str]:
+    """Cache key of a relation, None when it cannot be cached"""
+    if not schema or not identifier:
+        return None
+    return f"{schema.lower()}.{identifier.lower()}"
+
+
+@dataclass
+class MetadataCacheStats:
+    """Counters describing how the metadata cache has been used"""
+
+    hits: int = 0
+    misses: int = 0
+    # requests which waited for an identical query already in flight
+    coalesced: int = 0
+    invalidations: int = 0
+
+    def __str__(self):
+        return (
+            f"hits={self.hits}, misses={self.misses}, coalesced={self.coalesced}, "
+            f"invalidations={self.invalidations}"
+        )
+
+
+class MetadataCache:
+    """Run-scoped cache of metadata query results (describe formatted, show
+    tblproperties, show tables/views, show databases).
+
+    Entries are keyed by kind and relation (or schema). Statements issued
+    through the adapter invalidate the entries of the relations they modify,
+    see `invalidate_for_statement`. Concurrent requests for the same entry
+    share a single query.
+    """
+
+    def __init__(self):
+        self.stats = MetadataCacheStats()
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        # invalidation clock: a load only stores its result when nothing it
+        # depends on was invalidated after it started
+        self._clock = 0
+        self._invalidated_at: Dict[Tuple[str, str], int] = {}
+        self._schema_invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+
+    def get_or_load(self, kind: str, key: Optional[str], load: Callable[[], Any]) -> Any:
+        """Return the cached entry, running `load` on a miss. `load` runs at
+        most once at a time per entry, other threads wait for its result."""
+        if key is None:
+            return load()
+
+        entry_key = (kind, key)
+        owner = False
+        with self._lock:
+            if entry_key in self._entries:
+                self.stats.hits += 1
+                return self._entries[entry_key]
+            flight = self._inflight.get(entry_key)
+            if flight is None:
+                self.stats.misses += 1
+                flight = Future()
+                self._inflight[entry_key] = flight
+                started_at = self._clock
+                owner = True
+            else:
+                self.stats.coalesced += 1
+
+        if not owner:
+            return flight.result()
+
+        try:
+            result = load()
+        except BaseException as exc:
+            with self._lock:
+                if self._inflight.get(entry_key) is flight:
+                    del self._inflight[entry_key]
+            flight.set_exception(exc)
+            raise
+
+        with self._lock:
+            if self._inflight.get(entry_key) is flight:
+                del self._inflight[entry_key]
+            if self._last_invalidation(kind, key) <= started_at:
+                self._entries[entry_key] = result
+        flight.set_result(result)
+        return result
+
+    def lookup(self, kind: str, key: str, default: Any = None) -> Any:
+        """The cached entry, `default` when there is none. Never loads."""
+        with self._lock:
+            if (kind, key) in self._entries:
+                self.stats.hits += 1
+                return self._entries[(kind, key)]
+        return default
+
+    def put(self, kind: str, key: str, value: Any):
+        """Store an entry the caller knows to be current, e.g. right after
+        the statement which made it so"""
+        with self._lock:
+            # a load which started before must not overwrite the value
+            self._clock += 1
+            self._inflight.pop((kind, key), None)
+            self._invalidated_at[(kind, key)] = self._clock
+            self._entries[(kind, key)] = value
+
+    def update(self, kind: str, key: str, change: Callable[[Any], Any]) -> bool:
+        """Replace a cached entry by `change(entry)`. Loads running meanwhile
+        are not stored, they may predate the change. False when not cached."""
+        entry_key = (kind, key)
+        with self._lock:
+            self._clock += 1
+            self._inflight.pop(entry_key, None)
+            self._invalidated_at[entry_key] = self._clock
+            if entry_key not in self._entries:
+                return False
+            self._entries[entry_key] = change(self._entries[entry_key])
+            return True
+
+    def was_invalidated(self, kind: str, key: str) -> bool:
+        """Whether a statement of this run may have changed the entry"""
+        with self._lock:
+            return self._last_invalidation(kind, key) > 0
+
+    def _last_invalidation(self, kind: str, key: str) -> int:
+        schema = key if kind == RELATIONS else key.split(".", 1)[0]
+        return max(
+            self._cleared_at,
+            self._invalidated_at.get((kind, key), 0),
+            self._schema_invalidated_at.get(schema, 0) if kind != SCHEMAS else 0,
+        )
+
+    def _invalidate(self, entry_keys: Iterable[Tuple[str, str]]):
+        """Drop entries, must be called with the lock held"""
+        self._clock += 1
+        for entry_key in entry_keys:
+            self._entries.pop(entry_key, None)
+            # later requests must not join a load which started before
+            self._inflight.pop(entry_key, None)
+            self._invalidated_at[entry_key] = self._clock
+        self.stats.invalidations += 1
+
+    def invalidate_relation(self, schema: str, identifier: str, listing: bool = False):
+        """Forget a relation, and the listing of its schema when the
+        relation was created, dropped or renamed"""
+        key = relation_key(schema, identifier)
+        entry_keys = [(kind, key) for kind in _RELATION_KINDS]
+        if listing:
+            entry_keys.append((RELATIONS, schema.lower()))
+        with self._lock:
+            self._invalidate(entry_keys)
+
+    def invalidate_schema(self, schema: str):
+        """Forget a schema, its listing and every relation in it"""
+        schema = schema.lower()
+        with self._lock:
+            self._invalidate([(SCHEMAS, ""), (SCHEMA_EXISTS, schema), (RELATIONS, schema)])
+            self._schema_invalidated_at[schema] = self._clock
+            stale = [
+                k
+                for k in self._entries
+                if k[0] in _RELATION_KINDS and k[1].split(".", 1)[0] == schema
+            ]
+            for entry_key in stale:
+                del self._entries[entry_key]
+            for entry_key in [k for k in self._inflight if k[1].split(".", 1)[0] == schema]:
+                del self._inflight[entry_key]
+
+    def clear(self):
+        with self._lock:
+            self._clock += 1
+            self._cleared_at = self._clock
+            self._entries.clear()
+            self._inflight.clear()
+            self.stats.invalidations += 1
+
+    def invalidate_for_statement(self, statement: SqlStatement):
+        """Invalidate whatever `statement` may have modified. Statements
+        whose target cannot be determined clear the whole cache."""
+        code = statement.code
+        if statement.kind == "query":
+            # `with ... insert into` is the only query which writes
+            match = _DML_PATTERN.search(code)
+            if match and match.group(2) is not None:
+                self.invalidate_relation(_unquote(match.group(1)), _unquote(match.group(2)))
+            elif match:
+                self.clear()
+            return
+        if statement.keyword in _READ_ONLY_KEYWORDS:
+            return
+
+        match = _SCHEMA_DDL_PATTERN.match(code)
+        if match:
+            self.invalidate_schema(_unquote(match.group(2) or match.group(1)))
+            return
+
+        targets: List[Tuple[Optional[str], Optional[str], bool]] = []
+        match = _RELATION_DDL_PATTERN.match(code)
+        if match:
+            action = match.group(1).lower()
+            targets.append((match.group(2), match.group(3), action != "alter"))
+            rename = _RENAME_PATTERN.search(code, match.end()) if action == "alter" else None
+            if rename:
+                targets = [(match.group(2), match.group(3), True)]
+                targets.append((rename.group(1), rename.group(2), True))
+        elif statement.keyword == "from":
+            # a multi-table insert writes to each of its insert targets
+            for match in _DML_PATTERN.finditer(code):
+                targets.append((match.group(1), match.group(2), False))
+        else:
+            match = _DML_PATTERN.match(code)
+            if match:
+                targets.append((match.group(1), match.group(2), False))
+
+        if not targets or any(identifier is None for _, identifier, _ in targets):
+            # unknown or unqualified target, the current database is unknown
+            logger.debug(f"Clearing the metadata cache after: {code[:80]}")
+            self.clear()
+            return
+
+        for schema, identifier, listing in targets:
+            self.invalidate_relation(_unquote(schema), _unquote(identifier), listing)
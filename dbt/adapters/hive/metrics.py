@@ -0,0 +1,168 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import ClassVar, Dict, List, Optional, Tuple
+
+from dbt_common.dataclass_schema import dbtClassMixin
+from dbt.adapters.events.logging import AdapterLogger
+
+logger = AdapterLogger("Hive")
+
+# printed by Hive once the Tez/MR application has been submitted to YARN
+YARN_APPLICATION_PATTERN = re.compile(r"application_\d+_\d+")
+
+# Tez counters of the rows written to each table, e.g. "RECORDS_OUT_1_db.t: 42"
+RECORDS_OUT_PATTERN = re.compile(r"\bRECORDS_OUT_\d+_\S+:\s*(\d+)")
+
+PROMETHEUS_PREFIX = "dbt_hive"
+
+# (metric name, help text, per-kind total it exposes)
+PROMETHEUS_COUNTERS = (
+    ("statements_total", "Statements executed", "statements"),
+    ("statement_failures_total", "Statements that failed", "failures"),
+    ("statement_seconds_total", "Time spent executing statements", "elapsed"),
+    ("statement_queue_seconds_total", "Time statements spent queued in HS2", "queue_time"),
+    ("rows_affected_total", "Rows written by statements", "rows_affected"),
+    ("yarn_applications_total", "Statements that ran a YARN application", "applications"),
+    ("statement_retries_total", "Statements retried after a transient error", "retries"),
+)
+
+
+@dataclass
+class QueryMetrics(dbtClassMixin):
+    """What a single statement cost, as seen from the connection"""
+
+    statement_kind: str
+    started_at: float
+    elapsed: float
+    success: bool = True
+    node_id: Optional[str] = None
+    connection_name: Optional[str] = None
+    invocation_id: Optional[str] = None
+    # time spent in the HS2 pending/initialized states, async execution only
+    queue_time: Optional[float] = None
+    rows_affected: Optional[int] = None
+    operation_id: Optional[str] = None
+    application_id: Optional[str] = None
+    # attempts which failed with a transient error before this one
+    retries: int = 0
+
+
+@dataclass
+class OperationLogFacts:
+    """Facts extracted from the HS2 operation log of a statement"""
+
+    application_id: Optional[str] = None
+    records_out: Optional[int] = None
+
+    def scan(self, operation_log: Optional[str]):
+        if not operation_log:
+            return
+        if self.application_id is None:
+            match = YARN_APPLICATION_PATTERN.search(operation_log)
+            if match:
+                self.application_id = match.group()
+        for match in RECORDS_OUT_PATTERN.finditer(operation_log):
+            self.records_out = (self.records_out or 0) + int(match.group(1))
+
+
+@dataclass
+class _KindTotals:
+    statements: int = 0
+    failures: int = 0
+    elapsed: float = 0.0
+    queue_time: float = 0.0
+    rows_affected: int = 0
+    applications: int = 0
+    retries: int = 0
+
+
+class QueryMetricsSink:
+    """Append per-statement metrics to a JSON lines file and keep a
+    Prometheus textfile-collector file of the per-kind totals up to date.
+
+    One sink exists per pair of output files, shared by all threads.
+    """
+
+    _sinks: ClassVar[Dict[Tuple[Optional[str], Optional[str]], "QueryMetricsSink"]] = {}
+    _sinks_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, jsonl_path: Optional[str] = None, prometheus_path: Optional[str] = None):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self._lock = threading.Lock()
+        self._totals: Dict[str, _KindTotals] = defaultdict(_KindTotals)
+
+    @staticmethod
+    def enabled(credentials) -> bool:
+        return bool(credentials.query_metrics_file or credentials.query_metrics_prometheus_file)
+
+    @classmethod
+    def for_credentials(cls, credentials) -> Optional["QueryMetricsSink"]:
+        if not cls.enabled(credentials):
+            return None
+        key = (credentials.query_metrics_file, credentials.query_metrics_prometheus_file)
+        with cls._sinks_lock:
+            sink = cls._sinks.get(key)
+            if sink is None:
+                sink = cls(*key)
+                cls._sinks[key] = sink
+            return sink
+
+    def record(self, metrics: QueryMetrics):
+        with self._lock:
+            totals = self._totals[metrics.statement_kind]
+            totals.statements += 1
+            totals.failures += 0 if metrics.success else 1
+            totals.elapsed += metrics.elapsed
+            totals.queue_time += metrics.queue_time or 0.0
+            totals.rows_affected += metrics.rows_affected or 0
+            totals.applications += 1 if metrics.application_id else 0
+            totals.retries += metrics.retries
+
+            # a broken metrics file must never fail the run
+            try:
+                if self.jsonl_path:
+                    self._append_jsonl(metrics)
+                if self.prometheus_path:
+                    self._write_prometheus()
+            except OSError as ex:
+                logger.debug(f"Unable to write query metrics: {ex}")
+
+    def _append_jsonl(self, metrics: QueryMetrics):
+        with open(self.jsonl_path, "a") as fp:
+            fp.write(json.dumps(metrics.to_dict(), sort_keys=True) + "\n")
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        for name, help_text, field in PROMETHEUS_COUNTERS:
+            metric = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for kind in sorted(self._totals):
+                value = getattr(self._totals[kind], field)
+                lines.append(f'{metric}{{kind="{kind}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self):
+        # the collector may read at any time, replace the file atomically
+        tmp_path = f"{self.prometheus_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fp:
+            fp.write(self.render_prometheus())
+        os.replace(tmp_path, self.prometheus_path)
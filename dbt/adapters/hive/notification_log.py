@@ -0,0 +1,220 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Keeps the metadata cache in step with the metastore notification log.
+
+The metastore records every DDL and write as an event (NOTIFICATION_LOG,
+exposed as `sys.notification_log` on Hive 3+). Polling the events since the
+last one seen tells exactly which cached listings and descriptions changed,
+so a long run sees changes made outside of dbt without listing its schemas
+again.
+"""
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+from dbt.adapters.events.logging import AdapterLogger
+
+from dbt.adapters.hive.metadata_cache import RELATIONS, SCHEMA_EXISTS, MetadataCache
+
+logger = AdapterLogger("Hive")
+
+LAST_NOTIFICATION_EVENT_MACRO_NAME = "hive__get_last_notification_event_id"
+NOTIFICATION_EVENTS_MACRO_NAME = "hive__get_notification_events"
+
+DEFAULT_NOTIFICATION_LOG_POLL_INTERVAL = 10.0
+NOTIFICATION_EVENTS_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class MetastoreEvent:
+    event_id: int
+    event_type: str
+    db_name: Optional[str] = None
+    tbl_name: Optional[str] = None
+    message: Optional[str] = None
+
+    @property
+    def table_type(self) -> Optional[str]:
+        """MANAGED_TABLE, VIRTUAL_VIEW, ... from a JSON message, None when the
+        message is compressed or does not say"""
+        if not self.message or not self.message.lstrip().startswith("{"):
+            return None
+        try:
+            return json.loads(self.message).get("tableType")
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+
+class MetastoreEventSource(ABC):
+    """Where the events come from. `SysNotificationLogSource` reads them with
+    HiveServer2 queries, another source can read them from a metastore client."""
+
+    @abstractmethod
+    def last_event_id(self) -> int:
+        """The id of the latest event, 0 when there is none"""
+
+    @abstractmethod
+    def events_after(self, event_id: int, limit: int) -> List[MetastoreEvent]:
+        """Up to `limit` events following `event_id`, in event id order"""
+
+
+class SysNotificationLogSource(MetastoreEventSource):
+    def __init__(self, execute_macro: Callable[..., Any]):
+        self.execute_macro = execute_macro
+
+    def last_event_id(self) -> int:
+        rows = self.execute_macro(LAST_NOTIFICATION_EVENT_MACRO_NAME)
+        return int(rows[0][0] or 0) if rows else 0
+
+    def events_after(self, event_id: int, limit: int) -> List[MetastoreEvent]:
+        rows = self.execute_macro(
+            NOTIFICATION_EVENTS_MACRO_NAME, kwargs={"after_event_id": event_id, "limit": limit}
+        )
+        return [event_from_row(row) for row in rows]
+
+
+def event_from_row(row: Sequence) -> MetastoreEvent:
+    """(event_id, event_type, db_name, tbl_name, message)"""
+    event_id, event_type, db_name, tbl_name, message = row
+    return MetastoreEvent(
+        event_id=int(event_id),
+        event_type=str(event_type).upper(),
+        db_name=db_name.lower() if db_name else None,
+        tbl_name=tbl_name.lower() if tbl_name else None,
+        message=message,
+    )
+
+
+class NotificationLogFollower:
+    """Applies the events of the notification log to a `MetadataCache`.
+
+    `relation_factory(schema, identifier, table_type)` builds the relation a
+    CREATE_TABLE event adds to the cached listing of its schema.
+    """
+
+    def __init__(
+        self,
+        metadata_cache: MetadataCache,
+        poll_interval: Optional[float] = DEFAULT_NOTIFICATION_LOG_POLL_INTERVAL,
+        source: Optional[MetastoreEventSource] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.metadata_cache = metadata_cache
+        self.poll_interval = poll_interval or 0.0
+        self.source = source
+        self.relation_factory: Optional[Callable[[str, str, str], Any]] = None
+        self.enabled = True
+        self.last_event_id: Optional[int] = None
+        self.events_applied = 0
+        self._clock = clock
+        self._polled_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def poll(self, force: bool = False) -> int:
+        """Apply the events since the last poll, at most once per poll
+        interval. Returns the number of events applied."""
+        if not self.enabled or self.source is None:
+            return 0
+        now = self._clock()
+        if (
+            not force
+            and self._polled_at is not None
+            and now - self._polled_at < self.poll_interval
+        ):
+            return 0
+        # a thread already polling brings the cache up to date
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            self._polled_at = now
+            return self._poll()
+        except Exception as ex:
+            logger.debug(f"Not following the metastore notification log: {ex}")
+            self.enabled = False
+            return 0
+        finally:
+            self._lock.release()
+
+    def _poll(self) -> int:
+        if self.last_event_id is None:
+            # nothing is cached from before, start from the latest event
+            self.last_event_id = self.source.last_event_id()
+            return 0
+        applied = 0
+        while True:
+            events = self.source.events_after(self.last_event_id, NOTIFICATION_EVENTS_BATCH_SIZE)
+            if events and events[0].event_id > self.last_event_id + 1:
+                # the metastore purged events we have not seen
+                logger.debug(
+                    f"Notification log events {self.last_event_id + 1} to "
+                    f"{events[0].event_id - 1} are gone, clearing the metadata cache"
+                )
+                self.metadata_cache.clear()
+            for event in events:
+                self.apply(event)
+                self.last_event_id = event.event_id
+            applied += len(events)
+            if len(events) < NOTIFICATION_EVENTS_BATCH_SIZE:
+                break
+        if applied:
+            logger.debug(f"Applied {applied} metastore events, last={self.last_event_id}")
+        self.events_applied += applied
+        return applied
+
+    def apply(self, event: MetastoreEvent):
+        cache = self.metadata_cache
+        schema, identifier = event.db_name, event.tbl_name
+        if not schema:
+            # transactions, functions, ...
+            return
+
+        if event.event_type == "CREATE_DATABASE":
+            cache.invalidate_schema(schema)
+            cache.put(SCHEMA_EXISTS, schema, True)
+        elif event.event_type == "DROP_DATABASE":
+            cache.invalidate_schema(schema)
+            cache.put(SCHEMA_EXISTS, schema, False)
+        elif not identifier:
+            return
+        elif event.event_type == "CREATE_TABLE":
+            cache.invalidate_relation(schema, identifier)
+            table_type = event.table_type
+            if table_type is None or self.relation_factory is None:
+                cache.invalidate_relation(schema, identifier, listing=True)
+                return
+            relation = self.relation_factory(schema, identifier, table_type)
+            cache.update(
+                RELATIONS, schema, lambda relations: _without(relations, identifier) + [relation]
+            )
+        elif event.event_type == "DROP_TABLE":
+            cache.invalidate_relation(schema, identifier)
+            cache.update(RELATIONS, schema, lambda relations: _without(relations, identifier))
+        elif event.event_type == "ALTER_TABLE":
+            # the event names the table after the change: a name missing from
+            # the listing was renamed, and the old name is not known
+            relations = cache.lookup(RELATIONS, schema)
+            if relations is not None and len(_without(relations, identifier)) == len(relations):
+                cache.invalidate_schema(schema)
+            else:
+                cache.invalidate_relation(schema, identifier)
+        else:
+            # partitions, inserts and statistics change the table parameters
+            cache.invalidate_relation(schema, identifier)
+
+
+def _without(relations: List[Any], identifier: str) -> List[Any]:
+    return [r for r in relations if (r.identifier or "").lower() != identifier]
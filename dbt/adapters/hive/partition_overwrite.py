@@ -0,0 +1,119 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Insert overwrite of the partitions present in the new data.
+
+A fully dynamic `insert overwrite table t partition (dt) select ...` leaves
+Hive to plan for, and lock, partitions it only discovers while writing.
+The partitions of the new rows are read first from the (small) temp table,
+then:
+
+- up to `max_static_partitions` partitions are each written with a static
+  partition spec, by a single multi-table insert reading the source once:
+  `from src insert overwrite table t partition (dt='a') select ... where ...`
+- otherwise the leading partition columns which hold a single value are
+  static and the others dynamic, `partition (year='2024', month)`, with
+  the dynamic partition limits raised to the number of partitions by a
+  configuration overlay of that statement only: a `set` would stay on the
+  session, and be replayed on every reconnect.
+
+Partition values are compared as strings, the way Hive names partitions.
+A NULL partition value (the default partition) is always written
+dynamically.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dbt.adapters.hive.literals import format_string
+
+PARTITION_VALUES_MACRO_NAME = "hive__get_partition_values"
+
+DEFAULT_MAX_STATIC_PARTITIONS = 16
+
+# the defaults of hive.exec.max.dynamic.partitions(.pernode)
+MAX_DYNAMIC_PARTITIONS = 1000
+MAX_DYNAMIC_PARTITIONS_PER_NODE = 100
+
+PartitionValues = Tuple[Optional[str], ...]
+
+
+def static_prefix_length(partitions: Sequence[PartitionValues]) -> int:
+    """How many leading partition columns hold the same non-NULL value in
+    every partition"""
+    if not partitions:
+        return 0
+    length = 0
+    for values in zip(*partitions):
+        if values[0] is None or any(value != values[0] for value in values):
+            break
+        length += 1
+    return length
+
+
+def _spec(names: Sequence[str], values: Sequence[Optional[str]]) -> str:
+    return ", ".join(f"{name}={format_string(value)}" for name, value in zip(names, values))
+
+
+def _matches(names: Sequence[str], values: Sequence[Optional[str]]) -> str:
+    return " and ".join(
+        f"cast({name} as string) = {format_string(value)}" for name, value in zip(names, values)
+    )
+
+
+def dynamic_partition_configuration(num_partitions: int) -> Dict[str, str]:
+    """Configuration overrides raising the dynamic partition limits, when the
+    default limits would be exceeded"""
+    configuration = {}
+    if num_partitions > MAX_DYNAMIC_PARTITIONS:
+        configuration["hive.exec.max.dynamic.partitions"] = str(num_partitions)
+    if num_partitions > MAX_DYNAMIC_PARTITIONS_PER_NODE:
+        configuration["hive.exec.max.dynamic.partitions.pernode"] = str(num_partitions)
+    return configuration
+
+
+def insert_overwrite_sql(
+    target: str,
+    source: str,
+    data_columns: List[str],
+    partition_columns: List[str],
+    partitions: Sequence[PartitionValues],
+    max_static_partitions: int = DEFAULT_MAX_STATIC_PARTITIONS,
+) -> str:
+    """The statement overwriting the `partitions` of `target` with the rows
+    of `source`. Column names are quoted. A dynamic insert needs the
+    `dynamic_partition_configuration` of the number of partitions."""
+    data_csv = ", ".join(data_columns)
+    all_static = all(value is not None for values in partitions for value in values)
+
+    if partitions and all_static and len(partitions) <= max_static_partitions:
+        if len(partitions) == 1:
+            return (
+                f"insert overwrite table {target}\n"
+                f"partition ({_spec(partition_columns, partitions[0])})\n"
+                f"select {data_csv} from {source}"
+            )
+        inserts = "\n".join(
+            f"insert overwrite table {target}\n"
+            f"partition ({_spec(partition_columns, values)})\n"
+            f"select {data_csv} where {_matches(partition_columns, values)}"
+            for values in partitions
+        )
+        return f"from {source}\n{inserts}"
+
+    static = static_prefix_length(partitions)
+    spec = _spec(partition_columns[:static], partitions[0][:static]) if static else ""
+    dynamic = partition_columns[static:]
+    spec = ", ".join(part for part in (spec, ", ".join(dynamic)) if part)
+    select_csv = ", ".join(data_columns + dynamic)
+    return (
+        f"insert overwrite table {target}\npartition ({spec})\nselect {select_csv} from {source}"
+    )
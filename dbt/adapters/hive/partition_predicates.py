@@ -0,0 +1,122 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Predicates restricting the target of a MERGE to the partitions of its
+source, so that Hive prunes the target scan.
+
+The values are literals, read from the source before the MERGE runs: a
+subquery would not prune anything. Hive partition columns and Iceberg
+identity partitions get an `in` list of the source values. Iceberg
+year/month/day/hour/truncate partitions, and columns with too many values
+for an `in` list, get a `between` the smallest and largest source value.
+Bucket partitions are not restricted.
+"""
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from dbt.adapters.hive.describe import DescribeResult
+from dbt.adapters.hive.hive_types import parse_hive_type
+from dbt.adapters.hive.literals import format_string
+
+COLUMN_RANGES_MACRO_NAME = "hive__get_column_ranges"
+
+DEST_ALIAS = "DBT_INTERNAL_DEST"
+
+MAX_IN_LIST_VALUES = 256
+
+# Iceberg transforms whose partitions are ordered like the source column
+_RANGE_TRANSFORMS = ("YEAR", "MONTH", "DAY", "HOUR", "TRUNCATE")
+
+# (name, data type) of a column
+Column = Tuple[str, str]
+
+
+def pruning_columns(describe: DescribeResult) -> Tuple[List[Column], List[Column]]:
+    """The columns to restrict by value and the columns to restrict by range"""
+    by_value = [(c.name, c.data_type) for c in describe.partition_columns]
+    by_range = []
+    types = {c.name.lower(): c.data_type for c in describe.columns}
+    for transform in describe.partition_transforms:
+        data_type = types.get(transform.name.lower())
+        kind = transform.data_type.upper()
+        if data_type is None:
+            continue
+        if kind == "IDENTITY":
+            by_value.append((transform.name, data_type))
+        elif kind.startswith(_RANGE_TRANSFORMS):
+            by_range.append((transform.name, data_type))
+    return by_value, by_range
+
+
+def _literal(value: str, data_type: str) -> str:
+    if parse_hive_type(data_type).is_string:
+        return format_string(value)
+    return f"cast({format_string(value)} as {data_type})"
+
+
+def _sort_key(data_type: str):
+    hive_type = parse_hive_type(data_type)
+    if hive_type.is_integer or hive_type.is_numeric:
+        return Decimal
+    return str
+
+
+def _or_null(predicate: Optional[str], column: str, has_nulls: bool) -> str:
+    if not has_nulls:
+        return predicate
+    if predicate is None:
+        return f"{column} is null"
+    return f"({predicate} or {column} is null)"
+
+
+def _between(column: str, data_type: str, low: str, high: str) -> str:
+    return f"{column} between {_literal(low, data_type)} and {_literal(high, data_type)}"
+
+
+def value_predicates(columns: List[Column], rows: Sequence[Sequence[Any]]) -> List[str]:
+    """Predicates on the `columns` of the target, from the distinct values
+    (as strings) of those columns in the source"""
+    predicates = []
+    if not rows:
+        return predicates
+    for index, (name, data_type) in enumerate(columns):
+        column = f"{DEST_ALIAS}.{name}"
+        values = {row[index] for row in rows}
+        has_nulls = None in values
+        values = sorted((str(v) for v in values if v is not None), key=_sort_key(data_type))
+        if not values:
+            predicate = None
+        elif len(values) > MAX_IN_LIST_VALUES:
+            predicate = _between(column, data_type, values[0], values[-1])
+        else:
+            literals = ", ".join(_literal(value, data_type) for value in values)
+            predicate = f"{column} in ({literals})"
+        predicates.append(_or_null(predicate, column, has_nulls))
+    return predicates
+
+
+def range_predicates(columns: List[Column], row: Sequence[Any]) -> List[str]:
+    """Predicates on the `columns` of the target, from a row holding the
+    smallest value, largest value and number of NULLs of each column in
+    the source"""
+    predicates = []
+    for index, (name, data_type) in enumerate(columns):
+        column = f"{DEST_ALIAS}.{name}"
+        low, high, num_nulls = row[3 * index : 3 * index + 3]
+        has_nulls = bool(num_nulls)
+        if low is None and not has_nulls:
+            # no source rows
+            return []
+        predicate = None if low is None else _between(column, data_type, str(low), str(high))
+        predicates.append(_or_null(predicate, column, has_nulls))
+    return predicates
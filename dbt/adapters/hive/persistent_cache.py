@@ -0,0 +1,213 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Relation listings and `describe formatted` results kept on disk between
+invocations, keyed by user, host, port and schema: what a user may see of a
+schema depends on their privileges.
+
+An entry is trusted as long as the metastore says nothing changed: every
+relation of a schema is identified by its name, its `tbl_id` and its
+`transient_lastDdlTime` parameter, which the metastore bumps whenever the
+table or its parameters (statistics included) are altered. A listing is
+valid when the schema still has exactly the relations it was taken with,
+by name and `tbl_id`: writes to its tables do not change it. A description
+is valid when its relation has the same `tbl_id` and DDL time.
+"""
+import dataclasses
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+
+from dbt.adapters.hive.describe import DescribedColumn, DescribeResult
+
+logger = AdapterLogger("Hive")
+
+SCHEMA_MARKERS_MACRO_NAME = "hive__get_schema_change_markers"
+
+# relation name -> [tbl_id, transient_lastDdlTime]
+SchemaMarkers = Dict[str, List[Any]]
+
+
+def relation_cache_key(credentials) -> str:
+    """The entries of the file a profile reads and writes"""
+    return f"{credentials.username or ''}@{credentials.host}:{credentials.port}"
+
+
+def parse_schema_markers(
+    schemas: Iterable[str], rows: Iterable[Sequence]
+) -> Dict[str, SchemaMarkers]:
+    """Markers of every relation of `schemas` from `hive__get_schema_change_markers`
+    rows: (db_name, tbl_name, tbl_id, transient_lastDdlTime). A schema without
+    rows is empty or does not exist."""
+    markers: Dict[str, SchemaMarkers] = {schema.lower(): {} for schema in schemas}
+    for schema, name, tbl_id, ddl_time in rows:
+        markers.setdefault(schema.lower(), {})[name.lower()] = [
+            int(tbl_id),
+            None if ddl_time is None else str(ddl_time),
+        ]
+    return markers
+
+
+def relation_ids(markers: SchemaMarkers) -> Dict[str, int]:
+    """The `tbl_id` of every relation, which identify a listing"""
+    return {name: marker[0] for name, marker in markers.items()}
+
+
+def describe_to_dict(describe: DescribeResult) -> Dict[str, Any]:
+    return dataclasses.asdict(describe)
+
+
+def describe_from_dict(data: Dict[str, Any]) -> DescribeResult:
+    return DescribeResult(
+        columns=[DescribedColumn(**column) for column in data["columns"]],
+        partition_columns=[DescribedColumn(**column) for column in data["partition_columns"]],
+        partition_transforms=[
+            DescribedColumn(**column) for column in data.get("partition_transforms", [])
+        ],
+        details=data["details"],
+        table_parameters=data["table_parameters"],
+        storage_parameters=data["storage_parameters"],
+    )
+
+
+class PersistentRelationCache:
+    """The entries of one user and host in the JSON file at `path`. Markers are
+    fetched once per schema and run, entries are written back by `save`."""
+
+    def __init__(self, path: str, key: str):
+        self.path = path
+        self.key = key
+        self.lock = threading.RLock()
+        self.enabled = True
+        self._schemas: Optional[Dict[str, Dict[str, Any]]] = None
+        self._markers: Dict[str, SchemaMarkers] = {}
+        self._dirty = False
+
+    @property
+    def schemas(self) -> Dict[str, Dict[str, Any]]:
+        if self._schemas is None:
+            try:
+                self._schemas = self._read(self.path).get(self.key, {})
+            except Exception as ex:
+                logger.debug(f"Ignoring unreadable relation cache {self.path}: {ex}")
+                self._schemas = {}
+        return self._schemas
+
+    def disable(self, reason: Any):
+        logger.debug(f"Relation cache {self.path} disabled for this run: {reason}")
+        self.enabled = False
+
+    def markers(self, schema: str) -> Optional[SchemaMarkers]:
+        return self._markers.get(schema.lower())
+
+    def unchecked_schemas(self, schema: str) -> Set[str]:
+        """`schema` and every cached schema whose markers were not fetched yet,
+        so a single query validates them all"""
+        return {s for s in list(self.schemas) + [schema.lower()] if s not in self._markers}
+
+    def set_markers(self, markers: Dict[str, SchemaMarkers]):
+        with self.lock:
+            self._markers.update(markers)
+
+    def relations(self, schema: str) -> Optional[List[Tuple[str, str]]]:
+        """The cached listing of `schema`, None when it changed since"""
+        schema = schema.lower()
+        with self.lock:
+            entry = self.schemas.get(schema)
+            markers = self._markers.get(schema)
+            if entry is None or markers is None or entry.get("relations") is None:
+                return None
+            if entry.get("relation_ids") != relation_ids(markers):
+                logger.debug(f"Relation cache: {schema} changed since it was listed")
+                return None
+            return [(name, relation_type) for name, relation_type in entry["relations"]]
+
+    def record_relations(self, schema: str, relations: Iterable[Tuple[str, str]]):
+        """Remember a listing taken after the markers were fetched. A listing
+        which disagrees with the markers, e.g. because a relation was created
+        in between, is not kept."""
+        schema = schema.lower()
+        relations = [[name, str(relation_type)] for name, relation_type in relations]
+        with self.lock:
+            markers = self._markers.get(schema)
+            if markers is None or set(markers) != {name.lower() for name, _ in relations}:
+                return
+            entry = self.schemas.setdefault(schema, {})
+            entry["relation_ids"] = relation_ids(markers)
+            entry["relations"] = relations
+            self._dirty = True
+
+    def describe(self, schema: str, identifier: str) -> Optional[DescribeResult]:
+        schema, identifier = schema.lower(), identifier.lower()
+        with self.lock:
+            markers = self._markers.get(schema) or {}
+            cached = self.schemas.get(schema, {}).get("describes", {}).get(identifier)
+            if cached is None or identifier not in markers:
+                return None
+            if cached["marker"] != markers[identifier]:
+                return None
+            return describe_from_dict(cached["describe"])
+
+    def record_describe(self, schema: str, identifier: str, describe: DescribeResult):
+        schema, identifier = schema.lower(), identifier.lower()
+        with self.lock:
+            marker = (self._markers.get(schema) or {}).get(identifier)
+            if marker is None:
+                # created during the run, its marker is unknown
+                return
+            entry = self.schemas.setdefault(schema, {})
+            entry.setdefault("describes", {})[identifier] = {
+                "marker": marker,
+                "describe": describe_to_dict(describe),
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write the entries of this host back, dropping the descriptions of
+        relations which changed or no longer exist"""
+        with self.lock:
+            if not self._dirty or not self.enabled:
+                return
+            for schema, entry in self.schemas.items():
+                markers = self._markers.get(schema)
+                if markers is None:
+                    continue
+                entry["describes"] = {
+                    identifier: cached
+                    for identifier, cached in entry.get("describes", {}).items()
+                    if markers.get(identifier) == cached["marker"]
+                }
+            try:
+                entries = self._read(self.path)
+            except Exception:
+                entries = {}
+            entries[self.key] = self.schemas
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as fp:
+                    json.dump(entries, fp)
+                os.replace(tmp_path, self.path)
+                self._dirty = False
+            except OSError as ex:
+                logger.debug(f"Unable to write relation cache {self.path}: {ex}")
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict]:
+        if not os.path.exists(path):
+            return {}
+        with open(path) as fp:
+            return json.load(fp)
@@ -0,0 +1,54 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Iterable, List, Optional, Tuple
+
+from dbt.adapters.hive.relation import HiveRelationType
+
+# Table Type of the metastore, as listed by SHOW EXTENDED TABLES (Hive 4)
+HIVE_TABLE_TYPES = {
+    "MANAGED_TABLE": HiveRelationType.Table,
+    "EXTERNAL_TABLE": HiveRelationType.Table,
+    "VIRTUAL_VIEW": HiveRelationType.View,
+    "MATERIALIZED_VIEW": HiveRelationType.MaterializedView,
+}
+
+
+def relation_type(table_type: Optional[str]) -> HiveRelationType:
+    """dbt relation type of a metastore table type, unknown types are tables"""
+    if not table_type:
+        return HiveRelationType.Table
+    return HIVE_TABLE_TYPES.get(table_type.strip().upper(), HiveRelationType.Table)
+
+
+def merge_tables_and_views(
+    table_names: Iterable[str], view_names: Iterable[str]
+) -> List[Tuple[str, HiveRelationType]]:
+    """Name and type of every relation from `show tables` and `show views`.
+
+    `show tables` lists the views as well (HIVE-14558), a view is told apart
+    from a table by its presence in `show views`. Tables come first, then
+    views, both in listing order.
+    """
+    view_names = list(view_names)
+    views = set(view_names)
+    relations = [(name, HiveRelationType.Table) for name in table_names if name not in views]
+    relations.extend((name, HiveRelationType.View) for name in view_names)
+    return relations
+
+
+def typed_relations(
+    rows: Iterable[Tuple[str, Optional[str]]]
+) -> List[Tuple[str, HiveRelationType]]:
+    """Name and type of every relation from `show extended tables`"""
+    return [(name, relation_type(table_type)) for name, table_type in rows]
@@ -0,0 +1,54 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+import re
+import socket
+
+from impala.error import HiveServer2Error, HttpError
+from thrift.transport.TTransport import TTransportException
+
+DEFAULT_QUERY_RETRIES = 0
+DEFAULT_QUERY_RETRY_BACKOFF = 1.0
+DEFAULT_QUERY_RETRY_MAX_BACKOFF = 30.0
+
+# load balancers answer with these while HiveServer2 restarts
+TRANSIENT_HTTP_CODES = (429, 502, 503, 504)
+
+# the session or operation died with the HiveServer2 instance which owned it
+LOST_SESSION_PATTERN = re.compile(
+    r"Invalid (Session|Operation)Handle|Failed after retrying|Connection reset",
+    re.IGNORECASE,
+)
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Whether `exc` comes from the transport or a lost session rather than
+    from the statement itself"""
+    if isinstance(exc, HttpError):
+        return exc.code in TRANSIENT_HTTP_CODES
+    if isinstance(exc, (TTransportException, ConnectionError, EOFError, socket.timeout)):
+        return True
+    if isinstance(exc, HiveServer2Error):
+        return bool(LOST_SESSION_PATTERN.search(str(exc)))
+    return False
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = DEFAULT_QUERY_RETRY_BACKOFF,
+    cap: float = DEFAULT_QUERY_RETRY_MAX_BACKOFF,
+) -> float:
+    """Seconds to wait before retry number `attempt` (1-based): exponential
+    backoff with full jitter, so threads hit by the same outage spread out"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
@@ -0,0 +1,200 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import atexit
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, ClassVar, Deque, Dict, Optional
+
+from dbt.adapters.events.logging import AdapterLogger
+
+logger = AdapterLogger("Hive")
+
+DEFAULT_POOL_MAX_IDLE_SECONDS = 300
+DEFAULT_POOL_MAX_USES = 100
+
+
+@dataclass
+class SessionPoolStats:
+    """Counters describing how a session pool has been used"""
+
+    hits: int = 0
+    misses: int = 0
+    recycled: int = 0
+    health_check_failures: int = 0
+
+    def __str__(self):
+        return (
+            f"hits={self.hits}, misses={self.misses}, recycled={self.recycled}, "
+            f"health_check_failures={self.health_check_failures}"
+        )
+
+
+@dataclass
+class _PooledSession:
+    session: Any
+    created_at: float
+    last_used_at: float
+    uses: int = 0
+
+
+class HiveSessionPool:
+    """Thread-safe pool of open HiveServer2 sessions for one set of credentials
+
+    A pooled session is any object exposing ``ping()`` (cheap liveness check),
+    ``is_reusable()`` (False once the session was cancelled or had its
+    configuration modified) and ``dispose()`` (really closes the session).
+    Sessions are health-checked when they are handed out and recycled once
+    they have been idle for ``max_idle_seconds`` or used ``max_uses`` times.
+    """
+
+    _pools: ClassVar[Dict[str, "HiveSessionPool"]] = {}
+    _pools_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        key: str,
+        connect: Callable[[], Any],
+        max_idle_seconds: Optional[int] = DEFAULT_POOL_MAX_IDLE_SECONDS,
+        max_uses: Optional[int] = DEFAULT_POOL_MAX_USES,
+    ):
+        self.key = key
+        self.connect = connect
+        self.max_idle_seconds = max_idle_seconds
+        self.max_uses = max_uses
+        self.stats = SessionPoolStats()
+        self._lock = threading.Lock()
+        self._idle: Deque[_PooledSession] = deque()
+        self._in_use: Dict[int, _PooledSession] = {}
+
+    @classmethod
+    def for_credentials(cls, credentials, connect: Callable[[], Any]) -> "HiveSessionPool":
+        """Return the pool shared by every connection using these credentials"""
+        key = credentials.unique_field
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(
+                    key,
+                    connect,
+                    max_idle_seconds=credentials.session_pool_max_idle_seconds,
+                    max_uses=credentials.session_pool_max_uses,
+                )
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def all_pools(cls):
+        with cls._pools_lock:
+            return list(cls._pools.values())
+
+    @classmethod
+    def close_all_pools(cls):
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+
+    def _is_expired(self, entry: _PooledSession, now: float) -> bool:
+        if self.max_uses and entry.uses >= self.max_uses:
+            return True
+        if self.max_idle_seconds and now - entry.last_used_at > self.max_idle_seconds:
+            return True
+        return False
+
+    def _dispose(self, entry: _PooledSession):
+        try:
+            entry.session.dispose()
+        except Exception as exc:
+            logger.debug(f"Exception while disposing pooled session: {exc}")
+
+    def acquire(self) -> Any:
+        """Hand out a live session, opening a new one when none can be reused"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # most recently used first, so the idle tail ages out
+                entry = self._idle.pop()
+
+            if self._is_expired(entry, time.time()):
+                with self._lock:
+                    self.stats.recycled += 1
+                self._dispose(entry)
+                continue
+
+            try:
+                healthy = entry.session.ping()
+            except Exception as exc:
+                logger.debug(f"Pooled session health check failed: {exc}")
+                healthy = False
+
+            if not healthy:
+                with self._lock:
+                    self.stats.health_check_failures += 1
+                self._dispose(entry)
+                continue
+
+            with self._lock:
+                entry.uses += 1
+                self._in_use[id(entry.session)] = entry
+                self.stats.hits += 1
+            return entry.session
+
+        # connect outside of the lock, the handshake is the slow part
+        session = self.connect()
+        now = time.time()
+        entry = _PooledSession(session=session, created_at=now, last_used_at=now, uses=1)
+        with self._lock:
+            self._in_use[id(session)] = entry
+            self.stats.misses += 1
+        return session
+
+    def release(self, session: Any, discard: bool = False):
+        """Give a session back to the pool, closing it if it cannot be reused"""
+        with self._lock:
+            entry = self._in_use.pop(id(session), None)
+
+        if entry is None:
+            # not handed out by this pool
+            session.dispose()
+            return
+
+        entry.last_used_at = time.time()
+        if discard or not session.is_reusable() or self._is_expired(entry, entry.last_used_at):
+            with self._lock:
+                self.stats.recycled += 1
+            self._dispose(entry)
+            return
+
+        with self._lock:
+            self._idle.append(entry)
+
+    def close(self):
+        """Close every idle session. Sessions in use are closed on release"""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for entry in idle:
+            self._dispose(entry)
+        logger.debug(f"Closed session pool {self.key}: {self.stats}")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._idle)
+
+
+atexit.register(HiveSessionPool.close_all_pools)
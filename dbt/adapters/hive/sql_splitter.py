@@ -0,0 +1,227 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+
+import dbt.exceptions
+
+# Everything that can hide a `;` (literals, quoted identifiers, comments)
+# plus the statement separator itself. HiveQL string literals use backslash
+# escapes, backticks are doubled. The loops are unrolled and the groups left
+# unnamed as this runs over every compiled model; tokens are told apart by
+# their first character.
+_TOKEN_PATTERN = re.compile(
+    r"""
+      '[^'\\]*(?:\\.[^'\\]*)*(?:'|\Z)
+    | "[^"\\]*(?:\\.[^"\\]*)*(?:"|\Z)
+    | `[^`]*(?:``[^`]*)*(?:`|\Z)
+    | --[^\n]*
+    | /\*.*?(?:\*/|\Z)
+    | ;
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_COMMENT_STARTS = ("-", "/")
+
+# an escaped `%%` is matched first, so `%%s` is not taken for a placeholder
+_PLACEHOLDER_PATTERN = re.compile(r"%%|%s")
+
+SPLIT_CACHE_SIZE = 256
+
+# larger SQL (e.g. seed batches with inline literals) is unique, caching it
+# would only pin memory
+SPLIT_CACHE_MAX_SQL_LENGTH = 64 * 1024
+
+_KEYWORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+# statement kinds by leading keyword, anything else is "other"
+STATEMENT_KINDS = {
+    "select": "query",
+    "with": "query",
+    "values": "query",
+    "insert": "dml",
+    # multi-table insert, `from src insert overwrite table t1 ... insert ...`
+    "from": "dml",
+    "merge": "dml",
+    "update": "dml",
+    "delete": "dml",
+    "load": "dml",
+    "create": "ddl",
+    "drop": "ddl",
+    "alter": "ddl",
+    "truncate": "ddl",
+    "msck": "ddl",
+    "grant": "ddl",
+    "revoke": "ddl",
+    "show": "metadata",
+    "describe": "metadata",
+    "desc": "metadata",
+    "explain": "metadata",
+    "use": "metadata",
+    "set": "metadata",
+    "analyze": "metadata",
+}
+
+# DDL/DML which leave the same result when run twice
+_IDEMPOTENT_PATTERN = re.compile(
+    r"""
+      create\s+(?:[a-z]+\s+)*?(?:table|view|database|schema|function)\s+if\s+not\s+exists\b
+    | create\s+or\s+replace\s
+    | drop\s+(?:[a-z]+\s+)*?if\s+exists\b
+    | insert\s+overwrite\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_INSERT_INTO_PATTERN = re.compile(r"\binsert\s+into\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class SqlStatement:
+    """One statement of a (possibly multi-statement) SQL string"""
+
+    sql: str
+    # offset of the first character which is neither whitespace nor comment
+    code_offset: int = 0
+    # impyla substitutes every `%s` of the statement, even inside literals
+    placeholders: int = 0
+
+    @property
+    def code(self) -> str:
+        """The statement without its leading comments (e.g. the query header)"""
+        return self.sql[self.code_offset :]
+
+    @property
+    def keyword(self) -> str:
+        """The leading keyword in lower case, empty for comment-only SQL"""
+        match = _KEYWORD_PATTERN.match(self.code)
+        return match.group().lower() if match else ""
+
+    @property
+    def kind(self) -> str:
+        """One of query, dml, ddl, metadata or other"""
+        return STATEMENT_KINDS.get(self.keyword, "other")
+
+    @property
+    def is_idempotent(self) -> bool:
+        """Whether running the statement again after a failure is harmless"""
+        kind = self.kind
+        if kind == "metadata":
+            return True
+        if kind == "query" or self.keyword == "from":
+            # `with ... insert into` and `from ... insert into` append
+            return not _INSERT_INTO_PATTERN.search(self.code)
+        return bool(_IDEMPOTENT_PATTERN.match(self.code))
+
+    @property
+    def executable(self) -> str:
+        # Hive rejects `set` commands preceded by a comment
+        code = self.code
+        if code[:3].lower() == "set":
+            return code
+        return self.sql
+
+
+def _make_statement(sql: str, start: int, end: int, code_start: int) -> SqlStatement:
+    text = sql[start:end]
+    leading = len(text) - len(text.lstrip())
+    text = text.strip()
+    return SqlStatement(
+        sql=text,
+        code_offset=code_start - start - leading,
+        placeholders=_PLACEHOLDER_PATTERN.findall(text).count("%s"),
+    )
+
+
+def split_sql_statements(sql: str) -> Tuple[SqlStatement, ...]:
+    """Split `sql` on the semicolons that are not inside a literal, quoted
+    identifier or comment. Statements made only of comments are dropped.
+
+    Results for SQL up to SPLIT_CACHE_MAX_SQL_LENGTH characters are cached,
+    the same statements (metadata queries in particular) are issued many
+    times during a run.
+    """
+    if len(sql) > SPLIT_CACHE_MAX_SQL_LENGTH:
+        return _split_sql_statements(sql)
+    return _split_sql_statements_cached(sql)
+
+
+def clear_split_cache():
+    _split_sql_statements_cached.cache_clear()
+
+
+def _split_sql_statements(sql: str) -> Tuple[SqlStatement, ...]:
+    statements = []
+    start = 0
+    pos = 0
+    code_start: Optional[int] = None
+
+    for match in _TOKEN_PATTERN.finditer(sql):
+        first = match.group()[0]
+        if code_start is None:
+            gap = sql[pos : match.start()]
+            if gap.strip():
+                code_start = pos + len(gap) - len(gap.lstrip())
+
+        if first == ";":
+            if code_start is not None:
+                statements.append(_make_statement(sql, start, match.start(), code_start))
+            start = match.end()
+            code_start = None
+        elif first not in _COMMENT_STARTS and code_start is None:
+            code_start = match.start()
+        pos = match.end()
+
+    if code_start is None:
+        gap = sql[pos:]
+        if gap.strip():
+            code_start = pos + len(gap) - len(gap.lstrip())
+    if code_start is not None:
+        statements.append(_make_statement(sql, start, len(sql), code_start))
+
+    return tuple(statements)
+
+
+_split_sql_statements_cached = lru_cache(maxsize=SPLIT_CACHE_SIZE)(_split_sql_statements)
+
+
+def split_bindings(
+    statements: Sequence[SqlStatement], bindings: Optional[Sequence[Any]]
+) -> List[Optional[Sequence[Any]]]:
+    """Give every statement only the bindings of its own placeholders"""
+    if not bindings:
+        return [None] * len(statements)
+    if len(statements) == 1:
+        # let the driver validate the placeholders of a single statement
+        return [bindings]
+
+    expected = sum(statement.placeholders for statement in statements)
+    if expected != len(bindings):
+        raise dbt.exceptions.DbtRuntimeError(
+            f"The SQL contains {expected} placeholders in {len(statements)} statements"
+            f" but {len(bindings)} bindings were provided"
+        )
+
+    per_statement: List[Optional[Sequence[Any]]] = []
+    offset = 0
+    for statement in statements:
+        if statement.placeholders:
+            per_statement.append(bindings[offset : offset + statement.placeholders])
+        else:
+            per_statement.append(None)
+        offset += statement.placeholders
+    return per_statement
@@ -0,0 +1,95 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dbt.adapters.hive.column import HiveColumn
+from dbt.adapters.hive.relation_listing import relation_type
+from dbt.adapters.hive.table_stats import (
+    STATISTICS_PARAMETERS,
+    STATS_ACCURATE_PARAMETER,
+    TableStats,
+)
+
+SYS_CATALOG_COLUMNS_MACRO_NAME = "hive__get_sys_catalog_columns"
+SYS_CATALOG_TABLE_PARAMS_MACRO_NAME = "hive__get_sys_catalog_table_params"
+
+# the table parameters the catalog needs: the comment and the statistics
+SYS_CATALOG_TABLE_PARAMS = ("comment", STATS_ACCURATE_PARAMETER) + tuple(STATISTICS_PARAMETERS)
+
+
+def _text(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text if text else None
+
+
+def parse_sys_columns(
+    schema: str,
+    rows: Iterable[Sequence],
+    table_params: Optional[Dict[str, Dict[str, str]]] = None,
+) -> Dict[str, List[HiveColumn]]:
+    """Columns of every relation of `schema`, keyed by relation name, from
+    `hive__get_sys_catalog_columns` rows:
+    (tbl_name, tbl_type, owner, column_name, type_name, comment, is_partition_key, integer_idx)
+    and the statistics in `table_params`, see `parse_sys_table_params`.
+
+    The columns come out as `describe formatted` lists them: data columns,
+    then partition keys, a name appearing twice is kept once.
+    """
+    by_table: Dict[str, List[Tuple]] = defaultdict(list)
+    for row in rows:
+        by_table[row[0]].append(tuple(row))
+
+    relations: Dict[str, List[HiveColumn]] = {}
+    for table_name, table_rows in by_table.items():
+        table_rows.sort(key=lambda row: (int(row[6] or 0), int(row[7] or 0)))
+        stats = TableStats.from_parameters((table_params or {}).get(table_name))
+        table_stats = HiveColumn.convert_table_stats(stats)
+        seen = set()
+        columns = []
+        for _, tbl_type, owner, column_name, type_name, comment, _, _ in table_rows:
+            if column_name in seen:
+                continue
+            seen.add(column_name)
+            columns.append(
+                HiveColumn(
+                    table_database=None,
+                    table_schema=schema,
+                    table_name=table_name,
+                    table_type=relation_type(tbl_type),
+                    table_owner=str(owner),
+                    table_stats=table_stats,
+                    column=column_name,
+                    column_index=len(columns),
+                    dtype=type_name,
+                    comment=_text(comment),
+                )
+            )
+        relations[table_name] = columns
+    return relations
+
+
+def parse_sys_table_params(rows: Iterable[Sequence]) -> Dict[str, Dict[str, str]]:
+    """Parameters of every relation, keyed by relation name, from
+    `hive__get_sys_catalog_table_params` rows: (tbl_name, param_key, param_value)"""
+    table_params: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for table_name, key, value in rows:
+        table_params[table_name][key] = value
+    return dict(table_params)
+
+
+def sys_table_comment(params: Optional[Dict[str, str]]) -> Optional[str]:
+    return _text((params or {}).get("comment"))
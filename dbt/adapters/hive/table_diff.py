@@ -0,0 +1,125 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Comparison of two relations which reads each of them once.
+
+Every row is reduced to the md5 of its columns, the hashes of both sides
+are counted and full outer joined: a hash counted on one side only is a
+mismatched row. Per partition, the row count and the sum of the row hashes
+(wrapping on overflow, the same way on both sides) tell whether the two
+partitions hold the same rows.
+
+Columns are compared through their string form, so complex types (array,
+map, struct) cannot be compared this way.
+"""
+from typing import List
+
+import dbt.exceptions
+
+DIFF_MODE_EXCEPT = "except"
+DIFF_MODE_HASH = "hash"
+DIFF_MODES = (DIFF_MODE_EXCEPT, DIFF_MODE_HASH)
+
+# written for NULL, concat_ws skips NULLs otherwise
+NULL_MARKER = "\\\\N"
+COLUMN_SEPARATOR = "\\001"
+
+HASH_DIFF_SQL = """
+with hashes_a as (
+    select row_hash, count(*) as num_rows
+    from (select {row_hash} as row_hash from {relation_a}) rows_a
+    group by row_hash
+), hashes_b as (
+    select row_hash, count(*) as num_rows
+    from (select {row_hash} as row_hash from {relation_b}) rows_b
+    group by row_hash
+)
+select
+    coalesce(sum(hashes_a.num_rows), 0) - coalesce(sum(hashes_b.num_rows), 0)
+        as row_count_difference,
+    coalesce(sum(case when hashes_a.row_hash is null or hashes_b.row_hash is null
+        then 1 else 0 end), 0) as num_mismatched
+from hashes_a
+full outer join hashes_b on hashes_a.row_hash = hashes_b.row_hash
+""".strip()
+
+PARTITIONS_DIFF_SQL = """
+with checksums_a as (
+    select {partition_columns}, count(*) as num_rows, sum({row_checksum}) as checksum
+    from {relation_a}
+    group by {partition_columns}
+), checksums_b as (
+    select {partition_columns}, count(*) as num_rows, sum({row_checksum}) as checksum
+    from {relation_b}
+    group by {partition_columns}
+)
+select
+    {coalesced_partition_columns},
+    coalesce(checksums_a.num_rows, 0) as num_rows_a,
+    coalesce(checksums_b.num_rows, 0) as num_rows_b
+from checksums_a
+full outer join checksums_b on {join_condition}
+where checksums_a.num_rows is null
+    or checksums_b.num_rows is null
+    or checksums_a.num_rows <> checksums_b.num_rows
+    or checksums_a.checksum <> checksums_b.checksum
+""".strip()
+
+
+def validate_diff_mode(diff_mode: str) -> str:
+    if diff_mode not in DIFF_MODES:
+        raise dbt.exceptions.DbtRuntimeError(
+            f"Invalid diff_mode '{diff_mode}', expected one of: {', '.join(DIFF_MODES)}"
+        )
+    return diff_mode
+
+
+def row_hash_expression(quoted_names: List[str]) -> str:
+    """md5 of the columns of a row, NULL and empty strings told apart"""
+    values = ", ".join(
+        f"coalesce(cast({name} as string), '{NULL_MARKER}')" for name in quoted_names
+    )
+    return f"md5(concat_ws('{COLUMN_SEPARATOR}', {values}))"
+
+
+def row_checksum_expression(quoted_names: List[str]) -> str:
+    """The first 60 bits of the row hash as a bigint, to be summed"""
+    return f"cast(conv(substr({row_hash_expression(quoted_names)}, 1, 15), 16, 10) as bigint)"
+
+
+def hash_diff_sql(quoted_names: List[str], relation_a: str, relation_b: str) -> str:
+    return HASH_DIFF_SQL.format(
+        row_hash=row_hash_expression(quoted_names),
+        relation_a=relation_a,
+        relation_b=relation_b,
+    )
+
+
+def partitions_diff_sql(
+    quoted_names: List[str], quoted_partition_by: List[str], relation_a: str, relation_b: str
+) -> str:
+    if not quoted_partition_by:
+        raise dbt.exceptions.DbtRuntimeError("Comparing partitions requires partition_by columns")
+    return PARTITIONS_DIFF_SQL.format(
+        partition_columns=", ".join(quoted_partition_by),
+        coalesced_partition_columns=",\n    ".join(
+            f"coalesce(checksums_a.{name}, checksums_b.{name}) as {name}"
+            for name in quoted_partition_by
+        ),
+        row_checksum=row_checksum_expression(quoted_names),
+        join_condition=" and ".join(
+            f"checksums_a.{name} <=> checksums_b.{name}" for name in quoted_partition_by
+        ),
+        relation_a=relation_a,
+        relation_b=relation_b,
+    )
@@ -0,0 +1,237 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Whether a table can be rebuilt in place.
+
+The `swap` rebuild of the table materialization creates `<table>__dbt_tmp`,
+drops the table and renames the new one. With `rebuild_strategy:
+insert_overwrite` the rows of the existing table are replaced by a single
+`insert overwrite table ... select` instead, which keeps the table, its
+location, grants and properties. That is only correct when the query
+yields exactly the columns of the table: same names, same order, same
+types, which `rebuild_mismatch` checks against `describe formatted`.
+
+HiveServer2 describes a result column with its type name, and with the
+precision and scale of a decimal, but not with the length of a char or
+varchar nor the element types of a complex type: tables with such columns
+are always swapped.
+
+An Iceberg table is swapped by dropping and re-creating it. With
+`insert_overwrite` the new rows are written as a new snapshot of the
+existing table instead, after evolving its schema to the columns of the
+query: dropped columns are replaced away, new columns added and types
+promoted the ways Iceberg allows (int to bigint, float to double, wider
+decimal precision). `iceberg_rebuild_plan` works out those changes.
+Iceberg has no char or varchar, both are strings.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import dbt.exceptions
+
+from dbt.adapters.hive.describe import DescribeResult
+from dbt.adapters.hive.hive_types import parse_hive_type
+
+REBUILD_STRATEGY_SWAP = "swap"
+REBUILD_STRATEGY_INSERT_OVERWRITE = "insert_overwrite"
+REBUILD_STRATEGIES = (REBUILD_STRATEGY_SWAP, REBUILD_STRATEGY_INSERT_OVERWRITE)
+
+# fragment of the InputFormat class of each file_format
+_INPUT_FORMATS = {
+    "parquet": "parquet",
+    "orc": "orc",
+    "avro": "avro",
+    "textfile": "textinputformat",
+    "sequencefile": "sequencefile",
+    "rcfile": "rcfile",
+}
+
+TABLE_TYPE_EXTERNAL = "EXTERNAL_TABLE"
+TABLE_TYPE_MANAGED = "MANAGED_TABLE"
+
+KEY_NUM_BUCKETS = "Num Buckets"
+
+# Hive type of an Iceberg column written from a result column of each type
+_ICEBERG_TYPES = {
+    "boolean": "boolean",
+    "tinyint": "int",
+    "smallint": "int",
+    "int": "int",
+    "bigint": "bigint",
+    "float": "float",
+    "double": "double",
+    "string": "string",
+    "char": "string",
+    "varchar": "string",
+    "date": "date",
+    "timestamp": "timestamp",
+    "binary": "binary",
+}
+
+
+@dataclass(frozen=True)
+class ResultColumn:
+    """A column of a query result, as described by HiveServer2"""
+
+    name: str
+    type_name: str
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+
+
+@dataclass
+class IcebergRebuildPlan:
+    """How to turn an Iceberg table into the result of a query. Columns are
+    (name, type) pairs."""
+
+    mismatch: Optional[str] = None
+    # the columns to keep, when columns are dropped
+    replace_columns: List[Tuple[str, str]] = field(default_factory=list)
+    add_columns: List[Tuple[str, str]] = field(default_factory=list)
+    change_columns: List[Tuple[str, str]] = field(default_factory=list)
+    # the columns of the evolved table, in order
+    column_names: List[str] = field(default_factory=list)
+
+
+def validate_rebuild_strategy(rebuild_strategy: str) -> str:
+    if rebuild_strategy not in REBUILD_STRATEGIES:
+        raise dbt.exceptions.DbtRuntimeError(
+            f"Invalid rebuild_strategy '{rebuild_strategy}', "
+            f"expected one of: {', '.join(REBUILD_STRATEGIES)}"
+        )
+    return rebuild_strategy
+
+
+def result_columns(description: Iterable[Sequence]) -> List[ResultColumn]:
+    """The columns of a DB-API cursor description. HiveServer2 qualifies the
+    names with the alias of the subquery, e.g. `dbt_sbq.id`."""
+    return [
+        ResultColumn(
+            name=str(name).rsplit(".", 1)[-1].lower(),
+            type_name=str(type_code).split("(")[0].lower(),
+            precision=precision,
+            scale=scale,
+        )
+        for name, type_code, _, _, precision, scale, *_ in description
+    ]
+
+
+def rebuild_mismatch(
+    columns: List[ResultColumn],
+    describe: Optional[DescribeResult],
+    file_format: Optional[str] = None,
+    external: bool = False,
+    location: Optional[str] = None,
+) -> Optional[str]:
+    """Why the table described by `describe` cannot be overwritten with the
+    result of a query yielding `columns`, None when it can"""
+    if describe is None:
+        return "the table does not exist"
+    if describe.table_type not in (TABLE_TYPE_MANAGED, TABLE_TYPE_EXTERNAL):
+        return f"it is a {describe.table_type}"
+    if describe.is_iceberg:
+        return "it is an iceberg table"
+    if describe.partition_columns:
+        # a dynamic partition insert keeps the partitions the query does not write
+        return "the table is partitioned"
+    if describe.details.get(KEY_NUM_BUCKETS, "-1") not in ("-1", "0"):
+        return "the table is bucketed"
+    if external != (describe.table_type == TABLE_TYPE_EXTERNAL):
+        return "external changed"
+    fragment = _INPUT_FORMATS.get((file_format or "").lower())
+    if fragment and fragment not in (describe.input_format or "").lower():
+        return f"the table is not stored as {file_format}"
+    if location and not (describe.location or "").rstrip("/").endswith(location.rstrip("/")):
+        return "the location changed"
+
+    if [c.name for c in columns] != [c.name.lower() for c in describe.columns]:
+        return "the column names changed"
+    for column, described in zip(columns, describe.columns):
+        if not _same_type(column, described.data_type):
+            return f"the type of {column.name} changed"
+    return None
+
+
+def _same_type(column: ResultColumn, data_type: str) -> bool:
+    hive_type = parse_hive_type(data_type)
+    if hive_type.is_complex or hive_type.name in ("char", "varchar"):
+        return False
+    if hive_type.name != column.type_name:
+        return False
+    if hive_type.is_decimal:
+        return (hive_type.precision, hive_type.scale) == (column.precision, column.scale)
+    return True
+
+
+def iceberg_column_type(column: ResultColumn) -> Optional[str]:
+    """The type of the Iceberg column holding `column`, None when it is not
+    known (complex types, NULL, intervals)"""
+    if column.type_name == "decimal":
+        if column.precision is None or column.scale is None:
+            return None
+        return f"decimal({column.precision},{column.scale})"
+    return _ICEBERG_TYPES.get(column.type_name)
+
+
+def _iceberg_promotes(from_type: str, to_type: str) -> bool:
+    source, target = parse_hive_type(from_type), parse_hive_type(to_type)
+    if (source.name, target.name) in (("int", "bigint"), ("float", "double")):
+        return True
+    return (
+        source.is_decimal
+        and target.is_decimal
+        and source.scale == target.scale
+        and target.precision > source.precision
+    )
+
+
+def iceberg_rebuild_plan(
+    columns: List[ResultColumn], describe: Optional[DescribeResult], partitioned: bool = False
+) -> IcebergRebuildPlan:
+    """The schema changes which make the Iceberg table described by
+    `describe` hold the result of a query yielding `columns`"""
+    if describe is None:
+        return IcebergRebuildPlan("the table does not exist")
+    if not describe.is_iceberg:
+        return IcebergRebuildPlan("it is not an iceberg table")
+    if partitioned or describe.partition_transforms or describe.partition_columns:
+        # insert overwrite of a partitioned table only replaces the partitions it writes
+        return IcebergRebuildPlan("the table is partitioned")
+
+    required = {}
+    for column in columns:
+        column_type = iceberg_column_type(column)
+        if column_type is None:
+            return IcebergRebuildPlan(f"the type of {column.name} is not known")
+        required[column.name] = column_type
+    if len(required) != len(columns):
+        return IcebergRebuildPlan("the query yields duplicate column names")
+
+    plan = IcebergRebuildPlan()
+    current = {c.name.lower(): c.data_type for c in describe.columns}
+    kept = [(name, data_type) for name, data_type in current.items() if name in required]
+    if len(kept) < len(current):
+        if not kept:
+            return IcebergRebuildPlan("no column is kept")
+        plan.replace_columns = kept
+    for name, data_type in kept:
+        if parse_hive_type(data_type) == parse_hive_type(required[name]):
+            continue
+        if not _iceberg_promotes(data_type, required[name]):
+            return IcebergRebuildPlan(
+                f"the type of {name} cannot change from {data_type} to {required[name]}"
+            )
+        plan.change_columns.append((name, required[name]))
+    plan.add_columns = [(c.name, required[c.name]) for c in columns if c.name not in current]
+    plan.column_names = [name for name, _ in kept] + [name for name, _ in plan.add_columns]
+    return plan
@@ -0,0 +1,89 @@
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from dbt_common.dataclass_schema import dbtClassMixin
+
+# table parameter -> (field, catalog label, catalog description)
+STATISTICS_PARAMETERS = {
+    "numRows": ("num_rows", "Rows", "Number of rows, from the table statistics"),
+    "rawDataSize": ("raw_data_size", "Raw Data Size", "Uncompressed size of the data in bytes"),
+    "totalSize": ("total_size", "Total Size", "Size of the table files in bytes"),
+    "numFiles": ("num_files", "Files", "Number of files of the table"),
+}
+
+# JSON parameter telling whether the basic statistics match the data
+STATS_ACCURATE_PARAMETER = "COLUMN_STATS_ACCURATE"
+
+
+def _statistic(value: Any) -> Optional[int]:
+    """Hive reports unknown statistics as -1"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number >= 0 else None
+
+
+def _basic_stats_accurate(value: Any) -> bool:
+    try:
+        flags = json.loads(value)
+    except (TypeError, ValueError):
+        return False
+    return isinstance(flags, dict) and str(flags.get("BASIC_STATS", "")).lower() == "true"
+
+
+@dataclass
+class TableStats(dbtClassMixin):
+    """Basic statistics the metastore keeps in the table parameters"""
+
+    num_rows: Optional[int] = None
+    raw_data_size: Optional[int] = None
+    total_size: Optional[int] = None
+    num_files: Optional[int] = None
+    # statistics were gathered after the last write (COLUMN_STATS_ACCURATE)
+    accurate: bool = False
+
+    @classmethod
+    def from_parameters(cls, parameters: Optional[Mapping[str, Any]]) -> "TableStats":
+        """Statistics from `describe formatted` or `show tblproperties` parameters"""
+        if not parameters:
+            return cls()
+        values = {
+            field: _statistic(parameters.get(parameter))
+            for parameter, (field, _, _) in STATISTICS_PARAMETERS.items()
+        }
+        return cls(
+            accurate=_basic_stats_accurate(parameters.get(STATS_ACCURATE_PARAMETER)), **values
+        )
+
+    @property
+    def is_known_empty(self) -> bool:
+        """The table has no rows, according to up to date statistics"""
+        return self.accurate and self.num_rows == 0
+
+    def to_catalog_stats(self) -> Dict[str, Any]:
+        """The `stats:<id>:<attribute>` columns of the dbt docs catalog"""
+        catalog_stats: Dict[str, Any] = {}
+        for field, label, description in STATISTICS_PARAMETERS.values():
+            value = getattr(self, field)
+            if value is None:
+                continue
+            catalog_stats[f"stats:{field}:label"] = label
+            catalog_stats[f"stats:{field}:value"] = value
+            catalog_stats[f"stats:{field}:description"] = description
+            catalog_stats[f"stats:{field}:include"] = True
+        return catalog_stats
@@ -86,9 +86,14 @@
   {%- endif %}
 {%- endmacro -%}
 
+{#-- the adapter streams the rows of this query, override it rather than fetch_tbl_properties --#}
+{% macro fetch_tbl_properties_sql(relation) -%}
+  {% do return("SHOW TBLPROPERTIES " ~ relation) %}
+{%- endmacro %}
+
 {% macro fetch_tbl_properties(relation) -%}
   {% call statement('list_properties', fetch_result=True) -%}
-    SHOW TBLPROPERTIES {{ relation }}
+    {{ fetch_tbl_properties_sql(relation) }}
   {% endcall %}
   {% do return(load_result('list_properties').table) %}
 {%- endmacro %}
@@ -206,18 +211,25 @@
   {%- call statement('create_schema') -%}
     create schema if not exists {{relation}}
   {% endcall %}
+  {% do adapter.set_schema_exists(relation.schema, true) %}
 {% endmacro %}
 
 {% macro hive__drop_schema(relation) -%}
   {%- call statement('drop_schema') -%}
     drop schema if exists {{ relation }} cascade
   {%- endcall -%}
+  {% do adapter.set_schema_exists(relation.schema, false) %}
 {% endmacro %}
 
+{#-- the adapter streams the rows of this query, override it rather than get_columns_in_relation --#}
+{% macro hive__get_columns_in_relation_sql(relation) -%}
+  {% do return("describe formatted " ~ relation) %}
+{%- endmacro %}
+
 {# use describe extended for more information #}
 {% macro hive__get_columns_in_relation(relation) -%}
   {% call statement('get_columns_in_relation', fetch_result=True) %}
-    describe formatted {{ relation }}
+    {{ hive__get_columns_in_relation_sql(relation) }}
   {% endcall %}
   {% do return(load_result('get_columns_in_relation').table) %}
 {% endmacro %}
@@ -237,6 +249,13 @@
   {{ return(load_result('list_schemas').table) }}
 {% endmacro %}
 
+{% macro hive__list_schemas_like(schema) -%}
+  {% call statement('list_schemas_like', fetch_result=True, auto_begin=False) %}
+    show databases like '{{ schema }}'
+  {% endcall %}
+  {{ return(load_result('list_schemas_like').table) }}
+{% endmacro %}
+
 {% macro hive__rename_relation(from_relation, to_relation) -%}
   {% call statement('rename_relation') -%}
     {% if not from_relation.type %}
@@ -348,21 +367,81 @@
   {% do return(load_result('list_views_without_caching').table) %}
 {% endmacro %}
 
+{% macro hive__get_schema_change_markers(schemas) %}
+  {#-- id and last DDL time of every relation, see persistent_cache.py --#}
+  {% call statement('get_schema_change_markers', fetch_result=True) -%}
+    select d.name, t.tbl_name, t.tbl_id, p.param_value
+    from sys.tbls t
+    join sys.dbs d on t.db_id = d.db_id
+    left join sys.table_params p
+      on t.tbl_id = p.tbl_id and p.param_key = 'transient_lastDdlTime'
+    where d.name in ('{{ schemas | join("', '") }}')
+  {% endcall %}
+  {% do return(load_result('get_schema_change_markers').table) %}
+{% endmacro %}
+
+{% macro hive__get_last_notification_event_id() %}
+  {% call statement('get_last_notification_event_id', fetch_result=True) -%}
+    select max(event_id) from sys.notification_log
+  {% endcall %}
+  {% do return(load_result('get_last_notification_event_id').table) %}
+{% endmacro %}
+
+{% macro hive__get_notification_events(after_event_id, limit) %}
+  {#-- metastore events in order, see notification_log.py --#}
+  {% call statement('get_notification_events', fetch_result=True) -%}
+    select event_id, event_type, db_name, tbl_name, message
+    from sys.notification_log
+    where event_id > {{ after_event_id }}
+    order by event_id
+    limit {{ limit }}
+  {% endcall %}
+  {% do return(load_result('get_notification_events').table) %}
+{% endmacro %}
+
+{% macro hive__get_partition_values(relation, partition_columns) %}
+  {% call statement('get_partition_values', fetch_result=True) -%}
+    select
+      {%- for column in partition_columns %}
+      cast({{ column }} as string) as {{ column }}{{ "," if not loop.last }}
+      {%- endfor %}
+    from {{ relation }}
+    group by {{ partition_columns | join(', ') }}
+  {%- endcall %}
+  {% do return(load_result('get_partition_values').table) %}
+{% endmacro %}
+
+{% macro hive__get_column_ranges(relation, columns) %}
+  {% call statement('get_column_ranges', fetch_result=True) -%}
+    select
+      {%- for column in columns %}
+      cast(min({{ column }}) as string) as min_{{ loop.index }},
+      cast(max({{ column }}) as string) as max_{{ loop.index }},
+      count(*) - count({{ column }}) as nulls_{{ loop.index }}{{ "," if not loop.last }}
+      {%- endfor %}
+    from {{ relation }}
+  {%- endcall %}
+  {% do return(load_result('get_column_ranges').table) %}
+{% endmacro %}
+
+{% macro hive__list_extended_tables_without_caching(schema) %}
+  {#-- Hive 4: name and table type of every table, view and materialized view --#}
+  {% call statement('list_extended_tables_without_caching', fetch_result=True) -%}
+    show extended tables in {{ schema }}
+  {% endcall %}
+  {% do return(load_result('list_extended_tables_without_caching').table) %}
+{% endmacro %}
+
 {% macro get_hive_version() %}
-  {% set version_results = run_query('select version()') %}
+  {#-- the server is probed once per host, see adapter.hive_capabilities() --#}
   {% if execute %}
-     {% set num_rows = (version_results | length) %}
-
-     {% if num_rows == 1 %}
-        {% set version_text = version_results[0][0] %}
-        {{ log("get_hive_version " ~ version_text) }}
-        {% do return(version_text.split(".")[0]) %}
-     {% else %}
-        {% do return('2') %}  {# assume hive 2 by default #}
+     {% set capabilities = adapter.hive_capabilities() %}
+     {% if capabilities.major_version is not none %}
+        {{ log("get_hive_version " ~ capabilities.version) }}
+        {% do return(capabilities.major_version | string) %}
      {% endif %}
-  {% else %}
-    {% do return('2') %}  {# assume hive 2 by default #}
   {% endif %}
+  {% do return('2') %}  {# assume hive 2 by default #}
 {% endmacro %}
 
 {% macro alter_relation_add_columns(relation, add_columns = none) -%}
@@ -392,17 +471,25 @@
     {% set change_columns = [] %}
   {% endif %}
 
-  {% set sql -%}
-    {%- for column in change_columns -%}
-      alter {{ relation.type }} {{ relation }}
-        change {{ adapter.quote_seed_column(column.name, quote_seed_column) }}
-          {{ adapter.quote_seed_column(column.name, quote_seed_column) }}
-          {{ column.data_type }}
-    {%- endfor -%}
-  {%- endset -%}
+  {#-- columns, or the {column_name, new_type} dicts of diff_column_data_types --#}
+  {%- for column in change_columns -%}
+    {%- set column_name = column['column_name'] if column is mapping else column.name -%}
+    {%- set data_type = column['new_type'] if column is mapping else column.data_type -%}
+    {% do alter_column_type(relation, adapter.quote_seed_column(column_name, quote_seed_column), data_type) %}
+  {%- endfor -%}
+{% endmacro %}
 
-  {% if (change_columns | length) > 0 %}
-    {{ return(run_query(sql)) }}
+{% macro hive__alter_column_type(relation, column_name, new_column_type) -%}
+  {% call statement('alter_column_type') %}
+    alter table {{ relation }} change {{ column_name }} {{ column_name }} {{ new_column_type }}
+  {% endcall %}
+{% endmacro %}
+
+{% macro alter_relation_set_tbl_properties(relation, properties = none) -%}
+  {% if properties %}
+    {% call statement('set_tbl_properties') %}
+      alter table {{ relation }} set {{ properties_clause(properties) }}
+    {% endcall %}
   {% endif %}
 {% endmacro %}
 
@@ -0,0 +1,52 @@
+{#
+# Copyright 2022 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#}
+
+{#-- The `sys` database (Hive 3+) exposes the metastore tables, so the
+     catalog of a whole schema takes two queries instead of two per relation --#}
+
+{% macro hive__get_sys_catalog_columns(schema) %}
+  {#-- data columns then partition keys of every relation, in describe order --#}
+  {% call statement('get_sys_catalog_columns', fetch_result=True) -%}
+    select t.tbl_name, t.tbl_type, t.owner, c.column_name, c.type_name, c.comment,
+           0 as is_partition_key, c.integer_idx
+    from sys.tbls t
+    join sys.dbs d on t.db_id = d.db_id
+    join sys.sds s on t.sd_id = s.sd_id
+    join sys.columns_v2 c on s.cd_id = c.cd_id
+    where d.name = '{{ schema | lower }}'
+    union all
+    select t.tbl_name, t.tbl_type, t.owner, k.pkey_name, k.pkey_type, k.pkey_comment,
+           1 as is_partition_key, k.integer_idx
+    from sys.tbls t
+    join sys.dbs d on t.db_id = d.db_id
+    join sys.partition_keys k on t.tbl_id = k.tbl_id
+    where d.name = '{{ schema | lower }}'
+  {% endcall %}
+  {% do return(load_result('get_sys_catalog_columns').table) %}
+{% endmacro %}
+
+{% macro hive__get_sys_catalog_table_params(schema, param_keys) %}
+  {#-- table comments and statistics --#}
+  {% call statement('get_sys_catalog_table_params', fetch_result=True) -%}
+    select t.tbl_name, p.param_key, p.param_value
+    from sys.tbls t
+    join sys.dbs d on t.db_id = d.db_id
+    join sys.table_params p on t.tbl_id = p.tbl_id
+    where d.name = '{{ schema | lower }}'
+      and p.param_key in ('{{ param_keys | join("', '") }}')
+  {% endcall %}
+  {% do return(load_result('get_sys_catalog_table_params').table) %}
+{% endmacro %}
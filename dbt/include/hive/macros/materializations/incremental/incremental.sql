@@ -85,11 +85,24 @@
 
   {% set to_drop = [] %}
 
+  {#-- direct_insert skips the temp table when the target columns are known and kept as they are --#}
+  {%- set direct_insert = config.get('direct_insert', default=false)
+        and incremental_strategy in ['append', 'insert_overwrite', 'microbatch']
+        and on_schema_change == 'ignore'
+        and existing_relation is not none and not full_refresh_mode -%}
+  {%- if direct_insert -%}
+    {%- set direct_insert_columns = adapter.get_columns_in_relation(existing_relation) -%}
+    {%- set direct_insert = direct_insert_columns | length > 0 -%}
+  {%- endif -%}
+
   {% if existing_relation is none %}
       {% set build_sql = get_create_table_as_sql(False, target_relation, sql) %}
   {% elif full_refresh_mode %}
       {% set build_sql = get_create_table_as_sql(False, intermediate_relation, sql) %}
       {% set need_swap = true %}
+  {% elif direct_insert %}
+    {#-- the model sql is written once, straight into the target --#}
+    {% set build_sql = dbt_hive_get_direct_insert_sql(incremental_strategy, sql, target_relation, direct_insert_columns) %}
   {% else %}
     {{ drop_relation(temp_relation) }}
     {% do run_query(get_create_table_as_sql(False, temp_relation, sql)) %}
@@ -108,9 +121,11 @@
 
   {% endif %}
 
+  {% do adapter.configure_partition_overwrite(target_relation) %}
   {% call statement("main") %}
       {{ build_sql }}
   {% endcall %}
+  {% do adapter.record_partition_overwrite(target_relation, load_result('main').response) %}
 
   {% if need_swap %}
       {% do adapter.rename_relation(target_relation, backup_relation) %}
@@ -16,12 +16,20 @@
 
 {% macro get_insert_overwrite_sql(source_relation, target_relation) %}
 
+    {#-- static partition specs for the partitions present in the new rows --#}
+    {%- set max_static_partitions = config.get('max_static_partitions', default=16) -%}
+    {%- set partition_overwrite_sql = adapter.partition_overwrite_sql(
+          source_relation.include(database=false, schema=true), target_relation, max_static_partitions) -%}
+    {%- if partition_overwrite_sql is not none -%}
+    {{ partition_overwrite_sql }}
+    {%- else -%}
     {%- set dest_columns = adapter.get_columns_in_relation(target_relation) -%}
     {%- set table_type = config.get('table_type') -%}
     {%- set dest_cols_csv = dest_columns | map(attribute='quoted') | join(', ') -%}
     insert overwrite table {{ target_relation }}
     {{ partition_cols(label="partition") }}
     select {{dest_cols_csv}} from {{ source_relation.include(database=false, schema=true) }}
+    {%- endif %}
 
 {% endmacro %}
 
@@ -102,8 +110,16 @@
     {#-- insert statements don't like CTEs, so support them via a temp view #}
     {{ get_insert_overwrite_sql(source, target) }}
   {%- elif strategy == 'merge' -%}
-  {#-- merge all columns with databricks delta - schema changes are handled for us #}
-    {{ get_merge_sql(target, source, unique_key, dest_columns, predicates=none) }}
+  {#-- merge all columns, restricted by incremental_predicates #}
+    {%- set predicates = config.get('predicates', none) or config.get('incremental_predicates', none) -%}
+    {%- if predicates is string -%}
+      {%- set predicates = [predicates] -%}
+    {%- endif -%}
+    {%- if config.get('merge_prune_partitions', default=false) -%}
+      {#-- restrict the target to the partitions of the new rows, as literals Hive can prune by --#}
+      {%- set predicates = (predicates or []) + adapter.merge_partition_predicates(source, target) -%}
+    {%- endif -%}
+    {{ get_merge_sql(target, source, unique_key, dest_columns, incremental_predicates=predicates) }}
   {%- else -%}
     {% set no_sql_for_strategy_msg -%}
       No known SQL for the incremental strategy provided: {{ strategy }}
@@ -114,6 +130,23 @@
 {% endmacro %}
 
 
+{% macro dbt_hive_get_direct_insert_sql(strategy, sql, target, dest_columns) %}
+  {#-- append and insert_overwrite straight from the model sql, without a temp table #}
+  {%- set dest_cols_csv = dest_columns | map(attribute='quoted') | join(', ') -%}
+  {%- if strategy == 'append' -%}
+    insert into {{ target }} ({{ dest_cols_csv }})
+  {%- else -%}
+    {#-- the partition values of the new rows are unknown without running the model sql twice --#}
+    {%- do log("direct_insert: overwriting the partitions of " ~ target ~ " dynamically") -%}
+    insert overwrite table {{ target }}
+    {{ partition_cols(label="partition") }}
+  {%- endif %}
+    select {{ dest_cols_csv }} from (
+        {{ sql }}
+    ) dbt_direct_insert
+{% endmacro %}
+
+
 {% macro hive__get_incremental_default_sql(arg_dict) %}
   {#-- default mode is append, so return the sql for the same  #}
   {% do return(get_insert_into_sql(arg_dict["source_relation"], arg_dict["target_relation"], arg_dict["dest_columns"])) %}
@@ -18,29 +18,22 @@
     {% set batch_size = 1000 %}
     {% set column_override = model['config'].get('column_types', {}) %}
 
-    {% set statements = [] %}
-
-    {% for chunk in agate_table.rows | batch(batch_size) %}
-        {% set bindings = [] %}
+    {% set column_types = [] %}
+    {% for col_name in agate_table.column_names %}
+        {% set inferred_type = adapter.convert_type(agate_table, loop.index0) %}
+        {% do column_types.append(column_override.get(col_name, inferred_type)) %}
+    {% endfor %}
 
-        {% for row in chunk %}
-          {% do bindings.extend(row) %}
-        {% endfor %}
+    {% set statements = [] %}
 
+    {# values are rendered as literals client side, no parameter binding #}
+    {% for values in adapter.render_seed_values(agate_table, column_types, batch_size) %}
         {% set sql %}
             insert into {{ this.render() }} values
-            {% for row in chunk -%}
-                ({%- for col_name in agate_table.column_names -%}
-                    {%- set inferred_type = adapter.convert_type(agate_table, loop.index0) -%}
-                    {%- set type = column_override.get(col_name, inferred_type) -%}
-                      cast(%s as {{type}})
-                    {%- if not loop.last%},{%- endif %}
-                {%- endfor -%})
-                {%- if not loop.last%},{%- endif %}
-            {%- endfor %}
+            {{ values }}
         {% endset %}
 
-        {% do adapter.add_query(sql, bindings=bindings, abridge_sql_log=True) %}
+        {% do adapter.add_query(sql, abridge_sql_log=True) %}
 
         {% if loop.index0 == 0 %}
             {% do statements.append(sql) %}
@@ -23,31 +23,89 @@
   {{ run_hooks(pre_hooks) }}
 
  {%- set table_type = config.get('table_type', '') | lower -%}
+  {%- set rebuild_strategy = config.get('rebuild_strategy', 'swap') -%}
+  {%- set contract_config = config.get('contract', default={'enforced': false}) -%}
+  {% if rebuild_strategy == 'insert_overwrite' and contract_config.enforced %}
+      {#-- create_table_as checks the contract when the table is swapped --#}
+      {% do get_assert_columns_equivalent(sql) %}
+  {% endif %}
   {% if table_type == 'iceberg' %}
-      {% if old_relation %}
-          {{ adapter.drop_relation(old_relation) }}
+      {%- set plan = adapter.iceberg_rebuild_plan(
+            old_relation if old_relation and old_relation.is_table else none, sql, rebuild_strategy,
+            partitioned=config.get('partition_by') is not none) -%}
+      {%- set rebuild_strategy = plan.rebuild_strategy -%}
+      {%- set started_at = adapter.rebuild_started() -%}
+
+      {% if rebuild_strategy == 'insert_overwrite' %}
+          {#-- evolve the schema, then write the rows as a new snapshot --#}
+          {% do alter_relation_replace_columns(target_relation, plan.replace_columns) %}
+          {% do alter_relation_add_columns(target_relation, plan.add_columns) %}
+          {% do alter_relation_change_columns(target_relation, plan.change_columns) %}
+
+          {% call statement('main') -%}
+              insert overwrite table {{ target_relation }}
+              select {{ plan.column_names | join(', ') }} from (
+                  {{ sql }}
+              ) dbt_rebuild
+          {%- endcall %}
+
+          {% do alter_relation_set_tbl_properties(target_relation, config.get('tbl_properties')) %}
+
+      {% else %}
+          {% if old_relation %}
+              {{ adapter.drop_relation(old_relation) }}
+          {% endif %}
+          {% call statement('main') -%}
+              {{ create_table_as(False, target_relation, sql) }}
+          {%- endcall %}
       {% endif %}
-      {% call statement('main') -%}
-          {{ create_table_as(False, target_relation, sql) }}
-      {%- endcall %}
+
+      {% do adapter.record_rebuild(target_relation, rebuild_strategy, started_at, load_result('main').response) %}
 
   {% else %}
 
-      {%- set tmp_relation = target_relation.incorporate(path={"identifier": identifier ~ "__dbt_tmp"}) -%}
+      {%- if config.get('partition_by') or config.get('clustered_by') or not (old_relation and old_relation.is_table) -%}
+          {%- set rebuild_strategy = adapter.rebuild_strategy_for(none, sql, rebuild_strategy) -%}
+      {%- else -%}
+          {%- set location_root = config.get('location_root') -%}
+          {%- set rebuild_strategy = adapter.rebuild_strategy_for(
+                old_relation, sql, rebuild_strategy,
+                file_format=config.get('file_format'),
+                external=config.get('external', default=false),
+                location=(location_root ~ '/' ~ identifier) if location_root else none) -%}
+      {%- endif -%}
+      {%- set started_at = adapter.rebuild_started() -%}
+
+      {% if rebuild_strategy == 'insert_overwrite' %}
+          {% call statement('main') -%}
+              insert overwrite table {{ target_relation }}
+              select * from (
+                  {{ sql }}
+              ) dbt_rebuild
+          {%- endcall %}
+
+          {% do alter_relation_set_tbl_properties(target_relation, config.get('tbl_properties')) %}
+
+      {% else %}
+
+          {%- set tmp_relation = target_relation.incorporate(path={"identifier": identifier ~ "__dbt_tmp"}) -%}
+
+          {% call statement('main') -%}
+              {{ create_table_as(False, tmp_relation, sql) }}
+          {%- endcall %}
 
-      {% call statement('main') -%}
-          {{ create_table_as(False, tmp_relation, sql) }}
-      {%- endcall %}
+          {% if old_relation %}
+              {{ adapter.drop_relation(old_relation) }}
+          {% endif %}
 
-      {% if old_relation %}
-          {{ adapter.drop_relation(old_relation) }}
+          {{ adapter.rename_relation(tmp_relation, target_relation) }}
       {% endif %}
 
-      {{ adapter.rename_relation(tmp_relation, target_relation) }}
+      {% do adapter.record_rebuild(target_relation, rebuild_strategy, started_at, load_result('main').response) %}
   {% endif %}
 
   {% set grant_config = config.get('grants') %}
-  {% set should_revoke = should_revoke(target_relation, full_refresh_mode=True) %}
+  {% set should_revoke = should_revoke(target_relation, full_refresh_mode=(rebuild_strategy != 'insert_overwrite')) %}
   {% do apply_grants(target_relation, grant_config, should_revoke=should_revoke) %}
   {% do persist_docs(target_relation, model) %}
   {{ run_hooks(post_hooks) }}
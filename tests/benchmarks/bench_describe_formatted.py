@@ -0,0 +1,88 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Parsing `describe formatted` of wide tables: the former multi-pass parser
+versus the single pass DescribeResult parser.
+
+Run with: python tests/benchmarks/bench_describe_formatted.py
+"""
+import timeit
+
+import agate
+
+from dbt.adapters.hive.describe import parse_describe_formatted
+
+TYPES = ["int", "bigint", "string", "decimal(18,2)", "timestamp", "struct<a:int,b:string>"]
+
+
+def describe_rows(num_columns: int, num_partitions: int = 2):
+    data = [["# col_name", "data_type", "comment"]]
+    data += [[f"column_{i}", TYPES[i % len(TYPES)], f"comment {i}"] for i in range(num_columns)]
+    data += [["", None, None], ["# Partition Information", None, None]]
+    data += [["# col_name", "data_type", "comment"]]
+    data += [[f"part_{i}", "string", ""] for i in range(num_partitions)]
+    data += [["", None, None], ["# Detailed Table Information", None, None]]
+    data += [["Owner:", "hive", None], ["Table Type:", "MANAGED_TABLE", None]]
+    data += [["Table Parameters:", None, None], ["", "numRows", "42"], ["", None, None]]
+    data += [["# Storage Information", None, None], ["SerDe Library:", "OrcSerde", None]]
+    names = ["col_name", "data_type", "comment"]
+    return agate.Table(data, names, [agate.Text(cast_nulls=False)] * 3).rows
+
+
+def legacy_parse(raw_rows):
+    """The former parser: separator scans, quadratic de-duplication, metadata pass"""
+    dict_rows = [dict(zip(row._keys, row._values)) for row in raw_rows]
+    ps_keys = ("# Partition Information", "# Partition Transform Information")
+    partition_pos = next(
+        (i for i, r in enumerate(dict_rows) if r["col_name"].startswith(ps_keys)), 0
+    )
+    table_pos = next(
+        (i for i, r in enumerate(dict_rows) if r["col_name"] == "# Detailed Table Information"),
+        len(dict_rows),
+    )
+    valid_rows = [
+        row
+        for row in raw_rows[0:table_pos]
+        if not row["col_name"].startswith("#") and not row["col_name"] == ""
+    ]
+    unique_rows = []
+    for row in valid_rows:
+        curr_unique_keys = list({row["col_name"]: row for row in unique_rows})
+        if row["col_name"] not in curr_unique_keys:
+            unique_rows.append(row)
+    metadata = {
+        col["col_name"].split(":")[0].strip(): col["data_type"].strip()
+        for col in raw_rows[table_pos + 1 :]
+        if col["col_name"] and not col["col_name"].startswith("#") and col["data_type"]
+    }
+    comments = []
+    for row in unique_rows:
+        row_dict = dict(zip(row._keys, row._values))
+        comments.append((row_dict.get("comment") or "").strip() or None)
+    return partition_pos, unique_rows, metadata, comments
+
+
+def main():
+    for num_columns in (100, 500, 2_000):
+        raw_rows = describe_rows(num_columns)
+        number = max(1, 20_000 // num_columns)
+        legacy = timeit.timeit(lambda: legacy_parse(raw_rows), number=number) / number
+        single = timeit.timeit(lambda: parse_describe_formatted(raw_rows), number=number) / number
+        print(
+            f"{num_columns:>5} columns: legacy {legacy * 1000:9.2f} ms | "
+            f"single pass {single * 1000:7.2f} ms | speedup {legacy / single:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Type predicates over the columns of a large catalog: the former string
+comparisons versus the memoized, interned type parser.
+
+Run with: python tests/benchmarks/bench_hive_types.py
+"""
+import time
+import tracemalloc
+
+from dbt.adapters.hive.hive_types import parse_hive_type
+
+TYPES = [
+    "int",
+    "bigint",
+    "string",
+    "varchar(64)",
+    "decimal(18,2)",
+    "double",
+    "timestamp",
+    "array<string>",
+    "map<string,bigint>",
+    "struct<id:bigint,name:varchar(32),tags:array<string>>",
+]
+
+
+def legacy_predicates(dtype: str):
+    """The former HiveColumn predicates, lowercasing on every call"""
+    dt = dtype.lower()
+    is_string = dt.startswith("varchar") or dt.startswith("char") or dt == "string"
+    is_integer = dtype.lower() in ["tinyint", "smallint", "integer", "int", "bigint"]
+    dt = dtype.lower()
+    is_numeric = dt in ["double", "float", "number"] or dt.startswith("decimal")
+    return is_string, is_integer, is_numeric
+
+
+def parsed_predicates(dtype: str):
+    hive_type = parse_hive_type(dtype)
+    return hive_type.is_string, hive_type.is_integer, hive_type.is_numeric
+
+
+def run(predicates, dtypes):
+    start = time.perf_counter()
+    for dtype in dtypes:
+        predicates(dtype)
+    return time.perf_counter() - start
+
+
+def main():
+    for num_columns in (100_000, 1_000_000, 3_000_000):
+        dtypes = [TYPES[i % len(TYPES)] for i in range(num_columns)]
+        legacy = run(legacy_predicates, dtypes)
+        parsed = run(parsed_predicates, dtypes)
+
+        tracemalloc.start()
+        hive_types = [parse_hive_type(dtype) for dtype in dtypes]
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        distinct = len({id(hive_type) for hive_type in hive_types})
+        print(
+            f"{num_columns:>9} columns: legacy {legacy:6.2f} s | parsed {parsed:6.2f} s | "
+            f"speedup {legacy / parsed:4.1f}x | {distinct} type objects, "
+            f"{peak / num_columns:5.1f} bytes per column"
+        )
+
+
+if __name__ == "__main__":
+    main()
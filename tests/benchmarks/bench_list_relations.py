@@ -0,0 +1,105 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Relation listing of large schemas: the former quadratic table/view merge
+versus the set based merge and the single SHOW EXTENDED TABLES listing.
+
+Run with: python tests/benchmarks/bench_list_relations.py
+"""
+import timeit
+
+import agate
+
+from dbt.adapters.hive.impl import HiveAdapter
+from dbt.adapters.hive.capabilities import HiveCapabilities
+from dbt.adapters.hive.relation import HiveRelation
+from dbt.adapters.hive.relation_listing import merge_tables_and_views
+
+# the quadratic merge is skipped above this many table x view comparisons
+MAX_LEGACY_COMPARISONS = 10_000_000
+
+
+def schema_listings(num_relations: int, view_ratio: float):
+    names = [f"relation_{i:06d}" for i in range(num_relations)]
+    views = names[:: int(1 / view_ratio)]
+    view_set = set(views)
+    tables = agate.Table([[n] for n in names], ["tab_name"], [agate.Text()])
+    view_table = agate.Table([[n] for n in views], ["tab_name"], [agate.Text()])
+    extended = agate.Table(
+        [[n, "VIRTUAL_VIEW" if n in view_set else "MANAGED_TABLE"] for n in names],
+        ["tab_name", "table_type"],
+        [agate.Text(), agate.Text()],
+    )
+    return tables, view_table, extended
+
+
+def legacy_merge(result_tables, result_views):
+    """The former merge: one scan of the views per table"""
+    result_tables_without_view = []
+    for row in result_tables:
+        is_view = len(list(filter(lambda x: x["tab_name"] == row["tab_name"], result_views))) == 1
+        if not is_view:
+            result_tables_without_view.append(row)
+    return [(r["tab_name"], "table") for r in result_tables_without_view] + [
+        (r["tab_name"], "view") for r in result_views
+    ]
+
+
+def set_merge(result_tables, result_views):
+    return merge_tables_and_views(
+        (row["tab_name"] for row in result_tables), (row["tab_name"] for row in result_views)
+    )
+
+
+def adapter_listing(results, hive4: bool):
+    adapter = HiveAdapter.__new__(HiveAdapter)
+    adapter.execute_macro = lambda name, kwargs=None: results[name]
+    adapter.hive_capabilities = lambda: HiveCapabilities(supports_show_extended_tables=hive4)
+    schema = HiveRelation.create(schema="bench")
+    return lambda: adapter._list_relations(schema)
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    for num_relations, view_ratio in ((5_000, 0.2), (50_000, 0.02), (50_000, 0.2)):
+        tables, views, extended = schema_listings(num_relations, view_ratio)
+        comparisons = len(tables.rows) * len(views.rows)
+        if comparisons <= MAX_LEGACY_COMPARISONS:
+            legacy = f"{best_of(lambda: legacy_merge(tables.rows, views.rows), 1):8.3f}s"
+        else:
+            legacy = "skipped"
+        merged = best_of(lambda: set_merge(tables.rows, views.rows))
+
+        two_queries = adapter_listing(
+            {
+                "hive__list_tables_without_caching": tables,
+                "hive__list_views_without_caching": views,
+            },
+            hive4=False,
+        )
+        one_query = adapter_listing(
+            {"hive__list_extended_tables_without_caching": extended}, hive4=True
+        )
+        print(
+            f"{num_relations:>6} relations, {len(views.rows):>5} views: "
+            f"merge legacy {legacy:>9} | set {merged:6.3f}s || "
+            f"listing show tables+views {best_of(two_queries):6.3f}s | "
+            f"show extended tables {best_of(one_query):6.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Throughput of seed value rendering: bound parameters versus literals.
+
+Run with: python tests/benchmarks/bench_seed_literals.py
+"""
+import datetime
+import timeit
+from decimal import Decimal
+
+import agate
+from dbt_common.clients.agate_helper import Integer, ISODateTime, Number
+from impala.interface import _bind_parameters
+
+from dbt.adapters.hive.connections import HiveConnectionWrapper
+from dbt.adapters.hive.literals import render_values_batches
+
+BATCH_SIZE = 1000
+
+COLUMNS = [
+    (agate.Text(), "string", lambda i: f"name 'number' {i}"),
+    (Integer(), "bigint", lambda i: i),
+    (Number(), "double", lambda i: Decimal(i) / 8),
+    (agate.Boolean(), "boolean", lambda i: i % 2 == 0),
+    (agate.Date(), "date", lambda i: datetime.date(2024, 1, 1) + datetime.timedelta(days=i % 365)),
+    (ISODateTime(), "timestamp", lambda i: datetime.datetime(2024, 1, 1, 0, 0, i % 60)),
+    (agate.Text(), "string", lambda i: None if i % 10 == 0 else "x" * (i % 20)),
+]
+
+
+def seed_table(num_rows: int, num_columns: int):
+    columns = [COLUMNS[i % len(COLUMNS)] for i in range(num_columns)]
+    rows = [[make(i) for _, _, make in columns] for i in range(num_rows)]
+    names = [f"c{i}" for i in range(num_columns)]
+    types = [data_type for data_type, _, _ in columns]
+    return agate.Table(rows, names, types, _is_fork=True), [sql_type for _, sql_type, _ in columns]
+
+
+def bound_parameters(agate_table, column_types):
+    """The former path: placeholders, binding cleanup and impyla substitution"""
+    for start in range(0, len(agate_table.rows), BATCH_SIZE):
+        batch = agate_table.rows[start : start + BATCH_SIZE]
+        sql = ",\n".join(
+            "(" + ",".join(f"cast(%s as {t})" for t in column_types) + ")" for _ in batch
+        )
+        bindings = []
+        for row in batch:
+            bindings.extend(row)
+        bindings = list(
+            map(lambda x: x if x else x if x != None and len(str(x)) > 0 else "", bindings)
+        )
+        bindings = [HiveConnectionWrapper._fix_binding(binding) for binding in bindings]
+        _bind_parameters(sql, bindings, "format")
+
+
+def literals(agate_table, column_types):
+    for _ in render_values_batches(agate_table, column_types, BATCH_SIZE):
+        pass
+
+
+def main():
+    for num_rows, num_columns in ((10_000, 7), (10_000, 28), (100_000, 7)):
+        agate_table, column_types = seed_table(num_rows, num_columns)
+        cells = num_rows * num_columns
+        number = 3
+
+        bound = timeit.timeit(lambda: bound_parameters(agate_table, column_types), number=number)
+        rendered = timeit.timeit(lambda: literals(agate_table, column_types), number=number)
+        bound, rendered = bound / number, rendered / number
+
+        print(
+            f"{num_rows:>7} rows x {num_columns:>2} columns: "
+            f"bound parameters {cells / bound / 1e6:6.2f} M values/s | "
+            f"literals {cells / rendered / 1e6:6.2f} M values/s | "
+            f"speedup {bound / rendered:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Micro-benchmark of the statement splitter on large compiled models.
+
+Run with: python tests/benchmarks/bench_sql_splitter.py
+"""
+import timeit
+
+from dbt.adapters.hive.sql_splitter import clear_split_cache, split_sql_statements
+
+
+def compiled_model(num_columns: int) -> str:
+    """A contract-enforced model: create table + insert with a wide select"""
+    columns = ",\n".join(
+        f"  col_{i} string comment 'column {i}; generated'" for i in range(num_columns)
+    )
+    select = ",\n".join(
+        f"  case when src.c{i} like '%;%' then 'semi;colon' else `src`.`c{i}` end as col_{i}"
+        f" -- derived; column {i}"
+        for i in range(num_columns)
+    )
+    return (
+        '/* {"app": "dbt", "node_id": "model.project.wide"} */\n'
+        f"create table analytics.wide (\n{columns}\n) stored as orc;\n"
+        f"insert into analytics.wide\nselect\n{select}\nfrom /* source; table */ raw.src as src"
+    )
+
+
+def main():
+    for num_columns in (100, 1000, 5000):
+        sql = compiled_model(num_columns)
+        number = max(1, 2000 // num_columns)
+
+        naive = timeit.timeit(lambda: sql.split(";"), number=number) / number
+        clear_split_cache()
+        tokenized = (
+            timeit.timeit(
+                lambda: (clear_split_cache(), split_sql_statements(sql)),
+                number=number,
+            )
+            / number
+        )
+        cached = timeit.timeit(lambda: split_sql_statements(sql), number=number * 100) / (
+            number * 100
+        )
+
+        print(
+            f"{num_columns:>5} columns, {len(sql) / 1024:8.1f} KiB: "
+            f"str.split {naive * 1e3:8.3f} ms | "
+            f"tokenizer {tokenized * 1e3:8.3f} ms | "
+            f"cached {cached * 1e6:8.3f} us | "
+            f"statements {len(split_sql_statements(sql))} (str.split: {len(sql.split(';'))})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import pytest
+
+from dbt.tests.adapter.basic.files import incremental_sql, schema_base_yml
+from dbt.tests.adapter.basic.test_incremental import BaseIncremental
+
+from tests.functional.adapter.config_files import insertoverwrite_sql
+from tests.functional.adapter.test_file_format import prepend_attr_in_model_config
+
+
+class TestDirectInsertAppendHive(BaseIncremental):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "incremental.sql": prepend_attr_in_model_config(
+                incremental_sql, "direct_insert=True, "
+            ),
+            "schema.yml": schema_base_yml,
+        }
+
+
+class TestDirectInsertInsertOverwriteHive(BaseIncremental):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {
+            "incremental.sql": prepend_attr_in_model_config(
+                insertoverwrite_sql, "direct_insert=True, "
+            ),
+            "schema.yml": schema_base_yml,
+        }
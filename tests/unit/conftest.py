@@ -0,0 +1,84 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+
+from dbt.adapters.hive.impl import (
+    FETCH_TBL_PROPERTIES_SQL_MACRO_NAME,
+    GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+    HiveAdapter,
+)
+from dbt.adapters.hive.metadata_cache import MetadataCache
+
+
+class FakeConnections:
+    """The run state of a HiveConnectionManager, without HiveServer2"""
+
+    def __init__(self, metadata_cache=None, relation_cache=None, notification_log=None):
+        self.metadata_cache = metadata_cache or MetadataCache()
+        self.relation_cache = relation_cache
+        self.notification_log = notification_log
+        self.next_query_configuration = {}
+
+    def set_next_query_configuration(self, configuration):
+        self.next_query_configuration = dict(configuration)
+
+
+@pytest.fixture
+def make_adapter():
+    """Factory of HiveAdapters without a profile, whose `execute_macro`
+    returns `results[name]`: a callable is called with the macro kwargs, an
+    exception is raised. Queries streamed by the connection manager are
+    answered the same way, keyed by their SQL, which the metadata query
+    macros render as the real ones do. The macros and queries run
+    are recorded in `adapter.executed`, the macro kwargs in
+    `adapter.executed_kwargs`. Keyword arguments replace attributes of the
+    adapter, e.g. `connections` or `describe_relation`."""
+
+    def make(results=None, **attributes):
+        results = {
+            GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME: lambda relation: f"describe formatted {relation}",
+            FETCH_TBL_PROPERTIES_SQL_MACRO_NAME: lambda relation: f"show tblproperties {relation}",
+            **(results or {}),
+        }
+        adapter = HiveAdapter.__new__(HiveAdapter)
+        # the run state HiveAdapter.__init__ sets up
+        adapter._partitions_overwritten = {}
+        adapter._partition_overwrite_configuration = {}
+        adapter.connections = FakeConnections()
+        adapter.config = SimpleNamespace(
+            credentials=SimpleNamespace(use_sys_catalog=False), quoting={}
+        )
+        adapter.executed = []
+        adapter.executed_kwargs = []
+
+        def execute_macro(name, kwargs=None):
+            adapter.executed.append(name)
+            adapter.executed_kwargs.append(kwargs or {})
+            result = results[name]
+            if isinstance(result, Exception):
+                raise result
+            if callable(result):
+                return result(**(kwargs or {}))
+            return result
+
+        adapter.execute_macro = execute_macro
+        adapter.connections.stream_query = lambda sql, name=None: iter(execute_macro(sql))
+        for name, value in attributes.items():
+            setattr(adapter, name, value)
+        return adapter
+
+    return make
@@ -0,0 +1,125 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+import pytest
+
+from impala.error import OperationalError
+
+from dbt.adapters.hive.connections import HiveConnectionWrapper
+
+
+class FakeCursor:
+    """Mimics the parts of impyla's HiveServer2Cursor used in async mode"""
+
+    def __init__(self, polls_until_done=3, error=None, has_result_set=False, pending_polls=0):
+        self.polls_until_done = polls_until_done
+        self.pending_polls = pending_polls
+        self.error = error
+        self.has_result_set = has_result_set
+        self.close_finished_queries = True
+        self.submitted = None
+        self.polls = 0
+        self.cancelled = False
+        self.closed_operation = False
+        self.logs = ["INFO  : Compiling command", "Map 1: 0(+1)/1\tReducer 2: 0/1"]
+
+    def execute_async(self, sql, bindings=None, configuration=None):
+        self.submitted = sql
+
+    def status(self):
+        self.polls += 1
+        if self.cancelled:
+            return "CANCELED_STATE"
+        if self.polls <= self.pending_polls:
+            return "PENDING_STATE"
+        if self.polls <= self.polls_until_done:
+            return "RUNNING_STATE"
+        return "FINISHED_STATE"
+
+    def get_log(self):
+        return self.logs.pop(0) if self.logs else ""
+
+    def cancel_operation(self):
+        self.cancelled = True
+
+    def _wait_to_finish(self):
+        if self.error:
+            raise OperationalError(self.error)
+
+    def _close_finished_operation(self):
+        self.closed_operation = True
+
+
+def make_wrapper(cursor):
+    wrapper = HiveConnectionWrapper(handle=None, async_execution=True, poll_interval=0.001)
+    wrapper._cursor = cursor
+    return wrapper
+
+
+class TestAsyncExecution:
+    def test_polls_until_finished(self):
+        cursor = FakeCursor(polls_until_done=3)
+        make_wrapper(cursor).execute("insert into t select 1;")
+
+        assert cursor.submitted == "insert into t select 1"
+        assert cursor.polls == 4
+        assert cursor.closed_operation
+        assert cursor.logs == []
+
+    def test_measures_queue_time(self):
+        cursor = FakeCursor(polls_until_done=3, pending_polls=2)
+        wrapper = make_wrapper(cursor)
+        wrapper.execute("insert into t select 1")
+
+        assert wrapper.last_queue_time >= 2 * wrapper.poll_interval
+
+    def test_keeps_operation_open_for_result_sets(self):
+        cursor = FakeCursor(has_result_set=True)
+        make_wrapper(cursor).execute("select 1")
+
+        assert not cursor.closed_operation
+
+    def test_raises_server_error(self):
+        cursor = FakeCursor(error="SemanticException table not found")
+        with pytest.raises(OperationalError, match="SemanticException"):
+            make_wrapper(cursor).execute("select * from missing")
+
+    def test_cancel_from_another_thread(self):
+        cursor = FakeCursor(polls_until_done=10**9)
+        wrapper = make_wrapper(cursor)
+        wrapper.poll_interval = 10
+        timer = threading.Timer(0.05, wrapper.cancel)
+        timer.start()
+
+        with pytest.raises(OperationalError, match="cancelled"):
+            wrapper.execute("select count(*) from huge")
+        timer.join()
+
+        assert cursor.cancelled
+        assert not wrapper.is_reusable()
+
+    def test_keyboard_interrupt_cancels_operation(self):
+        cursor = FakeCursor(polls_until_done=10**9)
+
+        def interrupt():
+            raise KeyboardInterrupt
+
+        wrapper = make_wrapper(cursor)
+        wrapper._log_operation_progress = interrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            wrapper.execute("select count(*) from huge")
+        assert cursor.cancelled
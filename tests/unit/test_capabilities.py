@@ -0,0 +1,115 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from dbt.adapters.hive.capabilities import (
+    HiveCapabilities,
+    HiveCapabilitiesCache,
+    probe_capabilities,
+)
+from dbt.adapters.hive.connections import HiveCredentials
+
+
+class FakeCursor:
+    def __init__(self, results):
+        self.results = results
+        self.executed = []
+
+    def execute(self, sql):
+        self.executed.append(sql)
+        self._rows = self.results[sql]
+
+    def fetchall(self):
+        return self._rows
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    HiveCapabilitiesCache.clear()
+    yield
+    HiveCapabilitiesCache.clear()
+
+
+def make_credentials(**kwargs):
+    return HiveCredentials(host="hs2.example.com", schema="analytics", **kwargs)
+
+
+class TestHiveCapabilities:
+    def test_probe_hive3_acid(self):
+        cursor = FakeCursor(
+            {
+                "select version()": [("3.1.3000.7.1.9.0-387 rb1234",)],
+                "set hive.txn.manager": [
+                    ("hive.txn.manager=org.apache.hadoop.hive.ql.lockmgr.DbTxnManager",)
+                ],
+            }
+        )
+        capabilities = probe_capabilities(cursor)
+
+        assert capabilities.major_version == 3
+        assert capabilities.supports_acid
+        assert capabilities.supports_merge
+        assert capabilities.supports_iceberg
+        assert not capabilities.is_hive4
+
+    def test_hive4_features(self):
+        capabilities = HiveCapabilities.from_server("4.0.1", None)
+
+        assert capabilities.is_hive4
+        assert capabilities.supports_iceberg
+        assert capabilities.supports_show_extended_tables
+        assert not capabilities.supports_acid
+
+    def test_unknown_version(self):
+        capabilities = HiveCapabilities.from_server("NA", None)
+
+        assert capabilities.major_version is None
+        assert not capabilities.supports_merge
+
+    def test_probes_once_per_host(self):
+        probes = []
+
+        def probe():
+            probes.append(1)
+            return HiveCapabilities.from_server("3.1.2", None)
+
+        credentials = make_credentials()
+        HiveCapabilitiesCache.get(credentials, probe)
+        HiveCapabilitiesCache.get(make_credentials(username="other"), probe)
+
+        assert len(probes) == 1
+        assert HiveCapabilitiesCache.lookup(credentials).major_version == 3
+
+    def test_persisted_cache_honours_ttl(self, tmp_path):
+        path = str(tmp_path / "capabilities.json")
+        credentials = make_credentials(capabilities_cache_file=path, capabilities_cache_ttl=60)
+        HiveCapabilitiesCache.get(credentials, lambda: HiveCapabilities.from_server("3.1.2", None))
+        HiveCapabilitiesCache.clear()
+
+        def fail():
+            raise AssertionError("cached capabilities should be used")
+
+        assert HiveCapabilitiesCache.get(credentials, fail).version == "3.1.2"
+
+        HiveCapabilitiesCache.clear()
+        expired = HiveCapabilities.from_server("3.1.2", None)
+        expired.probed_at = time.time() - 120
+        HiveCapabilitiesCache._store(path, HiveCapabilitiesCache.key(credentials), expired)
+        reprobed = HiveCapabilitiesCache.get(
+            credentials, lambda: HiveCapabilities.from_server("4.0.0", None)
+        )
+        assert reprobed.version == "4.0.0"
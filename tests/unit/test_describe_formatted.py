@@ -0,0 +1,168 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import agate
+
+from dbt.adapters.hive.describe import DescribedColumn, parse_describe_formatted
+from dbt.adapters.hive.impl import (
+    FETCH_TBL_PROPERTIES_SQL_MACRO_NAME,
+    GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+)
+from dbt.adapters.hive.relation import HiveRelation
+from dbt.adapters.hive.table_stats import TableStats
+
+# describe formatted of a partitioned Hive 3 table
+PARTITIONED = [
+    ["# col_name", "data_type", "comment"],
+    ["id", "int", "the id"],
+    ["name", "varchar(10)", ""],
+    ["", None, None],
+    ["# Partition Information", None, None],
+    ["# col_name", "data_type", "comment"],
+    ["dt", "string", "load date"],
+    ["", None, None],
+    ["# Detailed Table Information", None, None],
+    ["Database:", "db", None],
+    ["OwnerType:", "USER", None],
+    ["Owner:", "alice", None],
+    ["Location:", "hdfs://nn:8020/warehouse/db.db/events", None],
+    ["Table Type:", "MANAGED_TABLE", None],
+    ["Table Parameters:", None, None],
+    ["", "comment", "all events"],
+    ["", "numFiles", "3"],
+    ["", "numRows", "42"],
+    ["", "totalSize", "1024"],
+    ["", "transactional", "true"],
+    ["", None, None],
+    ["# Storage Information", None, None],
+    ["SerDe Library:", "org.apache.hadoop.hive.ql.io.orc.OrcSerde", None],
+    ["InputFormat:", "org.apache.hadoop.hive.ql.io.orc.OrcInputFormat", None],
+    ["OutputFormat:", "org.apache.hadoop.hive.ql.io.orc.OrcOutputFormat", None],
+    ["Compressed:", "No", None],
+    ["Storage Desc Params:", None, None],
+    ["", "serialization.format", "1"],
+]
+
+# describe formatted of an Iceberg table partitioned by a transform
+ICEBERG = [
+    ["# col_name", "data_type", "comment"],
+    ["id", "bigint", ""],
+    ["ts", "timestamp", ""],
+    ["", None, None],
+    ["# Partition Transform Information", None, None],
+    ["# col_name", "transform_type", None],
+    ["ts", "DAY", None],
+    ["", None, None],
+    ["# Detailed Table Information", None, None],
+    ["Owner:", "bob", None],
+    ["Table Type:", "EXTERNAL_TABLE", None],
+    ["Table Parameters:", None, None],
+    ["", "table_type", "ICEBERG"],
+]
+
+
+def rows(data):
+    names = ["col_name", "data_type", "comment"]
+    return agate.Table(data, names, [agate.Text(cast_nulls=False)] * 3).rows
+
+
+def test_parse_partitioned_table():
+    describe = parse_describe_formatted(rows(PARTITIONED))
+    assert describe.columns == [
+        DescribedColumn("id", "int", "the id"),
+        DescribedColumn("name", "varchar(10)", None),
+    ]
+    assert describe.partition_columns == [DescribedColumn("dt", "string", "load date")]
+    assert [c.name for c in describe.all_columns] == ["id", "name", "dt"]
+    assert describe.owner == "alice"
+    assert describe.table_type == "MANAGED_TABLE"
+    assert describe.location == "hdfs://nn:8020/warehouse/db.db/events"
+    assert describe.serde == "org.apache.hadoop.hive.ql.io.orc.OrcSerde"
+    assert describe.input_format.endswith("OrcInputFormat")
+    assert describe.output_format.endswith("OrcOutputFormat")
+    assert describe.table_parameters == {
+        "comment": "all events",
+        "numFiles": "3",
+        "numRows": "42",
+        "totalSize": "1024",
+        "transactional": "true",
+    }
+    assert describe.storage_parameters == {"serialization.format": "1"}
+    assert describe.statistics == TableStats(num_rows=42, total_size=1024, num_files=3)
+
+
+def test_parse_iceberg_partition_transforms():
+    describe = parse_describe_formatted(rows(ICEBERG))
+    assert [c.name for c in describe.all_columns] == ["id", "ts"]
+    assert describe.partition_columns == []
+    assert describe.table_parameters == {"table_type": "ICEBERG"}
+    assert describe.partition_transforms == [DescribedColumn("ts", "DAY")]
+    assert describe.is_iceberg
+
+
+def test_parse_plain_describe():
+    # partition columns are repeated after the data columns
+    describe = parse_describe_formatted(
+        [
+            ("id", "int", ""),
+            ("dt", "string", ""),
+            ("", None, None),
+            ("# Partition Information", None, None),
+            ("# col_name", "data_type", "comment"),
+            ("dt", "string", ""),
+        ]
+    )
+    assert [c.name for c in describe.all_columns] == ["id", "dt"]
+    assert describe.table_parameters is None
+    assert describe.statistics == TableStats()
+
+
+def test_columns_and_properties_share_one_describe(make_adapter):
+    adapter = make_adapter({"describe formatted db.events": rows(PARTITIONED)})
+    relation = HiveRelation.create(schema="db", identifier="events", type="table")
+
+    columns = adapter.get_columns_in_relation(relation)
+    assert [(c.column, c.dtype, c.column_index) for c in columns] == [
+        ("id", "int", 0),
+        ("name", "varchar(10)", 1),
+        ("dt", "string", 2),
+    ]
+    assert {c.table_owner for c in columns} == {"alice"}
+    assert adapter.get_properties(relation)["transactional"] == "true"
+    assert list(adapter._get_columns_for_catalog(relation))[0]["table_comment"] == "all events"
+    assert adapter.executed == [
+        GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+        "describe formatted db.events",
+    ]
+
+
+def test_properties_without_describe_parameters(make_adapter):
+    plain = [("id", "int", ""), ("", None, None)]
+    adapter = make_adapter(
+        {
+            "describe formatted db.events": plain,
+            "show tblproperties db.events": [("transactional", "true"), ("numRows", "42")],
+        }
+    )
+    relation = HiveRelation.create(schema="db", identifier="events", type="table")
+
+    assert adapter.get_properties(relation) == {"transactional": "true", "numRows": "42"}
+    assert adapter.get_properties(relation)["numRows"] == "42"
+    assert adapter.executed == [
+        GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+        "describe formatted db.events",
+        FETCH_TBL_PROPERTIES_SQL_MACRO_NAME,
+        "show tblproperties db.events",
+    ]
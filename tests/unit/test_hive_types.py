@@ -0,0 +1,110 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from dbt.adapters.hive.column import HiveColumn
+from dbt.adapters.hive.hive_types import STRING_LENGTH, parse_hive_type
+from dbt.adapters.hive.relation import HiveRelation
+
+
+@pytest.mark.parametrize(
+    "text,canonical",
+    [
+        ("INT", "int"),
+        ("integer", "int"),
+        ("decimal(18, 2)", "decimal(18,2)"),
+        ("double precision", "double"),
+        ("timestamp with local time zone", "timestamp with local time zone"),
+        ("array<struct<Id:int, `name`:varchar(10)>>", "array<struct<id:int,name:varchar(10)>>"),
+        ("map<string,array<bigint>>", "map<string,array<bigint>>"),
+        ("uniontype<int,string>", "uniontype<int,string>"),
+        ("not a type (", "not a type ("),
+    ],
+)
+def test_canonical_spelling(text, canonical):
+    assert parse_hive_type(text).text == canonical
+
+
+def test_types_are_interned():
+    assert parse_hive_type("DECIMAL(18,2)") is parse_hive_type("decimal(18, 2)")
+    struct = parse_hive_type("struct<a:int,b:map<string,int>>")
+    assert struct.field_names == ("a", "b")
+    assert struct.children[0] is parse_hive_type("int")
+    assert struct.children[1].children == (parse_hive_type("string"), parse_hive_type("int"))
+    assert struct.is_complex
+
+
+def test_predicates_and_sizes():
+    assert parse_hive_type("varchar(20)").length == 20
+    assert parse_hive_type("string").length == STRING_LENGTH
+    decimal = parse_hive_type("decimal")
+    assert (decimal.precision, decimal.scale) == (10, 0)
+    assert parse_hive_type("decimal(18,2)").is_numeric
+    assert parse_hive_type("double").is_float
+    assert parse_hive_type("tinyint").is_integer
+    assert not parse_hive_type("array<int>").is_integer
+
+
+@pytest.mark.parametrize(
+    "from_type,to_type,widens",
+    [
+        ("varchar(10)", "varchar(20)", True),
+        ("varchar(20)", "varchar(10)", False),
+        ("char(5)", "string", True),
+        ("varchar(10)", "char(20)", False),
+        ("string", "varchar(100)", False),
+        ("int", "bigint", True),
+        ("bigint", "int", False),
+        ("float", "double", True),
+        ("int", "double", False),
+        ("decimal(10,2)", "decimal(12,2)", True),
+        ("decimal(10,2)", "decimal(11,3)", True),
+        ("decimal(10,2)", "decimal(12,0)", False),
+        ("decimal(10,2)", "decimal(10,2)", False),
+        ("array<int>", "array<bigint>", False),
+    ],
+)
+def test_can_widen_to(from_type, to_type, widens):
+    assert parse_hive_type(from_type).can_widen_to(parse_hive_type(to_type)) is widens
+
+
+def test_hive_column():
+    column = HiveColumn("name", "VARCHAR(10)")
+    assert column.is_string()
+    assert column.string_size() == 10
+    assert column.expanded_data_type == "varchar(10)"
+    assert column.can_expand_to(HiveColumn("name", "string"))
+    assert HiveColumn.string_type(20) == "varchar(20)"
+    assert HiveColumn.string_type(STRING_LENGTH) == "string"
+    assert HiveColumn("amount", "number").is_numeric()
+    assert not HiveColumn("id", "bigint").is_numeric()
+
+
+def test_expand_column_types(make_adapter):
+    adapter = make_adapter()
+    goal = HiveRelation.create(schema="db", identifier="tmp")
+    current = HiveRelation.create(schema="db", identifier="target")
+    columns = {
+        "tmp": [("id", "bigint"), ("name", "varchar(20)"), ("amount", "decimal(10,2)")],
+        "target": [("id", "int"), ("name", "varchar(30)"), ("amount", "decimal(9,2)")],
+    }
+    adapter.get_columns_in_relation = lambda relation: [
+        HiveColumn(name, dtype) for name, dtype in columns[relation.identifier]
+    ]
+    altered = []
+    adapter.alter_column_type = lambda relation, name, new_type: altered.append((name, new_type))
+
+    adapter.expand_column_types(goal, current)
+    assert altered == [("`id`", "bigint"), ("`amount`", "decimal(10,2)")]
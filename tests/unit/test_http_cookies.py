@@ -0,0 +1,90 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import http.client
+from types import SimpleNamespace
+
+from impala._thrift_api import ThriftClient, get_http_transport
+from thrift.protocol.TBinaryProtocol import TBinaryProtocolAccelerated
+
+from dbt.adapters.hive.http_cookies import SharedHttpCookies, _find_http_client
+
+
+def http_connection():
+    """An impyla connection over HTTP, no request is sent until a session opens"""
+    transport = get_http_transport(
+        "localhost",
+        10001,
+        "cliservice",
+        auth_mechanism="LDAP",
+        user="dbt",
+        password="secret",
+        http_cookie_names="*",
+    )
+    client = ThriftClient(TBinaryProtocolAccelerated(transport))
+    return SimpleNamespace(service=SimpleNamespace(client=client))
+
+
+def receive(client, *set_cookies):
+    """Simulate a response of HiveServer2 with the given Set-Cookie headers"""
+    headers = http.client.HTTPMessage()
+    for cookie in set_cookies:
+        headers["Set-Cookie"] = cookie
+    client.headers = headers
+    client.extractHttpCookiesFromResponse()
+
+
+class TestSharedHttpCookies:
+    def test_second_connection_reuses_auth_cookie(self):
+        jar = SharedHttpCookies("test-reuse")
+        first, second = http_connection(), http_connection()
+        assert jar.attach(first) and jar.attach(second)
+        first_client, second_client = _find_http_client(first), _find_http_client(second)
+
+        # nothing to share before the first login
+        assert first_client.getHttpCookieHeaderForRequest() == (None, False)
+        receive(first_client, "hive.server2.auth=token1; Path=/; Max-Age=86400; HttpOnly")
+
+        header, has_auth_cookie = second_client.getHttpCookieHeaderForRequest()
+        assert header == "hive.server2.auth=token1"
+        assert has_auth_cookie
+        assert (jar.stats.issued, jar.stats.reused, jar.stats.rejected) == (1, 1, 0)
+
+    def test_expired_cookie_is_dropped(self):
+        jar = SharedHttpCookies("test-expired")
+        first, second = http_connection(), http_connection()
+        jar.attach(first)
+        jar.attach(second)
+        receive(_find_http_client(first), "hive.server2.auth=token1; Path=/")
+
+        client = _find_http_client(second)
+        client.getHttpCookieHeaderForRequest()
+        # impyla retries a 401 without cookies when cookies were sent
+        assert client.areHttpCookiesSaved()
+        client.cleanHttpCookies()
+
+        assert jar.cookie_header() is None
+        assert client.getHttpCookieHeaderForRequest() == (None, False)
+        assert jar.stats.rejected == 1
+
+    def test_ignores_non_auth_cookies(self):
+        jar = SharedHttpCookies("test-non-auth")
+        connection = http_connection()
+        jar.attach(connection)
+        receive(_find_http_client(connection), "JSESSIONID=abc; Path=/")
+
+        assert jar.cookie_header() is None
+
+    def test_binary_transport_is_left_alone(self):
+        assert not SharedHttpCookies("test-binary").attach(SimpleNamespace())
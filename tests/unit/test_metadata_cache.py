@@ -0,0 +1,257 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dbt.adapters.hive.impl import LIST_SCHEMAS_LIKE_MACRO_NAME
+from dbt.adapters.hive.metadata_cache import (
+    COLUMNS,
+    PROPERTIES,
+    RELATIONS,
+    SCHEMA_EXISTS,
+    SCHEMAS,
+    MetadataCache,
+)
+from dbt.adapters.hive.sql_splitter import split_sql_statements
+
+
+class Loader:
+    def __init__(self, value="loaded"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def populated_cache():
+    cache = MetadataCache()
+    for kind, key in [
+        (COLUMNS, "db.t"),
+        (PROPERTIES, "db.t"),
+        (COLUMNS, "db.other"),
+        (RELATIONS, "db"),
+        (COLUMNS, "other_db.t"),
+        (SCHEMAS, ""),
+    ]:
+        cache.get_or_load(kind, key, Loader())
+    return cache
+
+
+def cached(cache):
+    return set(cache._entries)
+
+
+def run(cache, sql):
+    for statement in split_sql_statements(sql):
+        cache.invalidate_for_statement(statement)
+
+
+class TestMetadataCache:
+    def test_hit(self):
+        cache = MetadataCache()
+        loader = Loader()
+
+        assert cache.get_or_load(COLUMNS, "db.t", loader) == "loaded"
+        assert cache.get_or_load(COLUMNS, "db.t", loader) == "loaded"
+        assert loader.calls == 1
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_uncacheable_key(self):
+        cache = MetadataCache()
+        loader = Loader()
+        cache.get_or_load(COLUMNS, None, loader)
+        cache.get_or_load(COLUMNS, None, loader)
+
+        assert loader.calls == 2
+
+    def test_errors_are_not_cached(self):
+        cache = MetadataCache()
+
+        def fail():
+            raise RuntimeError("metastore unavailable")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_load(COLUMNS, "db.t", fail)
+        assert cache.get_or_load(COLUMNS, "db.t", Loader()) == "loaded"
+
+    def test_concurrent_requests_share_one_query(self):
+        cache = MetadataCache()
+        release = threading.Event()
+        calls = []
+
+        def slow_load():
+            calls.append(1)
+            release.wait(5)
+            return "columns"
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [
+                pool.submit(cache.get_or_load, COLUMNS, "db.t", slow_load) for _ in range(8)
+            ]
+            while cache.stats.misses + cache.stats.coalesced < 8:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+
+        assert results == ["columns"] * 8
+        assert len(calls) == 1
+        assert cache.stats.coalesced == 7
+
+    def test_load_racing_an_invalidation_is_not_stored(self):
+        cache = MetadataCache()
+
+        def load():
+            run(cache, "alter table db.t add columns (c int)")
+            return "stale"
+
+        assert cache.get_or_load(COLUMNS, "db.t", load) == "stale"
+        assert cached(cache) == set()
+
+
+class TestInvalidation:
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "insert overwrite table db.t select 1",
+            "insert into db.t values (1)",
+            "alter table `db`.`t` set tblproperties ('a'='b')",
+            "analyze table db.t compute statistics",
+            "with s as (select 1) insert into db.t select * from s",
+            "from db.s insert overwrite table db.t partition (dt='a') select id where dt = 'a'",
+        ],
+    )
+    def test_relation_entries(self, sql):
+        cache = populated_cache()
+        run(cache, sql)
+
+        assert cached(cache) == cached(populated_cache()) - {
+            (COLUMNS, "db.t"),
+            (PROPERTIES, "db.t"),
+        }
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "create table db.t stored as orc as select 1",
+            "drop table if exists db.t",
+            "create or replace view db.t as select 1",
+        ],
+    )
+    def test_relation_and_listing(self, sql):
+        cache = populated_cache()
+        run(cache, sql)
+
+        assert cached(cache) == cached(populated_cache()) - {
+            (COLUMNS, "db.t"),
+            (PROPERTIES, "db.t"),
+            (RELATIONS, "db"),
+        }
+
+    def test_rename(self):
+        cache = populated_cache()
+        run(cache, "alter table db.t rename to other_db.t")
+
+        assert cached(cache) == {(COLUMNS, "db.other"), (SCHEMAS, "")}
+
+    def test_drop_schema(self):
+        cache = populated_cache()
+        run(cache, "drop database if exists db cascade")
+
+        assert cached(cache) == {(COLUMNS, "other_db.t")}
+
+    @pytest.mark.parametrize(
+        "sql", ["describe formatted db.t", "select * from db.t", "set a=b", "grant select on db.t"]
+    )
+    def test_read_only(self, sql):
+        cache = populated_cache()
+        run(cache, sql)
+
+        assert cached(cache) == cached(populated_cache())
+
+    @pytest.mark.parametrize(
+        "sql",
+        ["drop table t", "msck repair table db.t", "from db.s insert into table t select *"],
+    )
+    def test_unknown_target_clears_everything(self, sql):
+        cache = populated_cache()
+        run(cache, sql)
+
+        assert cached(cache) == set()
+
+
+@pytest.fixture
+def schema_adapter(make_adapter):
+    def make(databases):
+        def list_schemas_like(schema):
+            return [(db,) for db in databases if db.lower() == schema.lower()]
+
+        return make_adapter({LIST_SCHEMAS_LIKE_MACRO_NAME: list_schemas_like})
+
+    return make
+
+
+def checked_schemas(adapter):
+    return [kwargs["schema"] for kwargs in adapter.executed_kwargs]
+
+
+class TestSchemaExists:
+    def test_put_wins_over_a_running_load(self):
+        cache = MetadataCache()
+
+        def load():
+            cache.put(SCHEMA_EXISTS, "db", True)
+            return False
+
+        assert cache.get_or_load(SCHEMA_EXISTS, "db", load) is False
+        assert cache.lookup(SCHEMA_EXISTS, "db") is True
+        assert cache.lookup(SCHEMA_EXISTS, "missing", "default") == "default"
+
+    def test_schema_ddl_forgets_existence(self):
+        cache = MetadataCache()
+        cache.put(SCHEMA_EXISTS, "db", False)
+        run(cache, "create schema if not exists db")
+
+        assert cache.lookup(SCHEMA_EXISTS, "db") is None
+
+    def test_checked_once_per_schema(self, schema_adapter):
+        adapter = schema_adapter(["default", "Analytics"])
+
+        assert adapter.check_schema_exists(None, "analytics")
+        assert adapter.check_schema_exists(None, "ANALYTICS")
+        assert not adapter.check_schema_exists(None, "staging")
+        assert not adapter.check_schema_exists(None, "staging")
+        assert checked_schemas(adapter) == ["analytics", "staging"]
+
+    def test_answered_from_the_schema_listing(self, schema_adapter):
+        adapter = schema_adapter([])
+        adapter.metadata_cache.put(SCHEMAS, "", ["default", "analytics"])
+
+        assert adapter.check_schema_exists(None, "Analytics")
+        assert not adapter.check_schema_exists(None, "staging")
+        assert adapter.executed == []
+
+    def test_create_and_drop_schema(self, schema_adapter):
+        adapter = schema_adapter([])
+        assert not adapter.check_schema_exists(None, "staging")
+
+        adapter.set_schema_exists("staging", True)
+        assert adapter.check_schema_exists(None, "staging")
+        adapter.set_schema_exists("staging", False)
+        assert not adapter.check_schema_exists(None, "staging")
+        assert len(adapter.executed) == 1
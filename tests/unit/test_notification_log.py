@@ -0,0 +1,178 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from dbt.adapters.hive.impl import LIST_SCHEMAS_LIKE_MACRO_NAME
+from dbt.adapters.hive.metadata_cache import (
+    COLUMNS,
+    RELATIONS,
+    SCHEMA_EXISTS,
+    MetadataCache,
+)
+from dbt.adapters.hive.notification_log import (
+    MetastoreEvent,
+    MetastoreEventSource,
+    NotificationLogFollower,
+    event_from_row,
+)
+from dbt.adapters.hive.relation import HiveRelation, HiveRelationType
+
+
+class FakeEventSource(MetastoreEventSource):
+    def __init__(self):
+        self.events = []
+        self.queries = 0
+
+    def emit(self, event_type, db_name=None, tbl_name=None, table_type=None, event_id=None):
+        message = json.dumps({"tableType": table_type}) if table_type else None
+        event_id = event_id or (self.events[-1].event_id + 1 if self.events else 1)
+        self.events.append(MetastoreEvent(event_id, event_type, db_name, tbl_name, message))
+
+    def last_event_id(self):
+        self.queries += 1
+        return self.events[-1].event_id if self.events else 0
+
+    def events_after(self, event_id, limit):
+        self.queries += 1
+        return [e for e in self.events if e.event_id > event_id][:limit]
+
+
+def relation(identifier, type=HiveRelationType.Table):
+    return HiveRelation.create(schema="db", identifier=identifier, type=type)
+
+
+def follower_with_listing(*identifiers):
+    cache = MetadataCache()
+    cache.get_or_load(RELATIONS, "db", lambda: [relation(i) for i in identifiers])
+    for identifier in identifiers:
+        cache.get_or_load(COLUMNS, f"db.{identifier}", lambda: "described")
+    source = FakeEventSource()
+    follower = NotificationLogFollower(cache, poll_interval=0, source=source)
+    follower.relation_factory = lambda schema, identifier, table_type: relation(
+        identifier, HiveRelationType.View if table_type == "VIRTUAL_VIEW" else "table"
+    )
+    follower.poll()
+    return follower, source, cache
+
+
+def listing(cache):
+    return [(r.identifier, r.type) for r in cache.lookup(RELATIONS, "db")]
+
+
+def test_event_from_row():
+    event = event_from_row((12, "create_table", "DB", "Events", '{"tableType":"MANAGED_TABLE"}'))
+    assert event == MetastoreEvent(12, "CREATE_TABLE", "db", "events", event.message)
+    assert event.table_type == "MANAGED_TABLE"
+    # gzip(json-2.0) messages are not decoded
+    assert MetastoreEvent(1, "CREATE_TABLE", message="H4sIAAAA").table_type is None
+
+
+def test_create_and_drop_are_applied_to_the_listing():
+    follower, source, cache = follower_with_listing("events", "users")
+    source.emit("CREATE_TABLE", "db", "daily", "VIRTUAL_VIEW")
+    source.emit("DROP_TABLE", "db", "users")
+    source.emit("OPEN_TXNS")
+
+    assert follower.poll() == 3
+    assert listing(cache) == [("events", "table"), ("daily", "view")]
+    assert cache.lookup(COLUMNS, "db.users") is None
+    assert cache.lookup(COLUMNS, "db.events") == "described"
+    assert follower.last_event_id == 3
+
+
+def test_alter_and_writes_forget_the_description():
+    follower, source, cache = follower_with_listing("events", "users")
+    source.emit("ALTER_TABLE", "db", "events")
+    source.emit("ADD_PARTITION", "db", "users")
+    follower.poll()
+
+    assert listing(cache) == [("events", "table"), ("users", "table")]
+    assert cache.lookup(COLUMNS, "db.events") is None
+    assert cache.lookup(COLUMNS, "db.users") is None
+
+
+def test_rename_forgets_the_schema():
+    follower, source, cache = follower_with_listing("events")
+    source.emit("ALTER_TABLE", "db", "renamed_events")
+    follower.poll()
+
+    assert cache.lookup(RELATIONS, "db") is None
+    assert cache.lookup(COLUMNS, "db.events") is None
+
+
+def test_create_without_table_type_forgets_the_listing():
+    follower, source, cache = follower_with_listing("events")
+    source.emit("CREATE_TABLE", "db", "daily")
+    follower.poll()
+
+    assert cache.lookup(RELATIONS, "db") is None
+
+
+def test_databases():
+    follower, source, cache = follower_with_listing("events")
+    source.emit("CREATE_DATABASE", "staging")
+    source.emit("DROP_DATABASE", "db")
+    follower.poll()
+
+    assert cache.lookup(SCHEMA_EXISTS, "staging") is True
+    assert cache.lookup(SCHEMA_EXISTS, "db") is False
+    assert cache.lookup(RELATIONS, "db") is None
+
+
+def test_purged_events_clear_the_cache():
+    follower, source, cache = follower_with_listing("events")
+    source.emit("ALTER_TABLE", "other_db", "t", event_id=10)
+    follower.poll()
+
+    assert cache.lookup(RELATIONS, "db") is None
+    assert follower.last_event_id == 10
+
+
+def test_poll_interval():
+    now = [0.0]
+    source = FakeEventSource()
+    follower = NotificationLogFollower(MetadataCache(), 10, source, clock=lambda: now[0])
+    follower.poll()
+    follower.poll()
+    assert source.queries == 1
+    now[0] = 11.0
+    follower.poll()
+    assert source.queries == 2
+
+
+def test_unreadable_log_disables_following():
+    class Failing(MetastoreEventSource):
+        def last_event_id(self):
+            raise RuntimeError("Table not found 'notification_log'")
+
+        def events_after(self, event_id, limit):
+            raise RuntimeError("Table not found 'notification_log'")
+
+    follower = NotificationLogFollower(MetadataCache(), 0, Failing())
+    assert follower.poll() == 0
+    assert not follower.enabled
+
+
+def test_adapter_sees_schemas_created_outside_of_dbt(make_adapter):
+    adapter = make_adapter({LIST_SCHEMAS_LIKE_MACRO_NAME: []})
+    source = FakeEventSource()
+    adapter.connections.notification_log = NotificationLogFollower(
+        adapter.metadata_cache, 0, source
+    )
+
+    assert not adapter.check_schema_exists(None, "staging")
+    source.emit("CREATE_DATABASE", "staging")
+    assert adapter.check_schema_exists(None, "staging")
+    assert adapter.executed == [LIST_SCHEMAS_LIKE_MACRO_NAME]
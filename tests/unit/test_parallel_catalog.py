@@ -0,0 +1,169 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+from dbt_common.context import set_invocation_context
+
+from dbt.adapters.hive.impl import CATALOG_CHUNKS_PER_THREAD
+from dbt.adapters.hive.relation import HiveRelation
+
+SCHEMAS = {"small": 3, "big": 40}
+
+InformationSchema = namedtuple("InformationSchema", "database")
+
+
+@pytest.fixture(autouse=True)
+def invocation_context():
+    # dbt sets it up at the start of every command, the thread pool copies it
+    set_invocation_context({})
+
+
+@pytest.fixture
+def catalog_adapter(make_adapter):
+    return lambda **kwargs: with_catalog(make_adapter(), **kwargs)
+
+
+def with_catalog(adapter, threads=4, single_threaded=False, failing=()):
+    adapter.config.threads = threads
+    adapter.config.args = SimpleNamespace(single_threaded=single_threaded)
+    adapter.threads_used = set()
+    adapter.connections_opened = []
+
+    @contextmanager
+    def connection_named(name):
+        adapter.connections_opened.append(name)
+        yield
+
+    def list_relations(database, schema):
+        return [
+            HiveRelation.create(schema=schema, identifier=f"t{i:02d}", type="table")
+            for i in range(SCHEMAS[schema])
+        ]
+
+    def get_columns_for_catalog(relation):
+        adapter.threads_used.add(threading.get_ident())
+        time.sleep(random.uniform(0, 0.005))
+        if (relation.schema, relation.identifier) in failing:
+            raise RuntimeError(f"cannot describe {relation}")
+        for index in range(2):
+            yield {
+                "table_schema": relation.schema,
+                "table_name": relation.identifier,
+                "table_type": "table",
+                "table_owner": "alice",
+                "column_index": index,
+                "column_name": f"c{index}",
+                "column_type": "int",
+                "table_database": None,
+                "column_comment": None,
+                "table_comment": None,
+            }
+
+    adapter.connection_named = connection_named
+    adapter.list_relations = list_relations
+    adapter._get_columns_for_catalog = get_columns_for_catalog
+    adapter._get_catalog_schemas = lambda _: {InformationSchema(None): set(SCHEMAS)}
+    return adapter
+
+
+def catalog_rows(catalog):
+    return [(r["table_schema"], r["table_name"], r["column_name"]) for r in catalog.rows]
+
+
+def expected_rows():
+    return [
+        (schema, f"t{i:02d}", f"c{c}")
+        for schema in sorted(SCHEMAS)
+        for i in range(SCHEMAS[schema])
+        for c in range(2)
+    ]
+
+
+def test_relations_of_a_schema_are_split_across_threads(catalog_adapter):
+    adapter = catalog_adapter(threads=4)
+    catalog, exceptions = adapter.get_catalog([], frozenset())
+    assert exceptions == []
+    assert catalog_rows(catalog) == expected_rows()
+    assert len(adapter.threads_used) > 1
+
+
+@pytest.mark.parametrize("threads", [1, 3, 8])
+def test_merge_is_deterministic(catalog_adapter, threads):
+    adapter = catalog_adapter(threads=threads)
+    for _ in range(3):
+        catalog, _ = adapter.get_catalog([], frozenset())
+        assert catalog_rows(catalog) == expected_rows()
+
+
+def test_single_threaded(catalog_adapter):
+    adapter = catalog_adapter(single_threaded=True)
+    catalog, exceptions = adapter.get_catalog([], frozenset())
+    assert exceptions == []
+    assert catalog_rows(catalog) == expected_rows()
+
+
+def test_split_catalog_relations(catalog_adapter):
+    adapter = catalog_adapter(threads=2)
+    relations = list(range(40))
+    chunks = adapter._split_catalog_relations(relations)
+    assert len(chunks) == 2 * CATALOG_CHUNKS_PER_THREAD
+    assert [r for chunk in chunks for r in chunk] == relations
+    assert adapter._split_catalog_relations([1]) == [[1]]
+    assert adapter._split_catalog_relations([]) == []
+
+
+def test_failing_relation_drops_its_schema_only(catalog_adapter, monkeypatch):
+    monkeypatch.setattr("dbt.adapters.hive.impl.warn_or_error", lambda event: None)
+    SCHEMAS["broken"] = 2
+    try:
+        adapter = catalog_adapter(failing=(("broken", "t01"),))
+        catalog, exceptions = adapter.get_catalog([], frozenset())
+    finally:
+        del SCHEMAS["broken"]
+    assert len(exceptions) == 1
+    assert catalog_rows(catalog) == expected_rows()
+
+
+def test_slow_plan_does_not_hold_back_later_schemas(catalog_adapter):
+    adapter = catalog_adapter(threads=4)
+    small_described = threading.Event()
+    list_relations, get_columns_for_catalog = (
+        adapter.list_relations,
+        adapter._get_columns_for_catalog,
+    )
+
+    def slow_list_relations(database, schema):
+        # "big" is planned first, its listing waits for "small" to be described
+        if schema == "big":
+            adapter.waited = small_described.wait(timeout=5)
+        return list_relations(database, schema)
+
+    def described(relation):
+        if relation.schema == "small":
+            small_described.set()
+        return get_columns_for_catalog(relation)
+
+    adapter.list_relations = slow_list_relations
+    adapter._get_columns_for_catalog = described
+    catalog, exceptions = adapter.get_catalog([], frozenset())
+    assert adapter.waited
+    assert exceptions == []
+    assert catalog_rows(catalog) == expected_rows()
@@ -0,0 +1,167 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import agate
+
+from dbt.adapters.hive.connections import (
+    HiveAdapterResponse,
+    HiveConnectionManager,
+    HiveConnectionWrapper,
+)
+from dbt.adapters.hive.describe import DescribedColumn, DescribeResult
+from dbt.adapters.hive.metadata_cache import MetadataCache
+from dbt.adapters.hive.partition_overwrite import (
+    PARTITION_VALUES_MACRO_NAME,
+    dynamic_partition_configuration,
+    insert_overwrite_sql,
+    static_prefix_length,
+)
+from dbt.adapters.hive.relation import HiveRelation
+from dbt.adapters.hive.sql_splitter import split_sql_statements
+
+
+def overwrite(partitions, max_static_partitions=16):
+    return insert_overwrite_sql(
+        "db.t", "db.t__dbt_tmp", ["`id`"], ["`year`", "`month`"], partitions, max_static_partitions
+    )
+
+
+def test_static_prefix_length():
+    assert static_prefix_length([]) == 0
+    assert static_prefix_length([("2024", "01"), ("2024", "02")]) == 1
+    assert static_prefix_length([("2024", "01")]) == 2
+    assert static_prefix_length([(None, "01")]) == 0
+    assert static_prefix_length([("2023", "12"), ("2024", "12")]) == 0
+
+
+def test_single_partition_is_static():
+    assert overwrite([("2024", "01")]) == (
+        "insert overwrite table db.t\n"
+        "partition (`year`='2024', `month`='01')\n"
+        "select `id` from db.t__dbt_tmp"
+    )
+
+
+def test_few_partitions_are_written_by_one_multi_insert():
+    sql = overwrite([("2024", "01"), ("2024", "it's")])
+    assert sql.startswith("from db.t__dbt_tmp\ninsert overwrite table db.t\n")
+    assert "partition (`year`='2024', `month`='01')\nselect `id` where " in sql
+    assert "cast(`month` as string) = 'it\\'s'" in sql
+    assert len(split_sql_statements(sql)) == 1
+
+
+def test_partially_static():
+    sql = overwrite([("2024", "01"), ("2024", "02"), ("2024", "03")], max_static_partitions=2)
+    assert sql == (
+        "insert overwrite table db.t\n"
+        "partition (`year`='2024', `month`)\n"
+        "select `id`, `month` from db.t__dbt_tmp"
+    )
+
+
+def test_dynamic_partition_limits_are_raised():
+    partitions = [(str(year), str(month)) for year in range(2000, 2100) for month in range(1, 13)]
+    statements = split_sql_statements(overwrite(partitions))
+    assert len(statements) == 1
+    assert "partition (`year`, `month`)\nselect `id`, `year`, `month` from" in statements[0].code
+    assert dynamic_partition_configuration(1200) == {
+        "hive.exec.max.dynamic.partitions": "1200",
+        "hive.exec.max.dynamic.partitions.pernode": "1200",
+    }
+    assert dynamic_partition_configuration(200) == {
+        "hive.exec.max.dynamic.partitions.pernode": "200"
+    }
+    assert dynamic_partition_configuration(16) == {}
+
+
+def test_default_partition_is_dynamic():
+    sql = overwrite([("2024", None)])
+    assert "partition (`year`='2024', `month`)" in sql
+
+
+def test_partition_overwrite_sql(make_adapter):
+    adapter = make_adapter(
+        {
+            PARTITION_VALUES_MACRO_NAME: agate.Table(
+                [["2024-01-01"], ["2024-01-02"]], ["dt"], [agate.Text()]
+            )
+        },
+        describe_relation=lambda relation: DescribeResult(
+            columns=[DescribedColumn("id", "int"), DescribedColumn("dt", "string")],
+            partition_columns=[DescribedColumn("dt", "string")],
+        ),
+    )
+    target = HiveRelation.create(schema="db", identifier="t")
+    source = HiveRelation.create(schema="db", identifier="t__dbt_tmp")
+
+    sql = adapter.partition_overwrite_sql(source, target)
+    assert adapter.executed == [PARTITION_VALUES_MACRO_NAME]
+    assert adapter.executed_kwargs[0]["partition_columns"] == ["`dt`"]
+    assert "partition (`dt`='2024-01-02')\nselect `id` where" in sql
+
+    response = HiveAdapterResponse(_message="OK")
+    adapter.record_partition_overwrite(target, response)
+    assert response.partitions_overwritten == 2
+    # reported once
+    next_response = HiveAdapterResponse(_message="OK")
+    adapter.record_partition_overwrite(target, next_response)
+    assert next_response.partitions_overwritten is None
+
+
+def test_unpartitioned_target(make_adapter):
+    adapter = make_adapter(
+        describe_relation=lambda relation: DescribeResult(columns=[DescribedColumn("id", "int")])
+    )
+    target = HiveRelation.create(schema="db", identifier="t")
+    assert adapter.partition_overwrite_sql(target, target) is None
+
+
+def test_dynamic_partition_limits_apply_to_the_next_query_only(make_adapter):
+    executed = []
+    cursor = SimpleNamespace(
+        execute=lambda sql, bindings, configuration: executed.append((sql, configuration))
+    )
+    wrapper = HiveConnectionWrapper(handle=SimpleNamespace(close=lambda: None))
+    wrapper._cursor = cursor
+    credentials = SimpleNamespace(
+        query_retries=0, query_metrics_file=None, query_metrics_prometheus_file=None
+    )
+    connection = SimpleNamespace(
+        credentials=credentials,
+        handle=SimpleNamespace(cursor=lambda: wrapper),
+        transaction_open=True,
+        name="test",
+    )
+    manager = HiveConnectionManager.__new__(HiveConnectionManager)
+    manager.query_header = None
+    manager.metadata_cache = MetadataCache()
+    manager._next_query_configuration = {}
+    manager.get_thread_connection = lambda: connection
+
+    adapter = make_adapter(connections=manager)
+    adapter._partition_overwrite_configuration = {"db.t": dynamic_partition_configuration(200)}
+    adapter.configure_partition_overwrite(HiveRelation.create(schema="db", identifier="t"))
+
+    manager.add_query("insert overwrite table db.t partition (dt) select * from db.s")
+    manager.add_query("select 1")
+    assert executed[0][1] == {
+        "hive.exec.max.dynamic.partitions.pernode": "200",
+        "paramstyle": "format",
+    }
+    assert executed[1][1] == {"paramstyle": "format"}
+    # nothing is left on the session
+    assert wrapper.session_settings == []
+    assert wrapper.is_reusable()
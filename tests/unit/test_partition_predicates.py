@@ -0,0 +1,115 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from decimal import Decimal
+
+import agate
+
+from dbt.adapters.hive.describe import DescribedColumn, DescribeResult
+from dbt.adapters.hive.partition_overwrite import PARTITION_VALUES_MACRO_NAME
+from dbt.adapters.hive.partition_predicates import (
+    COLUMN_RANGES_MACRO_NAME,
+    MAX_IN_LIST_VALUES,
+    pruning_columns,
+    range_predicates,
+    value_predicates,
+)
+from dbt.adapters.hive.relation import HiveRelation
+
+ICEBERG = DescribeResult(
+    columns=[
+        DescribedColumn("id", "bigint"),
+        DescribedColumn("ts", "timestamp"),
+        DescribedColumn("region", "string"),
+    ],
+    partition_transforms=[
+        DescribedColumn("region", "IDENTITY"),
+        DescribedColumn("ts", "DAY"),
+        DescribedColumn("id", "BUCKET[16]"),
+    ],
+    table_parameters={"table_type": "ICEBERG"},
+)
+
+
+def test_pruning_columns():
+    hive = DescribeResult(
+        columns=[DescribedColumn("id", "bigint")],
+        partition_columns=[DescribedColumn("dt", "date"), DescribedColumn("hour", "int")],
+    )
+    assert pruning_columns(hive) == ([("dt", "date"), ("hour", "int")], [])
+    assert pruning_columns(ICEBERG) == ([("region", "string")], [("ts", "timestamp")])
+
+
+def test_value_predicates():
+    columns = [("`dt`", "date"), ("`hour`", "int"), ("`region`", "string")]
+    rows = [("2024-01-02", "10", "eu"), ("2024-01-01", "9", None)]
+    assert value_predicates(columns, rows) == [
+        "DBT_INTERNAL_DEST.`dt` in (cast('2024-01-01' as date), cast('2024-01-02' as date))",
+        # numbers are ordered as numbers
+        "DBT_INTERNAL_DEST.`hour` in (cast('9' as int), cast('10' as int))",
+        "(DBT_INTERNAL_DEST.`region` in ('eu') or DBT_INTERNAL_DEST.`region` is null)",
+    ]
+    assert value_predicates(columns, []) == []
+
+
+def test_too_many_values_become_a_range():
+    rows = [(str(hour),) for hour in range(MAX_IN_LIST_VALUES + 1)]
+    assert value_predicates([("`hour`", "int")], rows) == [
+        f"DBT_INTERNAL_DEST.`hour` between cast('0' as int) and cast('{MAX_IN_LIST_VALUES}' as int)"
+    ]
+
+
+def test_range_predicates():
+    columns = [("`ts`", "timestamp"), ("`code`", "string")]
+    row = ("2024-01-01 00:00:00", "2024-01-03 12:00:00", Decimal(0), None, None, Decimal(4))
+    assert range_predicates(columns, row) == [
+        "DBT_INTERNAL_DEST.`ts` between cast('2024-01-01 00:00:00' as timestamp)"
+        " and cast('2024-01-03 12:00:00' as timestamp)",
+        "DBT_INTERNAL_DEST.`code` is null",
+    ]
+    # an empty source
+    assert range_predicates(columns[:1], (None, None, Decimal(0))) == []
+
+
+def test_merge_partition_predicates(make_adapter):
+    adapter = make_adapter(
+        {
+            PARTITION_VALUES_MACRO_NAME: agate.Table([["eu"], ["us"]], ["region"], [agate.Text()]),
+            COLUMN_RANGES_MACRO_NAME: agate.Table(
+                [["2024-01-01 10:00:00", "2024-01-02 11:00:00", 0]],
+                ["min_1", "max_1", "nulls_1"],
+                [agate.Text(), agate.Text(), agate.Number()],
+            ),
+        },
+        describe_relation=lambda relation: ICEBERG,
+    )
+    source = HiveRelation.create(schema="db", identifier="t__dbt_tmp")
+    target = HiveRelation.create(schema="db", identifier="t")
+
+    assert adapter.merge_partition_predicates(source, target) == [
+        "DBT_INTERNAL_DEST.`region` in ('eu', 'us')",
+        "DBT_INTERNAL_DEST.`ts` between cast('2024-01-01 10:00:00' as timestamp)"
+        " and cast('2024-01-02 11:00:00' as timestamp)",
+    ]
+    assert adapter.executed == [PARTITION_VALUES_MACRO_NAME, COLUMN_RANGES_MACRO_NAME]
+    assert adapter.executed_kwargs[0]["partition_columns"] == ["`region`"]
+    assert adapter.executed_kwargs[1]["columns"] == ["`ts`"]
+
+
+def test_unpartitioned_target(make_adapter):
+    adapter = make_adapter(
+        describe_relation=lambda relation: DescribeResult(columns=[DescribedColumn("id", "int")])
+    )
+    target = HiveRelation.create(schema="db", identifier="t")
+    assert adapter.merge_partition_predicates(target, target) == []
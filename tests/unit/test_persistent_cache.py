@@ -0,0 +1,208 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from types import SimpleNamespace
+
+import agate
+import dbt.exceptions
+import pytest
+
+from dbt.adapters.hive.describe import DescribedColumn, DescribeResult
+from dbt.adapters.hive.impl import GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME
+from dbt.adapters.hive.persistent_cache import (
+    SCHEMA_MARKERS_MACRO_NAME,
+    PersistentRelationCache,
+    parse_schema_markers,
+    relation_cache_key,
+)
+from dbt.adapters.hive.relation import HiveRelation, HiveRelationType
+
+KEY = "alice@hive.example.com:10000"
+
+DESCRIBE_ROWS = [
+    ["# col_name", "data_type", "comment"],
+    ["id", "int", "the id"],
+    ["", None, None],
+    ["# Detailed Table Information", None, None],
+    ["Owner:", "alice", None],
+    ["Table Parameters:", None, None],
+    ["", "numRows", "42"],
+]
+
+
+def markers(*rows):
+    return parse_schema_markers(["db"], rows)
+
+
+def test_parse_schema_markers():
+    assert parse_schema_markers(
+        ["DB", "empty"], [("db", "Events", 7, "1700000000"), ("db", "v", 8, None)]
+    ) == {"db": {"events": [7, "1700000000"], "v": [8, None]}, "empty": {}}
+
+
+def test_listing_valid_until_the_schema_changes(tmp_path):
+    path = str(tmp_path / "relations.json")
+    cache = PersistentRelationCache(path, KEY)
+    cache.set_markers(markers(("db", "events", 7, "1")))
+    cache.record_relations("db", [("events", HiveRelationType.Table)])
+    cache.save()
+
+    unchanged = PersistentRelationCache(path, KEY)
+    unchanged.set_markers(markers(("db", "events", 7, "1")))
+    assert unchanged.relations("DB") == [("events", "table")]
+
+    # written to or altered, the listing still holds
+    written = PersistentRelationCache(path, KEY)
+    written.set_markers(markers(("db", "events", 7, "5")))
+    assert written.relations("db") == [("events", "table")]
+
+    # dropped and created again
+    recreated = PersistentRelationCache(path, KEY)
+    recreated.set_markers(markers(("db", "events", 9, "2")))
+    assert recreated.relations("db") is None
+
+    other_host = PersistentRelationCache(path, "alice@other:10000")
+    other_host.set_markers(markers(("db", "events", 7, "1")))
+    assert other_host.relations("db") is None
+
+
+def test_entries_are_kept_per_user_and_port(tmp_path):
+    def credentials(username, port=10000):
+        return SimpleNamespace(username=username, host="hive.example.com", port=port)
+
+    assert relation_cache_key(credentials("alice")) == KEY
+    path = str(tmp_path / "relations.json")
+    cache = PersistentRelationCache(path, KEY)
+    cache.set_markers(markers(("db", "events", 7, "1")))
+    cache.record_relations("db", [("events", HiveRelationType.Table)])
+    cache.save()
+
+    for other in (credentials("bob"), credentials(None), credentials("alice", 10001)):
+        other_cache = PersistentRelationCache(path, relation_cache_key(other))
+        other_cache.set_markers(markers(("db", "events", 7, "1")))
+        assert other_cache.relations("db") is None
+
+
+def test_listing_disagreeing_with_markers_is_not_kept(tmp_path):
+    cache = PersistentRelationCache(str(tmp_path / "relations.json"), KEY)
+    cache.set_markers(markers(("db", "events", 7, "1")))
+    cache.record_relations("db", [("events", "table"), ("created_meanwhile", "table")])
+
+    assert cache.relations("db") is None
+
+
+def test_describe_kept_per_relation(tmp_path):
+    path = str(tmp_path / "relations.json")
+    describe = DescribeResult(
+        columns=[DescribedColumn("id", "int", "the id")],
+        details={"Owner": "alice"},
+        table_parameters={"numRows": "42"},
+    )
+    cache = PersistentRelationCache(path, KEY)
+    cache.set_markers(markers(("db", "events", 7, "1"), ("db", "users", 8, "1")))
+    cache.record_describe("db", "events", describe)
+    cache.record_describe("db", "users", describe)
+    cache.save()
+
+    # users was altered, events did not change
+    later = PersistentRelationCache(path, KEY)
+    later.set_markers(markers(("db", "events", 7, "1"), ("db", "users", 8, "2")))
+    cached = later.describe("db", "events")
+    assert cached.columns == describe.columns
+    assert cached.owner == "alice"
+    assert cached.statistics.num_rows == 42
+    assert later.describe("db", "users") is None
+
+    later.record_relations("db", [("events", "table"), ("users", "table")])
+    later.save()
+    with open(path) as fp:
+        assert list(json.load(fp)[KEY]["db"]["describes"]) == ["events"]
+
+
+@pytest.fixture
+def cached_adapter(make_adapter):
+    def make(path, marker_rows):
+        def schema_markers(**kwargs):
+            if marker_rows is None:
+                raise dbt.exceptions.DbtRuntimeError("Database 'sys' not found")
+            return marker_rows
+
+        names = ["col_name", "data_type", "comment"]
+        results = {
+            SCHEMA_MARKERS_MACRO_NAME: schema_markers,
+            "describe formatted db.events": agate.Table(
+                DESCRIBE_ROWS, names, [agate.Text(cast_nulls=False)] * 3
+            ).rows,
+            "hive__list_tables_without_caching": [{"tab_name": "events"}],
+            "hive__list_views_without_caching": [],
+        }
+        adapter = make_adapter(results, _use_show_extended_tables=lambda: False)
+        adapter.connections.relation_cache = PersistentRelationCache(path, KEY)
+        return adapter
+
+    return make
+
+
+def run(adapter):
+    schema = HiveRelation.create(schema="db")
+    relations = adapter.list_relations_without_caching(schema)
+    columns = adapter.get_columns_in_relation(relations[0])
+    adapter.connections.relation_cache.save()
+    return [r.name for r in relations], [c.column for c in columns]
+
+
+def test_second_invocation_only_checks_markers(cached_adapter, tmp_path):
+    path = str(tmp_path / "relations.json")
+    rows = [("db", "events", 7, "1")]
+
+    first = cached_adapter(path, rows)
+    assert run(first) == (["events"], ["id"])
+    assert first.executed == [
+        SCHEMA_MARKERS_MACRO_NAME,
+        "hive__list_tables_without_caching",
+        "hive__list_views_without_caching",
+        GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+        "describe formatted db.events",
+    ]
+
+    second = cached_adapter(path, rows)
+    assert run(second) == (["events"], ["id"])
+    assert second.executed == [SCHEMA_MARKERS_MACRO_NAME]
+
+
+def test_without_sys_database(cached_adapter, tmp_path):
+    path = str(tmp_path / "relations.json")
+    adapter = cached_adapter(path, None)
+    assert run(adapter) == (["events"], ["id"])
+    assert adapter.executed.count(SCHEMA_MARKERS_MACRO_NAME) == 1
+    assert not (tmp_path / "relations.json").exists()
+
+
+def test_not_used_after_a_statement_of_the_run(cached_adapter, tmp_path):
+    path = str(tmp_path / "relations.json")
+    rows = [("db", "events", 7, "1")]
+    run(cached_adapter(path, rows))
+
+    adapter = cached_adapter(path, rows)
+    run(adapter)
+    adapter.metadata_cache.invalidate_relation("db", "events", listing=True)
+    run(adapter)
+    assert adapter.executed == [
+        SCHEMA_MARKERS_MACRO_NAME,
+        "hive__list_tables_without_caching",
+        "hive__list_views_without_caching",
+        GET_COLUMNS_IN_RELATION_SQL_MACRO_NAME,
+        "describe formatted db.events",
+    ]
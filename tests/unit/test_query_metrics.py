@@ -0,0 +1,92 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from dbt.adapters.hive.metrics import OperationLogFacts, QueryMetrics, QueryMetricsSink
+from dbt.adapters.hive.sql_splitter import split_sql_statements
+
+OPERATION_LOG = """INFO  : Compiling command(queryId=hive_1): insert into t select 1
+INFO  : Status: Running (Executing on YARN cluster with App id application_1700000000000_0042)
+INFO  :    RECORDS_OUT_1_default.t: 3
+INFO  :    RECORDS_OUT_2_default.u: 4
+"""
+
+
+def kinds(sql):
+    return [statement.kind for statement in split_sql_statements(sql)]
+
+
+class TestStatementKind:
+    def test_kinds(self):
+        sql = (
+            "/* {'node_id': 'model.a'} */ select 1; insert overwrite table t select 1;"
+            "create table t (a int); describe formatted t; set hive.txn.manager; grunt"
+        )
+        assert kinds(sql) == ["query", "dml", "ddl", "metadata", "metadata", "other"]
+
+    def test_comment_only(self):
+        assert kinds("-- nothing to see") == []
+
+
+class TestOperationLogFacts:
+    def test_scan(self):
+        facts = OperationLogFacts()
+        facts.scan(OPERATION_LOG)
+
+        assert facts.application_id == "application_1700000000000_0042"
+        assert facts.records_out == 7
+
+    def test_scan_empty_log(self):
+        facts = OperationLogFacts()
+        facts.scan("")
+
+        assert facts.application_id is None
+        assert facts.records_out is None
+
+
+class TestQueryMetricsSink:
+    def test_writes_jsonl_and_prometheus(self, tmp_path):
+        jsonl = tmp_path / "queries.jsonl"
+        prom = tmp_path / "dbt_hive.prom"
+        sink = QueryMetricsSink(str(jsonl), str(prom))
+
+        sink.record(
+            QueryMetrics(
+                statement_kind="dml",
+                started_at=1.0,
+                elapsed=2.5,
+                node_id="model.test.a",
+                queue_time=0.5,
+                rows_affected=7,
+                application_id="application_1700000000000_0042",
+            )
+        )
+        sink.record(QueryMetrics(statement_kind="metadata", started_at=4.0, elapsed=0.1))
+        sink.record(
+            QueryMetrics(statement_kind="metadata", started_at=5.0, elapsed=0.2, success=False)
+        )
+
+        records = [json.loads(line) for line in jsonl.read_text().splitlines()]
+        assert len(records) == 3
+        assert records[0]["node_id"] == "model.test.a"
+        assert records[0]["rows_affected"] == 7
+        assert records[2]["success"] is False
+
+        exposition = prom.read_text()
+        assert 'dbt_hive_statements_total{kind="metadata"} 2' in exposition
+        assert 'dbt_hive_statement_failures_total{kind="metadata"} 1' in exposition
+        assert 'dbt_hive_statement_seconds_total{kind="dml"} 2.5' in exposition
+        assert 'dbt_hive_yarn_applications_total{kind="dml"} 1' in exposition
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,181 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import pytest
+
+from dbt.adapters.contracts.connection import ConnectionState
+from impala.error import HiveServer2Error, HttpError, OperationalError
+from thrift.transport.TTransport import TTransportException
+
+from dbt.adapters.hive.connections import HiveConnectionManager, HiveConnectionWrapper
+from dbt.adapters.hive.retry import backoff_delay, is_transient_error
+from dbt.adapters.hive.sql_splitter import split_sql_statements
+
+
+class FlakyCursor:
+    """impyla cursor failing the first `failures` statements"""
+
+    def __init__(self, failures=0, error=None):
+        self.failures = failures
+        self.error = error or TTransportException(message="Connection reset by peer")
+        self.executed = []
+
+    def execute(self, sql, bindings=None, configuration=None):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.executed.append(sql)
+
+    def close(self):
+        pass
+
+
+def make_wrapper(failures=0, error=None):
+    wrapper = HiveConnectionWrapper(handle=SimpleNamespace(close=lambda: None))
+    wrapper._cursor = FlakyCursor(failures, error)
+    return wrapper
+
+
+def make_manager(monkeypatch, sessions):
+    """Connection manager whose `open` hands out the given sessions in turn"""
+    manager = HiveConnectionManager.__new__(HiveConnectionManager)
+
+    def open_connection(connection):
+        connection.handle = sessions.pop(0)
+        connection.state = ConnectionState.OPEN
+        return connection
+
+    monkeypatch.setattr(manager, "open", open_connection)
+    monkeypatch.setattr("dbt.adapters.hive.connections.time.sleep", lambda _: None)
+    return manager
+
+
+def make_connection(handle, retries=3):
+    credentials = SimpleNamespace(
+        query_retries=retries, query_retry_backoff=0.01, query_retry_max_backoff=0.1
+    )
+    return SimpleNamespace(
+        credentials=credentials, handle=handle, state=ConnectionState.OPEN, name="test"
+    )
+
+
+def statement(sql):
+    return split_sql_statements(sql)[0]
+
+
+class TestClassification:
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "describe formatted db.t",
+            "select * from db.t",
+            "create table if not exists db.t (id int)",
+            "create or replace view db.v as select 1",
+            "drop table if exists db.t",
+            "insert overwrite table db.t select 1",
+            "from db.s insert overwrite table db.t partition (dt='a') select id",
+        ],
+    )
+    def test_idempotent(self, sql):
+        assert statement(sql).is_idempotent
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "insert into db.t select 1",
+            "with s as (select 1) insert into db.t select * from s",
+            "create table db.t as select 1",
+            "from db.s insert into db.t select id",
+            "drop table db.t",
+            "merge into db.t using db.s on t.id = s.id when matched then delete",
+        ],
+    )
+    def test_not_idempotent(self, sql):
+        assert not statement(sql).is_idempotent
+
+    def test_transient_errors(self):
+        assert is_transient_error(TTransportException(message="reset"))
+        assert is_transient_error(ConnectionResetError())
+        assert is_transient_error(HttpError(503, "Service Unavailable", None, {}))
+        assert is_transient_error(HiveServer2Error("Invalid SessionHandle: abc"))
+        assert not is_transient_error(HttpError(401, "Unauthorized", None, {}))
+        assert not is_transient_error(HiveServer2Error("SemanticException table not found"))
+        assert not is_transient_error(OperationalError("Query was cancelled"))
+
+    def test_backoff_is_capped(self):
+        for attempt in range(1, 10):
+            assert 0 <= backoff_delay(attempt, base=1.0, cap=4.0) <= 4.0
+
+
+class TestExecuteStatement:
+    def test_retries_idempotent_statement_on_new_session(self, monkeypatch):
+        broken = make_wrapper(failures=1)
+        broken.session_settings = ["set hive.exec.dynamic.partition.mode=nonstrict"]
+        fresh = make_wrapper()
+        manager = make_manager(monkeypatch, [fresh])
+        connection = make_connection(broken)
+
+        cursor, retries = manager._execute_statement(
+            connection, broken, statement("insert overwrite table t select 1"), None, {}, None
+        )
+
+        assert retries == 1
+        assert cursor is fresh
+        assert not broken.is_reusable()
+        assert fresh._cursor.executed == [
+            "set hive.exec.dynamic.partition.mode=nonstrict",
+            "insert overwrite table t select 1",
+        ]
+
+    def test_does_not_retry_non_idempotent_statement(self, monkeypatch):
+        broken = make_wrapper(failures=1)
+        manager = make_manager(monkeypatch, [make_wrapper()])
+
+        with pytest.raises(TTransportException):
+            manager._execute_statement(
+                make_connection(broken),
+                broken,
+                statement("insert into t select 1"),
+                None,
+                {},
+                None,
+            )
+
+    def test_does_not_retry_statement_errors(self, monkeypatch):
+        broken = make_wrapper(failures=1, error=HiveServer2Error("ParseException"))
+        manager = make_manager(monkeypatch, [make_wrapper()])
+
+        with pytest.raises(HiveServer2Error):
+            manager._execute_statement(
+                make_connection(broken), broken, statement("select 1"), None, {}, None
+            )
+
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        broken = make_wrapper(failures=1)
+        sessions = [make_wrapper(failures=1), make_wrapper(failures=1)]
+        manager = make_manager(monkeypatch, sessions)
+
+        with pytest.raises(TTransportException):
+            manager._execute_statement(
+                make_connection(broken, retries=2), broken, statement("select 1"), None, {}, None
+            )
+        assert sessions == []
+
+    def test_response_reports_retries(self):
+        wrapper = make_wrapper()
+        wrapper.retries = 2
+
+        assert HiveConnectionManager.get_response(wrapper).retries == 2
@@ -0,0 +1,120 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import agate
+import dbt.exceptions
+import pytest
+
+from dbt.adapters.hive.capabilities import HiveCapabilities
+from dbt.adapters.hive.impl import LIST_EXTENDED_TABLES_MACRO_NAME
+from dbt.adapters.hive.relation import HiveRelation, HiveRelationType
+from dbt.adapters.hive.relation_listing import (
+    merge_tables_and_views,
+    relation_type,
+    typed_relations,
+)
+
+
+def listing(*names):
+    return agate.Table([[name] for name in names], ["tab_name"], [agate.Text()])
+
+
+def extended_listing(*rows):
+    return agate.Table(rows, ["tab_name", "table_type"], [agate.Text(), agate.Text()])
+
+
+@pytest.fixture
+def listing_adapter(make_adapter):
+    def make(results, hive4=False):
+        capabilities = HiveCapabilities(supports_show_extended_tables=hive4)
+        return make_adapter(results, hive_capabilities=lambda: capabilities)
+
+    return make
+
+
+def listed(relations):
+    return [(r.identifier, r.type) for r in relations]
+
+
+def test_merge_tables_and_views():
+    relations = merge_tables_and_views(["a", "v1", "b", "v2"], ["v1", "v2"])
+    assert relations == [
+        ("a", HiveRelationType.Table),
+        ("b", HiveRelationType.Table),
+        ("v1", HiveRelationType.View),
+        ("v2", HiveRelationType.View),
+    ]
+
+
+def test_relation_type():
+    assert relation_type("MANAGED_TABLE") == HiveRelationType.Table
+    assert relation_type("EXTERNAL_TABLE") == HiveRelationType.Table
+    assert relation_type("VIRTUAL_VIEW") == HiveRelationType.View
+    assert relation_type("materialized_view ") == HiveRelationType.MaterializedView
+    assert relation_type(None) == HiveRelationType.Table
+    assert relation_type("INDEX_TABLE") == HiveRelationType.Table
+    assert typed_relations([("t", "MANAGED_TABLE"), ("v", "VIRTUAL_VIEW")]) == [
+        ("t", HiveRelationType.Table),
+        ("v", HiveRelationType.View),
+    ]
+
+
+def test_lists_tables_and_views(listing_adapter):
+    adapter = listing_adapter(
+        {
+            "hive__list_tables_without_caching": listing("t1", "v1", "t2"),
+            "hive__list_views_without_caching": listing("v1"),
+        }
+    )
+    relations = adapter._list_relations(HiveRelation.create(schema="db"))
+    assert listed(relations) == [("t1", "table"), ("t2", "table"), ("v1", "view")]
+    assert all(r.schema == "db" for r in relations)
+
+
+def test_lists_with_show_extended_tables(listing_adapter):
+    adapter = listing_adapter(
+        {
+            LIST_EXTENDED_TABLES_MACRO_NAME: extended_listing(
+                ["t1", "MANAGED_TABLE"], ["v1", "VIRTUAL_VIEW"], ["mv", "MATERIALIZED_VIEW"]
+            ),
+        },
+        hive4=True,
+    )
+    relations = adapter._list_relations(HiveRelation.create(schema="db"))
+    assert listed(relations) == [("t1", "table"), ("v1", "view"), ("mv", "materialized_view")]
+    assert adapter.executed == [LIST_EXTENDED_TABLES_MACRO_NAME]
+
+
+def test_falls_back_when_show_extended_tables_fails(listing_adapter):
+    adapter = listing_adapter(
+        {
+            LIST_EXTENDED_TABLES_MACRO_NAME: dbt.exceptions.DbtRuntimeError("ParseException"),
+            "hive__list_tables_without_caching": listing("t1", "v1"),
+            "hive__list_views_without_caching": listing("v1"),
+        },
+        hive4=True,
+    )
+    schema = HiveRelation.create(schema="db")
+    assert listed(adapter._list_relations(schema)) == [("t1", "table"), ("v1", "view")]
+    # not attempted again for the rest of the run
+    adapter.executed.clear()
+    adapter._list_relations(schema)
+    assert LIST_EXTENDED_TABLES_MACRO_NAME not in adapter.executed
+
+
+def test_missing_schema_lists_nothing(listing_adapter):
+    error = dbt.exceptions.DbtRuntimeError("Database 'db' not found")
+    adapter = listing_adapter({LIST_EXTENDED_TABLES_MACRO_NAME: error}, hive4=True)
+    assert adapter._list_relations(HiveRelation.create(schema="db")) == []
+    assert not adapter._show_extended_tables_failed
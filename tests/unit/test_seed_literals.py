@@ -0,0 +1,81 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+from decimal import Decimal
+
+import agate
+from dbt_common.clients.agate_helper import Integer, ISODateTime, Number
+from impala.interface import _bind_parameters
+
+from dbt.adapters.hive.connections import HiveConnectionWrapper
+from dbt.adapters.hive.literals import format_literal, render_values_batches
+
+COLUMN_TYPES = ["string", "bigint", "double", "boolean", "date", "timestamp", "interval"]
+
+
+def seed_table():
+    rows = [
+        ("plain", 1, Decimal("1.25"), True, datetime.date(2024, 1, 31),
+         datetime.datetime(2024, 1, 31, 12, 30, 45, 123456), datetime.timedelta(hours=1)),
+        ("it's \"quoted\"\\ \n\r", 0, Decimal("0"), False, None, None, None),
+        ("", None, None, None, datetime.date(1970, 1, 1),
+         datetime.datetime(1970, 1, 1), datetime.timedelta(0)),
+        (None, -7, Decimal("-1E+3"), True, None, None, None),
+    ]  # fmt: skip
+    types = [
+        agate.Text(),
+        Integer(),
+        Number(),
+        agate.Boolean(),
+        agate.Date(),
+        ISODateTime(),
+        agate.TimeDelta(),
+    ]
+    names = [f"c{i}" for i in range(len(types))]
+    return agate.Table(rows, names, types, _is_fork=True)
+
+
+def bound_values(agate_table, batch_size):
+    """The literals of the former path: placeholders bound by impyla"""
+    for start in range(0, len(agate_table.rows), batch_size):
+        batch = agate_table.rows[start : start + batch_size]
+        placeholders = ",\n".join(
+            "(" + ",".join(f"cast(%s as {t})" for t in COLUMN_TYPES) + ")" for _ in batch
+        )
+        bindings = [value for row in batch for value in row]
+        # add_query and HiveConnectionWrapper.execute binding cleanup
+        bindings = [x if x else x if x is not None and len(str(x)) > 0 else "" for x in bindings]
+        bindings = [HiveConnectionWrapper._fix_binding(x) for x in bindings]
+        yield _bind_parameters(placeholders, bindings, "format")
+
+
+class TestSeedLiterals:
+    def test_matches_bound_parameters(self):
+        agate_table = seed_table()
+
+        rendered = list(render_values_batches(agate_table, COLUMN_TYPES, batch_size=3))
+
+        assert rendered == list(bound_values(agate_table, batch_size=3))
+        assert len(rendered) == 2
+
+    def test_literals(self):
+        assert format_literal(None) == "''"
+        assert format_literal("") == "''"
+        assert format_literal(0) == "0.0"
+        assert format_literal("a'b") == "'a\\'b'"
+        assert format_literal(datetime.date(2024, 2, 29)) == "'2024-02-29'"
+
+    def test_no_rows(self):
+        assert list(render_values_batches(seed_table().limit(0), COLUMN_TYPES, 10)) == []
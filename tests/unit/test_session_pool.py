@@ -0,0 +1,116 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from dbt.adapters.hive.session_pool import HiveSessionPool
+
+
+class FakeSession:
+    def __init__(self):
+        self.alive = True
+        self.reusable = True
+        self.disposed = False
+
+    def ping(self):
+        return self.alive
+
+    def is_reusable(self):
+        return self.reusable
+
+    def dispose(self):
+        self.disposed = True
+
+
+def make_pool(**kwargs):
+    opened = []
+
+    def connect():
+        session = FakeSession()
+        opened.append(session)
+        return session
+
+    return HiveSessionPool("host_schema_user", connect, **kwargs), opened
+
+
+class TestHiveSessionPool:
+    def test_reuses_released_session(self):
+        pool, opened = make_pool()
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        assert first is second
+        assert len(opened) == 1
+        assert (pool.stats.hits, pool.stats.misses) == (1, 1)
+
+    def test_recycles_after_max_uses(self):
+        pool, opened = make_pool(max_uses=2)
+        session = pool.acquire()
+        pool.release(session)
+        session = pool.acquire()
+        pool.release(session)
+
+        assert session.disposed
+        assert pool.acquire() is not session
+        assert len(opened) == 2
+        assert pool.stats.recycled == 1
+
+    def test_recycles_idle_sessions(self):
+        pool, opened = make_pool(max_idle_seconds=10)
+        session = pool.acquire()
+        pool.release(session)
+        pool._idle[0].last_used_at -= 60
+
+        assert pool.acquire() is not session
+        assert session.disposed
+        assert pool.stats.recycled == 1
+
+    def test_discards_unhealthy_and_modified_sessions(self):
+        pool, opened = make_pool()
+        dead = pool.acquire()
+        pool.release(dead)
+        dead.alive = False
+        assert pool.acquire() is not dead
+        assert pool.stats.health_check_failures == 1
+
+        modified = pool.acquire()
+        modified.reusable = False
+        pool.release(modified)
+        assert modified.disposed
+        assert len(pool) == 0
+
+    def test_concurrent_acquire_hands_out_distinct_sessions(self):
+        pool, opened = make_pool()
+        acquired = []
+        lock = threading.Lock()
+
+        def worker():
+            session = pool.acquire()
+            with lock:
+                acquired.append(session)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(session) for session in acquired}) == 16
+        for session in acquired:
+            pool.release(session)
+        assert len(pool) == 16
+
+        pool.close()
+        assert all(session.disposed for session in acquired)
@@ -0,0 +1,79 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+import dbt.exceptions
+
+from dbt.adapters.hive.sql_splitter import split_bindings, split_sql_statements
+
+
+def executables(sql):
+    return [statement.executable for statement in split_sql_statements(sql)]
+
+
+class TestSqlSplitter:
+    def test_single_statement_with_trailing_semicolon(self):
+        assert executables("select 1;\n") == ["select 1"]
+
+    def test_semicolons_in_literals_and_identifiers(self):
+        sql = """select 'a;b', "c;d", 'it\\'s;', `weird;col` from t; select 2"""
+        assert executables(sql) == [
+            """select 'a;b', "c;d", 'it\\'s;', `weird;col` from t""",
+            "select 2",
+        ]
+
+    def test_semicolons_in_comments(self):
+        sql = "select 1 -- not; a separator\n/* nor; this */ from t;\n-- trailing comment"
+        assert executables(sql) == [
+            "select 1 -- not; a separator\n/* nor; this */ from t",
+        ]
+
+    def test_contract_create_and_insert(self):
+        sql = (
+            '/* {"app": "dbt"} */ create table t (id int, note string) stored as orc;\n'
+            "insert into t (id, note) select 1, 'done; really'"
+        )
+        statements = split_sql_statements(sql)
+
+        assert len(statements) == 2
+        assert statements[0].code.startswith("create table t")
+        assert statements[1].sql == "insert into t (id, note) select 1, 'done; really'"
+
+    def test_set_statement_drops_query_header(self):
+        assert executables('/* {"app": "dbt"} */\nset hive.exec.dynamic.partition=true') == [
+            "set hive.exec.dynamic.partition=true"
+        ]
+
+    def test_bindings_are_split_per_statement(self):
+        statements = split_sql_statements(
+            "insert into a values (%s, %s); select 1; insert into b values (%s)"
+        )
+        assert split_bindings(statements, [1, 2, 3]) == [[1, 2], None, [3]]
+
+    def test_escaped_percent_is_not_a_placeholder(self):
+        statements = split_sql_statements(
+            "select * from a where b like '%%s' and c = %s; select '100%%'"
+        )
+        assert [s.placeholders for s in statements] == [1, 0]
+        assert split_bindings(statements, [1]) == [[1], None]
+
+    def test_bindings_mismatch(self):
+        statements = split_sql_statements("insert into a values (%s); select 1")
+        with pytest.raises(dbt.exceptions.DbtRuntimeError):
+            split_bindings(statements, [1, 2])
+
+    def test_split_results_are_cached(self):
+        sql = "select 1; select 2"
+        assert split_sql_statements(sql) is split_sql_statements(sql)
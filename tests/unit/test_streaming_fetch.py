@@ -0,0 +1,95 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dbt.adapters.hive.connections import HiveConnectionManager, HiveConnectionWrapper
+
+
+class FakeCursor:
+    description = [("id", "INT_TYPE"), ("name", "STRING_TYPE")]
+
+    def __init__(self, num_rows):
+        self.rows = [(i, f"name_{i}") for i in range(num_rows)]
+        self.requested = []
+        self.operations_closed = 0
+
+    def close_operation(self):
+        self.operations_closed += 1
+
+    def fetchmany(self, size):
+        self.requested.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def fetchall(self):
+        raise AssertionError("fetchall must not be used")
+
+
+def make_wrapper(num_rows, fetch_size):
+    wrapper = HiveConnectionWrapper(handle=None, fetch_size=fetch_size)
+    wrapper._cursor = FakeCursor(num_rows)
+    return wrapper
+
+
+class TestStreamingFetch:
+    def test_iter_fetchmany_yields_bounded_batches(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        batches = list(wrapper.iter_fetchmany())
+
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    def test_iter_fetchmany_stops_at_limit(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        batches = list(wrapper.iter_fetchmany(limit=12))
+
+        assert [len(batch) for batch in batches] == [10, 2]
+        assert wrapper._cursor.requested == [10, 2]
+
+    def test_result_table_is_built_from_batches(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        table = HiveConnectionManager.get_result_from_cursor(wrapper, limit=None)
+
+        assert len(table.rows) == 25
+        assert table.column_names == ("id", "name")
+        assert table.rows[24]["name"] == "name_24"
+
+    def test_result_table_honours_limit(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        table = HiveConnectionManager.get_result_from_cursor(wrapper, limit=5)
+
+        assert len(table.rows) == 5
+        assert wrapper._cursor.requested == [5]
+
+    def test_stream_query_fetches_as_rows_are_read(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        manager = HiveConnectionManager.__new__(HiveConnectionManager)
+        manager.add_query = lambda sql: (None, wrapper)
+        rows = manager.stream_query("describe formatted db.t")
+
+        assert next(rows) == (0, "name_0")
+        assert wrapper._cursor.requested == [10]
+        assert len(list(rows)) == 24
+        assert wrapper._cursor.requested == [10, 10, 10, 10]
+        assert wrapper._cursor.operations_closed == 1
+
+    def test_stream_query_closes_operation_when_stopped_early(self):
+        wrapper = make_wrapper(num_rows=25, fetch_size=10)
+        manager = HiveConnectionManager.__new__(HiveConnectionManager)
+        manager.add_query = lambda sql: (None, wrapper)
+        rows = manager.stream_query("describe formatted db.t")
+
+        assert next(rows) == (0, "name_0")
+        assert wrapper._cursor.operations_closed == 0
+        rows.close()
+        assert wrapper._cursor.operations_closed == 1
+        assert wrapper._cursor.requested == [10]
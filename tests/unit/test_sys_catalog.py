@@ -0,0 +1,128 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import agate
+import dbt.exceptions
+import pytest
+
+from dbt.adapters.hive.relation import HiveRelation
+from dbt.adapters.hive.sys_catalog import (
+    SYS_CATALOG_COLUMNS_MACRO_NAME,
+    SYS_CATALOG_TABLE_PARAMS_MACRO_NAME,
+    parse_sys_columns,
+    parse_sys_table_params,
+    sys_table_comment,
+)
+
+SYS_COLUMNS = [
+    # tbl_name, tbl_type, owner, column_name, type_name, comment, is_partition_key, integer_idx
+    ["events", "MANAGED_TABLE", "alice", "dt", "string", None, 1, 0],
+    ["events", "MANAGED_TABLE", "alice", "name", "string", "", 0, 1],
+    ["events", "MANAGED_TABLE", "alice", "id", "int", "the id", 0, 0],
+    ["v_events", "VIRTUAL_VIEW", "bob", "id", "int", None, 0, 0],
+]
+SYS_PARAMS = [
+    ["events", "comment", "all events"],
+    ["events", "numRows", "42"],
+    ["events", "COLUMN_STATS_ACCURATE", '{"BASIC_STATS":"true"}'],
+]
+
+# describe formatted db.events, as returned by Hive 3
+DESCRIBE_EVENTS = [
+    ["# col_name", "data_type", "comment"],
+    ["id", "int", "the id"],
+    ["name", "string", ""],
+    ["", None, None],
+    ["# Partition Information", None, None],
+    ["# col_name", "data_type", "comment"],
+    ["dt", "string", ""],
+    ["", None, None],
+    ["# Detailed Table Information", None, None],
+    ["Database:", "db", None],
+    ["Owner:", "alice", None],
+    ["Table Type:", "MANAGED_TABLE", None],
+    ["Table Parameters:", None, None],
+    ["", "COLUMN_STATS_ACCURATE", '{"BASIC_STATS":"true"}'],
+    ["", "comment", "all events"],
+    ["", "numRows", "42"],
+]
+
+
+def rows(data, names):
+    return agate.Table(data, names, [agate.Text(cast_nulls=False)] * len(names)).rows
+
+
+@pytest.fixture
+def sys_adapter(make_adapter):
+    def make(results, use_sys_catalog=True):
+        adapter = make_adapter(results)
+        adapter.config.credentials.use_sys_catalog = use_sys_catalog
+        return adapter
+
+    return make
+
+
+def test_parse_sys_columns_in_describe_order():
+    columns = parse_sys_columns("db", SYS_COLUMNS)
+    assert [(c.column, c.dtype, c.column_index) for c in columns["events"]] == [
+        ("id", "int", 0),
+        ("name", "string", 1),
+        ("dt", "string", 2),
+    ]
+    assert [c.comment for c in columns["events"]] == ["the id", None, None]
+    assert columns["v_events"][0].table_type == "view"
+    assert columns["v_events"][0].table_owner == "bob"
+
+
+def test_parse_sys_table_params():
+    params = parse_sys_table_params([["a", "comment", " x "], ["b", "comment", ""]])
+    assert params == {"a": {"comment": " x "}, "b": {"comment": ""}}
+    assert [sys_table_comment(params.get(t)) for t in "abc"] == ["x", None, None]
+
+
+def test_sys_catalog_matches_describe_formatted(sys_adapter):
+    adapter = sys_adapter(
+        {
+            SYS_CATALOG_COLUMNS_MACRO_NAME: SYS_COLUMNS,
+            SYS_CATALOG_TABLE_PARAMS_MACRO_NAME: SYS_PARAMS,
+        }
+    )
+    relation = HiveRelation.create(schema="db", identifier="events", type="table")
+    described = adapter.parse_describe_formatted(
+        relation, rows(DESCRIBE_EVENTS, ["col_name", "data_type", "comment"])
+    )
+    expected = [adapter._catalog_column_dict(c, "all events") for c in described]
+
+    catalog = adapter._get_sys_catalog_columns("db")
+    assert [c for c in catalog if c["table_name"] == "events"] == expected
+    assert expected[0]["stats:num_rows:value"] == 42
+    assert adapter.executed == [
+        SYS_CATALOG_COLUMNS_MACRO_NAME,
+        SYS_CATALOG_TABLE_PARAMS_MACRO_NAME,
+    ]
+
+
+def test_falls_back_when_sys_is_unavailable(sys_adapter):
+    error = dbt.exceptions.DbtRuntimeError("Database does not exist: sys")
+    adapter = sys_adapter({SYS_CATALOG_COLUMNS_MACRO_NAME: error})
+    assert adapter._get_sys_catalog_columns("db") is None
+    # not attempted again for the rest of the run
+    assert adapter._get_sys_catalog_columns("other") is None
+    assert adapter.executed == [SYS_CATALOG_COLUMNS_MACRO_NAME]
+
+
+def test_sys_catalog_can_be_disabled(sys_adapter):
+    adapter = sys_adapter({}, use_sys_catalog=False)
+    assert adapter._get_sys_catalog_columns("db") is None
+    assert adapter.executed == []
@@ -0,0 +1,93 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import sqlite3
+
+import dbt.exceptions
+import pytest
+
+from dbt.adapters.hive.relation import HiveRelation
+
+ROWS_A = [(1, "a", "2024-01-01"), (2, None, "2024-01-01"), (3, "c", "2024-01-02")]
+
+
+def sqlite_with_hive_functions():
+    """Runs the generated SQL with the Hive functions it uses"""
+    db = sqlite3.connect(":memory:")
+    db.create_function("md5", 1, lambda s: hashlib.md5(s.encode()).hexdigest())
+    db.create_function(
+        "concat_ws", -1, lambda sep, *values: sep.join(str(v) for v in values if v is not None)
+    )
+    db.create_function("conv", 3, lambda s, from_base, to_base: str(int(s, from_base)))
+    for name in ("a", "b"):
+        db.execute(f"create table {name} (id int, name text, dt text)")
+    return db
+
+
+def run(db, sql, rows_b):
+    db.executemany("insert into a values (?, ?, ?)", ROWS_A)
+    db.executemany("insert into b values (?, ?, ?)", rows_b)
+    # sqlite spells the null-safe equality `is`, and its string type `text`
+    sql = sql.replace("`", "").replace("<=>", "is").replace("as string", "as text")
+    return db.execute(sql).fetchall()
+
+
+@pytest.fixture
+def adapter(make_adapter):
+    return make_adapter()
+
+
+def relation(name):
+    return HiveRelation.create(schema="main", identifier=name)
+
+
+@pytest.mark.parametrize(
+    "rows_b,expected",
+    [
+        (ROWS_A, (0, 0)),
+        (ROWS_A[:2], (1, 1)),
+        # NULL is not the empty string
+        ([ROWS_A[0], (2, "", "2024-01-01"), ROWS_A[2]], (0, 2)),
+        (ROWS_A + [ROWS_A[0]], (-1, 0)),
+    ],
+)
+def test_hash_diff(adapter, rows_b, expected):
+    sql = adapter.get_rows_different_sql(
+        relation("a"), relation("b"), ["id", "name", "dt"], diff_mode="hash"
+    )
+    assert sql.count("main.a") == 1 and sql.count("main.b") == 1
+    assert run(sqlite_with_hive_functions(), sql, rows_b) == [expected]
+
+
+def test_partitions_diff(adapter):
+    sql = adapter.get_partitions_different_sql(
+        relation("a"), relation("b"), ["dt"], ["id", "name", "dt"]
+    )
+    rows_b = [(1, "a", "2024-01-01"), (2, None, "2024-01-01"), (3, "x", "2024-01-02")]
+    rows_b.append((4, "d", "2024-01-03"))
+    assert sorted(run(sqlite_with_hive_functions(), sql, rows_b)) == [
+        ("2024-01-02", 1, 1),
+        ("2024-01-03", 0, 1),
+    ]
+
+
+def test_except_mode_is_the_default(adapter):
+    sql = adapter.get_rows_different_sql(relation("a"), relation("b"), ["id"])
+    assert "EXCEPT" in sql
+
+
+def test_invalid_diff_mode(adapter):
+    with pytest.raises(dbt.exceptions.DbtRuntimeError, match="diff_mode"):
+        adapter.get_rows_different_sql(relation("a"), relation("b"), ["id"], diff_mode="fast")
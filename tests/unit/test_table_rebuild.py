@@ -0,0 +1,222 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from types import SimpleNamespace
+
+import dbt.exceptions
+import pytest
+
+from dbt.adapters.hive.connections import HiveAdapterResponse
+from dbt.adapters.hive.describe import DescribedColumn, DescribeResult
+from dbt.adapters.hive.relation import HiveRelation
+from dbt.adapters.hive.table_rebuild import (
+    iceberg_rebuild_plan,
+    rebuild_mismatch,
+    result_columns,
+)
+
+# cursor description of `select id, name, amount ... limit 0`, as impyla reports it
+DESCRIPTION = [
+    ("dbt_sbq.id", "INT", None, None, None, None, None),
+    ("dbt_sbq.name", "STRING", None, None, None, None, None),
+    ("dbt_sbq.amount", "DECIMAL", None, None, 18, 2, None),
+]
+
+
+def describe(columns=(("id", "int"), ("name", "string"), ("amount", "decimal(18,2)")), **kw):
+    details = {
+        "Table Type": "MANAGED_TABLE",
+        "Location": "hdfs://nn:8020/warehouse/db.db/orders",
+        "InputFormat": "org.apache.hadoop.hive.ql.io.parquet.MapredParquetInputFormat",
+        "Num Buckets": "-1",
+    }
+    details.update(kw.pop("details", {}))
+    return DescribeResult(
+        columns=[DescribedColumn(name, data_type) for name, data_type in columns],
+        details=details,
+        table_parameters={},
+        **kw,
+    )
+
+
+def test_result_columns():
+    columns = result_columns(DESCRIPTION)
+    assert [c.name for c in columns] == ["id", "name", "amount"]
+    assert (columns[2].type_name, columns[2].precision, columns[2].scale) == ("decimal", 18, 2)
+
+
+def test_matching_schema():
+    assert rebuild_mismatch(result_columns(DESCRIPTION), describe(), file_format="parquet") is None
+    assert (
+        rebuild_mismatch(result_columns(DESCRIPTION), describe(), location="/db.db/orders/")
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    "target,options,reason",
+    [
+        (None, {}, "does not exist"),
+        (describe(details={"Table Type": "VIRTUAL_VIEW"}), {}, "VIRTUAL_VIEW"),
+        (describe(partition_columns=[DescribedColumn("dt", "string")]), {}, "partitioned"),
+        (describe(details={"Num Buckets": "4"}), {}, "bucketed"),
+        (describe(), {"external": True}, "external"),
+        (describe(), {"file_format": "orc"}, "not stored as orc"),
+        (describe(), {"location": "/other/orders"}, "location"),
+        (describe(columns=(("id", "int"), ("name", "string"))), {}, "column names"),
+        (
+            describe(columns=(("id", "int"), ("amount", "decimal(18,2)"), ("name", "string"))),
+            {},
+            "names",
+        ),
+        (
+            describe(columns=(("id", "bigint"), ("name", "string"), ("amount", "decimal(18,2)"))),
+            {},
+            "type of id",
+        ),
+        (
+            describe(columns=(("id", "int"), ("name", "string"), ("amount", "decimal(18,4)"))),
+            {},
+            "type of amount",
+        ),
+        # the length of a varchar result column is unknown
+        (
+            describe(
+                columns=(("id", "int"), ("name", "varchar(10)"), ("amount", "decimal(18,2)"))
+            ),
+            {},
+            "type of name",
+        ),
+    ],
+)
+def test_mismatch(target, options, reason):
+    assert reason in rebuild_mismatch(result_columns(DESCRIPTION), target, **options)
+
+
+def iceberg(columns, **kw):
+    return DescribeResult(
+        columns=[DescribedColumn(name, data_type) for name, data_type in columns],
+        details={"Table Type": "EXTERNAL_TABLE"},
+        table_parameters={"table_type": "ICEBERG"},
+        **kw,
+    )
+
+
+def test_iceberg_plan_without_changes():
+    target = iceberg([("id", "int"), ("name", "string"), ("amount", "decimal(18,2)")])
+    plan = iceberg_rebuild_plan(result_columns(DESCRIPTION), target)
+    assert plan.mismatch is None
+    assert (plan.replace_columns, plan.add_columns, plan.change_columns) == ([], [], [])
+    assert plan.column_names == ["id", "name", "amount"]
+
+
+def test_iceberg_plan_evolves_the_schema():
+    # amount widened, name new, legacy dropped; the kept columns keep their order
+    target = iceberg([("amount", "decimal(12,2)"), ("legacy", "string"), ("id", "int")])
+    plan = iceberg_rebuild_plan(result_columns(DESCRIPTION), target)
+    assert plan.mismatch is None
+    assert plan.replace_columns == [("amount", "decimal(12,2)"), ("id", "int")]
+    assert plan.add_columns == [("name", "string")]
+    assert plan.change_columns == [("amount", "decimal(18,2)")]
+    assert plan.column_names == ["amount", "id", "name"]
+
+
+@pytest.mark.parametrize(
+    "target,reason",
+    [
+        (None, "does not exist"),
+        (describe(), "not an iceberg table"),
+        (
+            iceberg([("id", "int")], partition_transforms=[DescribedColumn("id", "BUCKET[4]")]),
+            "partitioned",
+        ),
+        (iceberg([("id", "bigint")]), "cannot change from bigint to int"),
+        (iceberg([("id", "int"), ("amount", "decimal(18,4)")]), "amount cannot change"),
+        (iceberg([("other", "int")]), "no column is kept"),
+    ],
+)
+def test_iceberg_plan_falls_back(target, reason):
+    assert reason in iceberg_rebuild_plan(result_columns(DESCRIPTION), target).mismatch
+
+
+def test_iceberg_plan_with_unknown_types():
+    description = DESCRIPTION + [("dbt_sbq.tags", "ARRAY", None, None, None, None, None)]
+    target = iceberg([("id", "int"), ("name", "string"), ("amount", "decimal(18,2)")])
+    assert (
+        "tags is not known" in iceberg_rebuild_plan(result_columns(description), target).mismatch
+    )
+
+
+@pytest.fixture
+def adapter(make_adapter):
+    adapter = make_adapter(
+        {"get_empty_subquery_sql": lambda select_sql: f"select * from ({select_sql}) limit 0"},
+        describe_relation=lambda relation: describe(),
+    )
+    adapter.queries = []
+
+    def add_select_query(sql):
+        adapter.queries.append(sql)
+        return None, SimpleNamespace(description=DESCRIPTION)
+
+    adapter.connections.add_select_query = add_select_query
+    return adapter
+
+
+def test_rebuild_strategy_for(adapter):
+    relation = HiveRelation.create(schema="db", identifier="orders")
+    sql = "select id, name, amount from db.raw_orders"
+    assert adapter.rebuild_strategy_for(relation, sql, "insert_overwrite") == "insert_overwrite"
+    assert adapter.queries == [f"select * from ({sql}) limit 0"]
+    assert adapter.rebuild_strategy_for(relation, sql, "insert_overwrite", external=True) == "swap"
+    assert adapter.rebuild_strategy_for(None, sql, "insert_overwrite") == "swap"
+
+    # swap never looks at the query
+    assert adapter.rebuild_strategy_for(relation, sql, "swap") == "swap"
+    assert len(adapter.queries) == 2
+
+    with pytest.raises(dbt.exceptions.DbtRuntimeError, match="rebuild_strategy"):
+        adapter.rebuild_strategy_for(relation, sql, "replace")
+
+
+def test_iceberg_rebuild_plan(adapter):
+    relation = HiveRelation.create(schema="db", identifier="orders")
+    sql = "select id, name, amount from db.raw_orders"
+    adapter.describe_relation = lambda relation: iceberg([("id", "int"), ("legacy", "string")])
+    plan = adapter.iceberg_rebuild_plan(relation, sql, "insert_overwrite")
+    assert plan["rebuild_strategy"] == "insert_overwrite"
+    assert [(c.name, c.data_type) for c in plan["replace_columns"]] == [("id", "int")]
+    assert [(c.name, c.data_type) for c in plan["add_columns"]] == [
+        ("name", "string"),
+        ("amount", "decimal(18,2)"),
+    ]
+    assert plan["column_names"] == ["`id`", "`name`", "`amount`"]
+
+    assert adapter.iceberg_rebuild_plan(relation, sql, "insert_overwrite", partitioned=True) == {
+        "rebuild_strategy": "swap"
+    }
+    assert adapter.iceberg_rebuild_plan(None, sql, "insert_overwrite") == {
+        "rebuild_strategy": "swap"
+    }
+    assert adapter.iceberg_rebuild_plan(relation, sql, "swap") == {"rebuild_strategy": "swap"}
+
+
+def test_record_rebuild(adapter):
+    relation = HiveRelation.create(schema="db", identifier="orders")
+    response = HiveAdapterResponse(_message="OK")
+    started_at = adapter.rebuild_started() - 2.5
+    adapter.record_rebuild(relation, "insert_overwrite", started_at, response)
+    assert response.rebuild_strategy == "insert_overwrite"
+    assert response.rebuild_seconds >= 2.5
+    assert response.to_dict()["rebuild_strategy"] == "insert_overwrite"
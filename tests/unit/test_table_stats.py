@@ -0,0 +1,69 @@
+# Copyright 2025 Cloudera Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dbt.task.docs.generate import build_catalog_table
+
+from dbt.adapters.hive.column import HiveColumn
+from dbt.adapters.hive.table_stats import TableStats
+
+PARAMETERS = {
+    "COLUMN_STATS_ACCURATE": '{"BASIC_STATS":"true","COLUMN_STATS":{"id":"true"}}',
+    "numFiles": "2",
+    "numRows": "0",
+    "rawDataSize": "-1",
+    "totalSize": "512",
+    "transactional": "true",
+}
+
+
+def test_from_parameters():
+    stats = TableStats.from_parameters(PARAMETERS)
+    assert stats == TableStats(
+        num_rows=0, raw_data_size=None, total_size=512, num_files=2, accurate=True
+    )
+    assert stats.is_known_empty
+
+
+def test_stale_or_missing_statistics():
+    assert TableStats.from_parameters(None) == TableStats()
+    stale = TableStats.from_parameters({"numRows": "0", "COLUMN_STATS_ACCURATE": "garbage"})
+    assert stale.num_rows == 0
+    assert not stale.accurate
+    assert not stale.is_known_empty
+
+
+def test_catalog_stats():
+    column = HiveColumn(
+        table_schema="db",
+        table_name="events",
+        table_type="table",
+        table_stats=HiveColumn.convert_table_stats(TableStats.from_parameters(PARAMETERS)),
+        column="id",
+        dtype="int",
+    )
+    as_dict = column.to_column_dict()
+    assert "table_stats" not in as_dict
+    assert as_dict["stats:total_size:value"] == 512
+    assert "stats:raw_data_size:value" not in as_dict
+
+    table = build_catalog_table(as_dict)
+    assert table.stats["num_rows"].value == 0
+    assert table.stats["num_files"].label == "Files"
+    assert table.stats["has_stats"].value is True
+
+
+def test_no_catalog_stats_without_statistics():
+    column = HiveColumn(table_stats=HiveColumn.convert_table_stats(None), column="id", dtype="int")
+    as_dict = column.to_column_dict()
+    assert not [key for key in as_dict if key.startswith("stats:")]